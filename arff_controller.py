@@ -1,9 +1,152 @@
+from __future__ import annotations
+
+import copy
+import logging
 import os
-from typing import Optional, List, Dict, Any, Tuple
-import pandas as pd
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Tuple
 from PySide6.QtCore import QObject, Signal, Slot, QUrl, Property
-import arff
+from attribute_model import AttributeListModel
+from column_stats import ColumnStatsEngine, arff_chunks, frame_chunks
+from compaction import memory_stats
+from instrumentation import Timings, load_stats, span
 from table_model import DataFrameModel
+from lazy_table_model import LazyFileModel
+from loader import BackgroundLoader, report_progress
+from parse_cache import ParseCache, default_cache, fingerprint
+
+# Backend de dados (pandas, arff_io, type_inference, ...) importado sob
+# demanda, como no CSVController: ver startup.py
+if TYPE_CHECKING:
+    import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# Arquivos a partir deste tamanho abrem em "modo janela" (LazyFileModel);
+# abaixo dele, memory_plan decide pela memória disponível
+LAZY_THRESHOLD_BYTES = 1024 * 1024 * 1024
+# Instâncias lidas no modo janela para exemplos/tipos da página 3
+LAZY_SAMPLE_ROWS = 10_000
+
+
+def _read_arff(
+    handle,
+    sample_rows: Optional[int] = None,
+    file_path: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    compact: bool = False,
+) -> Dict[str, Any]:
+    """Parse executado no worker do BackgroundLoader.
+
+    Faz na thread de trabalho tudo o que não toca em objetos Qt: leitura do
+    cabeçalho e do @data direto para um DataFrame tipado (arff_io), os
+    perfis por coluna (column_profile) e a inferência de tipos sobre uma
+    amostra (type_inference). Com `cache`, um arquivo já lido volta do
+    disco (parse_cache), como no CSVController; com `compact`, os dtypes
+    são compactados (compaction) depois dos perfis.
+    """
+    from arff_io import read_arff
+
+    timings: Timings = []
+    key = None
+    if cache is not None and cache.enabled and file_path:
+        with span("cache", timings, file=file_path):
+            key = fingerprint(file_path, "arff:compact" if compact else "arff")
+            cached = cache.load(key)
+        if cached is not None:
+            report_progress(handle, os.path.getsize(file_path))
+            return {**cached, 'cacheKey': key, 'fromCache': True, 'timings': timings}
+    with span("read", timings, file=file_path):
+        parsed = read_arff(handle)
+    parsed = _profiled(parsed, sample_rows, timings)
+    if compact:
+        from compaction import compact_dataframe
+
+        with span("compact", timings):
+            parsed['dataframe'], parsed['memoryReport'] = compact_dataframe(parsed['dataframe'])
+    if key is not None:
+        cache.store_in_background(key, {**parsed, 'profiles': copy.deepcopy(parsed['profiles'])})
+        parsed['cacheKey'] = key
+    return parsed
+
+
+def _read_arff_sample(handle, sample_rows: Optional[int] = None) -> Dict[str, Any]:
+    """Lê o cabeçalho e só as primeiras instâncias (modo janela)."""
+    from arff_io import read_arff
+
+    timings: Timings = []
+    with span("read", timings, rows=LAZY_SAMPLE_ROWS):
+        parsed = read_arff(handle, max_rows=LAZY_SAMPLE_ROWS)
+    return _profiled(parsed, sample_rows, timings)
+
+
+def _load_arff(
+    handle,
+    file_path: str,
+    budget: Optional[int] = None,
+    lazy_threshold: Optional[int] = None,
+    sample_rows: Optional[int] = None,
+    compact: bool = False,
+    cache: Optional[ParseCache] = None,
+) -> Dict[str, Any]:
+    """Escolhe o modo pela memória (memory_plan) e lê o ARFF nele.
+
+    Em "lazy" só as primeiras instâncias são lidas (modo janela); em
+    "compact" os dtypes são compactados depois da leitura. O plano volta
+    no resultado ('plan').
+    """
+    from memory_plan import plan_load
+
+    timings: Timings = []
+    with span("plan", timings, file=file_path):
+        plan = plan_load(file_path, "arff", budget, lazy_threshold, compact, LAZY_SAMPLE_ROWS)
+    if plan['mode'] == "lazy":
+        parsed = _read_arff_sample(handle, sample_rows)
+    else:
+        parsed = _read_arff(handle, sample_rows, file_path, cache, compact=plan['mode'] == "compact")
+    parsed['timings'] = timings + list(parsed.get('timings', []))
+    parsed['plan'] = plan
+    return parsed
+
+
+def _profiled(parsed: Dict[str, Any], sample_rows: Optional[int], timings: Timings) -> Dict[str, Any]:
+    """Acrescenta ao resultado do parse os perfis e a inferência sobre a amostra."""
+    from column_profile import build_profiles
+    from type_inference import DEFAULT_SAMPLE_ROWS, infer_types
+
+    with span("profile", timings, columns=parsed['dataframe'].shape[1]):
+        parsed['profiles'] = build_profiles(parsed['dataframe'])
+    with span("infer", timings):
+        parsed['inference'] = infer_types(parsed['dataframe'], sample_rows or DEFAULT_SAMPLE_ROWS)
+    parsed['timings'] = timings
+    return parsed
+
+
+def _refine_arff_types(handle) -> Dict[str, Dict[str, Any]]:
+    """Passada completa: infere os tipos sobre todas as instâncias, em blocos."""
+    from arff_io import iter_chunks, read_header
+    from type_inference import TypeAccumulator
+
+    _, attributes, date_formats = read_header(handle)
+    accumulator = TypeAccumulator()
+    with span("refine"):
+        for chunk in iter_chunks(handle, attributes, date_formats):
+            accumulator.add(chunk)
+    return accumulator.results(exact=True)
+
+
+def _stream_arff_to_csv(handle, output_path: str) -> Dict[str, Any]:
+    """Exportação ARFF→CSV (arff_io.write_csv) executada no worker do BackgroundLoader.
+
+    Relê o arquivo pelo próprio `handle`: progresso e cancelamento vêm dele.
+    """
+    from arff_io import write_csv
+
+    timings: Timings = []
+    with span("write", timings, file=output_path):
+        rows = write_csv(handle, output_path)
+    return {'output': output_path, 'rows': rows, 'timings': timings}
 
 class ARFFController(QObject):
     """Controlador para manipulação de arquivos ARFF.
@@ -21,16 +164,48 @@ class ARFFController(QObject):
     errorOccurred = Signal(str)
     successOccurred = Signal(str)
     metadataChanged = Signal()
+    # Carregamento em segundo plano (barra de progresso da página 1)
+    loadingChanged = Signal()
+    loadProgressChanged = Signal()
+    # Passada completa de inferência de tipos (refineTypes)
+    refiningTypesChanged = Signal()
+    statsChanged = Signal()
+    # Estatísticas por coluna da página 3 (column_stats): resultados parciais e andamento
+    columnStatsChanged = Signal()
+    computingColumnStatsChanged = Signal()
+    # Modo de carregamento escolhido pelo orçamento de memória (memory_plan)
+    loadPlanChanged = Signal()
+    # Exportação em fluxo para CSV (exportCsv)
+    exportingChanged = Signal()
+    exportProgressChanged = Signal()
     
     def __init__(self) -> None:
         super().__init__()
-        self._data: Optional[List[List[Any]]] = None
         self._attributes: List[Tuple[str, Any]] = []
         self._relation_name: str = ""
         self._file_name: str = ""
+        # Arquivo da base carregada (e do carregamento em andamento)
+        self._file_path: Optional[str] = None
+        self._pending_path: Optional[str] = None
+        # Tipos sugeridos (cabeçalho + inferência) e escolhidos pelo usuário
         self._suggested_types: Dict[str, str] = {}
+        self._selected_types: Dict[str, str] = {}
+        # Lista de atributos da página 3 (atualizada linha a linha)
+        self._attribute_model = AttributeListModel(self)
+        # Cache em disco das leituras (chave da base atual; None = fora do cache)
+        self._cache_key: Optional[str] = None
+        self._loaded_from_cache: bool = False
+        # Perfil por coluna (dtype, contagens, exemplos), um por carga
+        self._profiles: Dict[str, Dict[str, Any]] = {}
         self._dataframe: Optional[pd.DataFrame] = None
-        self._table_model: Optional[DataFrameModel] = None
+        self._table_model: Optional[QObject] = None
+        # Modo janela: a tabela pagina o arquivo e _dataframe guarda só uma amostra
+        self._lazy_threshold_bytes: int = LAZY_THRESHOLD_BYTES
+        self._lazy_model: Optional[LazyFileModel] = None
+        # Orçamento de memória do carregamento (memory_plan) e o último plano
+        # -1 = automático (fração da memória disponível), 0 = sem limite
+        self._memory_budget_mb: int = -1
+        self._load_plan: Dict[str, Any] = {}
         
         # Mapeamento de tipos ARFF para português
         self._type_translations = {
@@ -50,7 +225,55 @@ class ARFFController(QObject):
             'Data',
             'Relacional'
         ]
+
+        # Leitura do arquivo em thread separada; o resultado volta por sinais
+        self._loader = BackgroundLoader(self)
+        self._loader.loadingChanged.connect(self.loadingChanged)
+        self._loader.progressChanged.connect(self.loadProgressChanged)
+        self._loader.finished.connect(self._onArffLoaded)
+        self._loader.failed.connect(self._onLoadFailed)
+        # Domínio dos atributos nominais na exportação (acima do teto: STRING)
+        # -1 = padrão (arff_schema.MAX_NOMINAL_VALUES), 0 = sem limite
+        self._max_nominal_values: int = -1
+        self._sort_nominal_values: bool = False
+        # Formato do @data: None = automático (arff_io.resolve_sparse)
+        self._sparse_output: Optional[bool] = None
+        # Inferência de tipos: amostra no carregamento, passada completa opcional
+        # None = padrão (type_inference.DEFAULT_SAMPLE_ROWS)
+        self._inference_sample_rows: Optional[int] = None
+        self._auto_refine_types: bool = False
+        self._types_refined: bool = False
+        self._refiner = BackgroundLoader(self)
+        self._refiner.loadingChanged.connect(self.refiningTypesChanged)
+        self._refiner.finished.connect(self._onTypesRefined)
+        self._refiner.failed.connect(self._onRefineFailed)
+        # Exportação CSV em fluxo: relê o arquivo em outra thread, como o carregamento
+        self._exporter = BackgroundLoader(self)
+        self._exporter.loadingChanged.connect(self.exportingChanged)
+        self._exporter.progressChanged.connect(self.exportProgressChanged)
+        self._exporter.finished.connect(self._onCsvExported)
+        self._exporter.failed.connect(lambda message: self.errorOccurred.emit(f"Erro ao exportar CSV: {message}"))
+        self._export_started: float = 0.0
+        # Tempos do último carregamento e da última exportação (propriedade stats)
+        self._load_started: float = 0.0
+        self._stats: Dict[str, Any] = {}
+        # Compactação dos dtypes no carregamento e bytes por coluna antes/depois
+        self._compact_memory: bool = False
+        self._memory_report: Dict[str, Any] = {}
+        # Resumo por coluna (mín./máx./média, histograma, top-k) da carga atual, no engine
+        self._stats_engine = ColumnStatsEngine(self)
+        self._stats_engine.updated.connect(self._onColumnStatsUpdated)
+        self._stats_engine.runningChanged.connect(self.computingColumnStatsChanged)
+        self._stats_engine.finished.connect(self._onColumnStatsFinished)
+        self._stats_engine.failed.connect(
+            lambda message: self.errorOccurred.emit(f"Erro ao calcular as estatísticas: {message}")
+        )
     
+    @Property(QObject, constant=True)
+    def attributeModel(self) -> QObject:
+        """Atributos (nome, tipo efetivo, exemplos, confiança) para a página 3."""
+        return self._attribute_model
+
     @Property('QVariant', notify=dataLoaded)
     def tableModel(self):
         """Retorna o modelo da tabela para exibição no QML."""
@@ -59,7 +282,7 @@ class ARFFController(QObject):
     @Property(int, notify=dataLoaded)
     def instanceCount(self):
         """Retorna o número de instâncias (linhas) dos dados."""
-        return len(self._data) if self._data else 0
+        return self._rowCount()
     
     @Property(int, notify=dataLoaded)
     def attributeCount(self):
@@ -79,7 +302,7 @@ class ARFFController(QObject):
     @Property(int, notify=dataLoaded)
     def instanceCount(self) -> int:
         """Total de instâncias (linhas)."""
-        return len(self._data) if self._data else 0
+        return self._rowCount()
     
     @Property(int, notify=dataLoaded)
     def attributeCount(self) -> int:
@@ -91,9 +314,215 @@ class ARFFController(QObject):
         """Tipos disponíveis para seleção no dropdown."""
         return self._available_types
     
+    @Property(bool, notify=loadingChanged)
+    def loading(self) -> bool:
+        """Indica se há um carregamento em andamento."""
+        return self._loader.loading
+
+    @Property(float, notify=loadProgressChanged)
+    def loadProgress(self) -> float:
+        """Fração do arquivo já lida (0.0 a 1.0)."""
+        return self._loader.progress
+
+    @Property(str, notify=loadProgressChanged)
+    def loadStatus(self) -> str:
+        """Texto de progresso, ex.: "120.0 MB de 2048.0 MB"."""
+        mb = 1024 * 1024
+        return f"{self._loader.bytesRead / mb:.1f} MB de {self._loader.bytesTotal / mb:.1f} MB"
+
+    @Property(bool, notify=exportingChanged)
+    def exporting(self) -> bool:
+        """Indica se há uma exportação em fluxo em andamento."""
+        return self._exporter.loading
+
+    @Property(float, notify=exportProgressChanged)
+    def exportProgress(self) -> float:
+        """Fração da exportação em fluxo já concluída (0.0 a 1.0)."""
+        return self._exporter.progress
+
+    @Property('QVariantMap', notify=statsChanged)
+    def stats(self) -> Dict[str, Any]:
+        """Último carregamento ("load") e exportação ("export"): tempo, linhas/s, memória, etapas."""
+        return self._stats
+
+    def _setStats(self, operation: str, stats: Dict[str, Any]) -> None:
+        self._stats = {**self._stats, operation: stats}
+        self.statsChanged.emit()
+
+    @Property('QVariantMap', notify=dataLoaded)
+    def memoryReport(self) -> Dict[str, Any]:
+        """Bytes por coluna antes/depois da compactação ({} se ela estava desligada)."""
+        return self._memory_report
+
+    @Slot(bool)
+    def setCompactMemory(self, enabled: bool) -> None:
+        """Ligado, os próximos carregamentos compactam os dtypes (ver compaction)."""
+        self._compact_memory = bool(enabled)
+
+    @Property(bool, notify=computingColumnStatsChanged)
+    def computingColumnStats(self) -> bool:
+        """Indica se as estatísticas por coluna estão sendo calculadas."""
+        return self._stats_engine.running
+
+    @Property(float, notify=columnStatsChanged)
+    def columnStatsProgress(self) -> float:
+        """Fração da base já resumida (0.0 a 1.0)."""
+        return self._stats_engine.progress
+
+    @Slot()
+    def computeColumnStats(self) -> None:
+        """Calcula em segundo plano o resumo de cada coluna (column_stats).
+
+        Os resultados parciais chegam a cada bloco pelo `attributeModel`
+        (papel `stats`) e por `columnStatsChanged`. Calculado uma vez por
+        carga e guardado com a base no cache em disco.
+        """
+        if self._dataframe is None or self._stats_engine.complete or self._stats_engine.running:
+            return
+        if self._lazy_model is not None:
+            # Modo janela: a base em memória é só uma amostra; o resumo lê o arquivo
+            source = partial(arff_chunks, self._file_path, self._dataframe.shape[1])
+        else:
+            source = partial(frame_chunks, self._dataframe)
+        self._stats_engine.background = self._loader.background
+        self._stats_engine.start(source)
+
+    @Slot()
+    def cancelColumnStats(self) -> None:
+        """Interrompe o cálculo; o que já foi resumido continua visível."""
+        self._stats_engine.cancel()
+
+    @Slot(str, result='QVariantMap')
+    def getColumnStats(self, attribute_name: str) -> Dict[str, Any]:
+        """Resumo de um atributo ({} se ainda não calculado)."""
+        return self._stats_engine.results.get(attribute_name) or {}
+
+    def _onColumnStatsUpdated(self) -> None:
+        # Cada delegate da página 3 só é notificado se o seu resumo mudou
+        for name, summary in self._stats_engine.results.items():
+            self._attribute_model.updateAttribute(name, stats=summary)
+        self.columnStatsChanged.emit()
+
+    def _onColumnStatsFinished(self, results: Dict[str, Dict[str, Any]]) -> None:
+        default_cache().update_in_background(self._cache_key, columnStats=results)
+        self.columnStatsChanged.emit()
+
+    def _resetColumnStats(self, stats: Dict[str, Dict[str, Any]]) -> None:
+        self._stats_engine.restore(stats)
+        self.columnStatsChanged.emit()
+
+    @Property(bool, notify=dataLoaded)
+    def loadedFromCache(self) -> bool:
+        """True se a base atual veio do cache em disco (sem parse)."""
+        return self._loaded_from_cache
+
+    @Slot(bool)
+    def setCacheEnabled(self, enabled: bool) -> None:
+        """Liga/desliga o cache em disco (compartilhado com o CSVController)."""
+        default_cache().enabled = bool(enabled)
+
+    @Slot(int)
+    def setCacheLimitMb(self, megabytes: int) -> None:
+        """Teto do diretório de cache; as entradas menos usadas saem primeiro."""
+        cache = default_cache()
+        cache.max_bytes = max(int(megabytes), 0) * 1024 * 1024
+        cache.evict()
+
+    @Slot()
+    def invalidateCache(self) -> None:
+        """Descarta a entrada da base atual: o próximo loadArff relê o arquivo."""
+        if self._cache_key:
+            default_cache().invalidate(self._cache_key)
+            self._cache_key = None
+
+    @Slot()
+    def clearCache(self) -> None:
+        """Apaga todo o diretório de cache."""
+        default_cache().clear()
+        self._cache_key = None
+
+    @Property(bool, notify=dataLoaded)
+    def lazyMode(self) -> bool:
+        """True quando o arquivo foi aberto em modo janela (maior que o limite)."""
+        return self._lazy_model is not None
+
+    @Slot(int)
+    def setLazyThresholdMb(self, megabytes: int) -> None:
+        """Tamanho a partir do qual o ARFF abre em modo janela."""
+        self._lazy_threshold_bytes = max(int(megabytes), 0) * 1024 * 1024
+
+    @Slot(int)
+    def setMemoryBudgetMb(self, megabytes: int) -> None:
+        """Memória que um carregamento pode usar (-1 = automático, 0 = sem limite)."""
+        self._memory_budget_mb = int(megabytes)
+
+    def _memoryBudget(self) -> Optional[int]:
+        """Orçamento em bytes para memory_plan (None = automático)."""
+        if self._memory_budget_mb < 0:
+            return None
+        return self._memory_budget_mb * 1024 * 1024
+
+    @Property('QVariantMap', notify=loadPlanChanged)
+    def loadPlan(self) -> Dict[str, Any]:
+        """Modo escolhido no último carregamento ("eager", "compact", "lazy"), motivo e estimativas."""
+        return self._load_plan
+
+    @Slot(bool)
+    def setBackgroundLoading(self, enabled: bool) -> None:
+        """Desligado, loadArff bloqueia até o fim (scripts sem event loop)."""
+        self._loader.background = bool(enabled)
+
+    @Property(bool, notify=refiningTypesChanged)
+    def refiningTypes(self) -> bool:
+        """Indica se a passada completa de inferência de tipos está rodando."""
+        return self._refiner.loading
+
+    @Property(bool, notify=metadataChanged)
+    def typesRefined(self) -> bool:
+        """True quando os tipos sugeridos vêm da passada completa (não da amostra)."""
+        return self._types_refined
+
+    @Slot(int)
+    def setInferenceSampleRows(self, rows: int) -> None:
+        """Tamanho da amostra usada para sugerir os tipos no carregamento."""
+        self._inference_sample_rows = max(int(rows), 1)
+
+    @Slot(bool)
+    def setAutoRefineTypes(self, enabled: bool) -> None:
+        """Ligado, cada carregamento dispara refineTypes() ao terminar."""
+        self._auto_refine_types = bool(enabled)
+
+    @Slot(int)
+    def setMaxNominalValues(self, limit: int) -> None:
+        """Teto de valores de um atributo nominal na exportação (0 = sem limite)."""
+        self._max_nominal_values = max(int(limit), 0)
+
+    def _nominalLimit(self) -> Optional[int]:
+        """Teto em vigor para build_attributes (None = sem limite)."""
+        from arff_schema import MAX_NOMINAL_VALUES
+
+        if self._max_nominal_values < 0:
+            return MAX_NOMINAL_VALUES
+        return self._max_nominal_values or None
+
+    @Slot(bool)
+    def setSortNominalValues(self, enabled: bool) -> None:
+        """Ligado, o domínio nominal sai ordenado; desligado, na ordem de aparição."""
+        self._sort_nominal_values = bool(enabled)
+
+    @Slot(str)
+    def setSparseOutput(self, mode: str) -> None:
+        """Formato do @data no ARFF: "auto" (esparso se quase tudo for zero), "always" ou "never"."""
+        from arff_io import SPARSE_MODES
+
+        if mode not in SPARSE_MODES:
+            self.errorOccurred.emit(f"Modo esparso inválido: {mode} (use {', '.join(SPARSE_MODES)})")
+            return
+        self._sparse_output = SPARSE_MODES[mode]
+
     @Slot(QUrl)
     def loadArff(self, file_url: QUrl) -> None:
-        """Carrega um arquivo ARFF."""
+        """Inicia a leitura de um arquivo ARFF em segundo plano."""
         try:
             if file_url.scheme() == "file":
                 file_path = file_url.toLocalFile()
@@ -102,44 +531,140 @@ class ARFFController(QObject):
             
             self._file_name = os.path.basename(file_path)
             self.fileNameChanged.emit()
+            self._refiner.cancel()
+            self._stats_engine.cancel()
+            self._pending_path = file_path
+            self._load_started = time.perf_counter()
             
-            # Carrega o arquivo ARFF
-            with open(file_path, 'r', encoding='utf-8') as f:
-                dataset = arff.load(f)
-            
+            # O resultado chega em _onArffLoaded / _onLoadFailed; o modo
+            # (completo, compacto ou janela) é escolhido no worker
+            self._loader.start(
+                file_path,
+                partial(
+                    _load_arff,
+                    file_path=file_path,
+                    budget=self._memoryBudget(),
+                    lazy_threshold=self._lazy_threshold_bytes,
+                    sample_rows=self._inference_sample_rows,
+                    compact=self._compact_memory,
+                    cache=default_cache(),
+                ),
+            )
+        except Exception as e:
+            self._onLoadFailed(str(e))
+
+    @Slot()
+    def cancelLoad(self) -> None:
+        """Cancela o carregamento em andamento; a base anterior é mantida."""
+        self._loader.cancel()
+
+    def _onArffLoaded(self, parsed: Dict[str, Any]) -> None:
+        """Recebe o resultado do worker já na thread da interface."""
+        try:
             # Extrai metadados
-            self._relation_name = dataset['relation']
-            self._attributes = dataset['attributes']
-            # Certifique-se de que os dados são list de lists
-            raw_data = dataset.get('data', [])
-            if not raw_data:
-                self._data = []
-            else:
-                # Converte cada linha para list explicitamente
-                try:
-                    self._data = [list(row) if hasattr(row, '__iter__') and not isinstance(row, str) else [row] for row in raw_data]
-                    print(f"DEBUG: Dados carregados: {len(self._data)} linhas")
-                except Exception as e:
-                    print(f"ERRO ao processar linhas: {e}")
-                    self._data = []
-            
-            # Gera sugestões de tipos baseadas nos metadados
-            self._generateTypeSuggestions()
-            
-            # Cria DataFrame para compatibilidade com a interface
-            self._createDataFrame()
+            self._relation_name = parsed['relation']
+            self._attributes = parsed['attributes']
+            dataframe = parsed['dataframe']
+            self._profiles = parsed['profiles']
+            self._file_path = self._pending_path
+            self._cache_key = parsed.get('cacheKey')
+            self._loaded_from_cache = bool(parsed.get('fromCache'))
+            self._types_refined = bool(parsed.get('typesRefined'))
+            self._memory_report = dict(parsed.get('memoryReport', {}))
+            self._setLoadPlan(dict(parsed.get('plan', {})))
+            # Escolhas de tipos: as guardadas no cache, ou nenhuma numa base nova
+            self._selected_types = dict(parsed.get('selectedTypes', {}))
+            # Resumos por coluna: os guardados no cache, ou calculados sob demanda
+            self._resetColumnStats(parsed.get('columnStats', {}))
+            log.debug("Dados carregados: %d linhas", len(dataframe))
             
-            self.dataLoaded.emit()
-            self.metadataChanged.emit()
+            timings = list(parsed.get('timings', []))
+            with span("model", timings):
+                # Gera sugestões de tipos: cabeçalho + inferência nos atributos STRING
+                self._generateTypeSuggestions(parsed['inference'])
+                
+                # Cria o modelo da tabela sobre o DataFrame montado no worker
+                self._createDataFrame(dataframe)
+                self._attribute_model.setProfiles(self.getAttributeProfiles())
+                self._resetLazyModel()
+                if self._load_plan.get('mode') == "lazy":
+                    # A tabela lê o arquivo sob demanda; _dataframe fica como amostra
+                    self._lazy_model = LazyFileModel(self._file_path, kind="arff")
+                    self._table_model = self._lazy_model
+                
+                self.dataLoaded.emit()
+                self.metadataChanged.emit()
+            elapsed = time.perf_counter() - self._load_started
+            rows = self._rowCount()
+            log.info("ARFF %s: %d instâncias em %.2f s%s, modo %s (%s)", self._file_name, rows, elapsed,
+                     " (cache)" if self._loaded_from_cache else "", self._load_plan.get('mode'),
+                     self._load_plan.get('reason'))
+            self._setStats("load", load_stats(timings, elapsed, rows, file=self._file_name,
+                                              fromCache=self._loaded_from_cache, plan=self._load_plan,
+                                              **memory_stats(self._memory_report)))
             
         except Exception as e:
-            self._data = None
-            self._attributes = []
-            self._relation_name = ""
-            self.errorOccurred.emit(f"Erro ao carregar arquivo ARFF: {e}")
+            self._onLoadFailed(str(e))
+            return
+        if self._auto_refine_types:
+            self.refineTypes()
+
+    @Slot()
+    def refineTypes(self) -> None:
+        """Confere os tipos sugeridos com uma passada completa, em segundo plano.
+
+        Só os atributos declarados como STRING dependem da inferência; ao
+        terminar, as sugestões deles passam a refletir o arquivo inteiro.
+        """
+        if not self._file_path or self._refiner.loading:
+            return
+        self._refiner.background = self._loader.background
+        self._refiner.start(self._file_path, _refine_arff_types)
+
+    def _onTypesRefined(self, inferences: Dict[str, Dict[str, Any]]) -> None:
+        self._generateTypeSuggestions(inferences)
+        self._types_refined = True
+        default_cache().update_in_background(self._cache_key, inference=copy.deepcopy(inferences), typesRefined=True)
+        # Só as linhas cujo tipo/confiança mudou são notificadas
+        self._attribute_model.setProfiles(self.getAttributeProfiles())
+        self.metadataChanged.emit()
+
+    def _onRefineFailed(self, message: str) -> None:
+        self.errorOccurred.emit(f"Erro ao conferir os tipos: {message}")
+
+    def _setLoadPlan(self, plan: Dict[str, Any]) -> None:
+        self._load_plan = plan
+        self.loadPlanChanged.emit()
+
+    def _resetLazyModel(self) -> None:
+        if self._lazy_model is not None:
+            self._lazy_model.close()
+            self._lazy_model = None
+
+    def _onLoadFailed(self, message: str) -> None:
+        self._resetLazyModel()
+        self._dataframe = None
+        self._table_model = None
+        self._file_path = None
+        self._cache_key = None
+        self._loaded_from_cache = False
+        self._memory_report = {}
+        self._setLoadPlan({})
+        self._refiner.cancel()
+        self._resetColumnStats({})
+        self._profiles = {}
+        self._attribute_model.clear()
+        self._attributes = []
+        self._relation_name = ""
+        self.errorOccurred.emit(f"Erro ao carregar arquivo ARFF: {message}")
     
-    def _generateTypeSuggestions(self) -> None:
-        """Gera sugestões de tipos baseadas nos metadados do ARFF."""
+    def _generateTypeSuggestions(self, inferences: Dict[str, Dict[str, Any]]) -> None:
+        """Gera sugestões de tipos baseadas nos metadados do ARFF.
+
+        O tipo declarado no cabeçalho vale com confiança 1.0; atributos STRING
+        podem esconder números, datas ou poucos valores distintos, e para eles
+        vale a inferência sobre os dados (type_inference).
+        """
         self._suggested_types = {}
         
         for attr_name, attr_type in self._attributes:
@@ -147,153 +672,193 @@ class ARFFController(QObject):
             # attr_type pode vir como string ('NUMERIC', 'STRING', 'DATE') ou lista (nominal)
             if isinstance(attr_type, str):
                 attr_type_upper = attr_type.upper().strip()
-                print(f"DEBUG: Tipo normalizado: '{attr_type_upper}'")
                 
                 # Mapeia exatamente conforme ARFF Weka
                 if 'STRING' in attr_type_upper:
                     self._suggested_types[attr_name] = 'Textual'
-                    print(f"DEBUG: Mapeado como Textual")
                 elif any(t in attr_type_upper for t in ('NUMERIC', 'REAL', 'INTEGER')):
                     self._suggested_types[attr_name] = 'Numérico'
-                    print(f"DEBUG: Mapeado como Numérico")
                 elif 'DATE' in attr_type_upper:
                     self._suggested_types[attr_name] = 'Data'
-                    print(f"DEBUG: Mapeado como Data")
                 else:
                     # Fallback para texto se não reconhecer
                     self._suggested_types[attr_name] = 'Textual'
-                    print(f"DEBUG: Mapeado como Textual (fallback)")
+                    log.debug("Tipo ARFF não reconhecido em %s: %r (Textual)", attr_name, attr_type)
             elif isinstance(attr_type, (list, tuple)):
                 self._suggested_types[attr_name] = 'Nominal'
             else:
                 self._suggested_types[attr_name] = 'Textual'
         
-        print(f"DEBUG: _generateTypeSuggestions finalizado. Tipos finais: {self._suggested_types}")
+        resolved: Dict[str, Dict[str, Any]] = {}
+        for attr_name, attr_type in self._attributes:
+            inference = inferences.get(attr_name)
+            if inference and isinstance(attr_type, str) and 'STRING' in attr_type.upper():
+                self._suggested_types[attr_name] = inference['type']
+                resolved[attr_name] = inference
+            else:
+                resolved[attr_name] = {
+                    'type': self._suggested_types[attr_name],
+                    'kind': 'declared',
+                    'confidence': 1.0,
+                    'exact': True,
+                }
+        from type_inference import apply_inference
+
+        apply_inference(self._profiles, resolved)
+        log.debug("Tipos sugeridos para %d atributos", len(self._suggested_types))
     
-    def _createDataFrame(self) -> None:
-        """Cria um DataFrame pandas a partir dos dados ARFF para exibição na interface."""
+    def _createDataFrame(self, dataframe: Optional[pd.DataFrame]) -> None:
+        """Guarda o DataFrame montado no worker e cria o modelo da tabela.
+
+        O DataFrame é o único armazenamento dos dados: slots de exemplos e
+        exportação operam coluna a coluna sobre ele.
+        """
         try:
-            if not self._data or not self._attributes:
+            if dataframe is None or dataframe.empty or not self._attributes:
                 self._dataframe = None
                 self._table_model = None
                 return
             
-            # Extrai nomes das colunas dos atributos
-            column_names = [attr[0] for attr in self._attributes]
-            
-            # Cria DataFrame
-            self._dataframe = pd.DataFrame(self._data, columns=column_names)
+            self._dataframe = dataframe
             
             # Cria o modelo da tabela
             self._table_model = DataFrameModel(self._dataframe)
+            self._table_model.queryFailed.connect(
+                lambda message: self.errorOccurred.emit(f"Erro ao ordenar/filtrar: {message}")
+            )
             
-            print(f"DEBUG: DataFrame criado com {len(self._dataframe)} linhas e {len(self._dataframe.columns)} colunas")
-            print(f"DEBUG: Colunas: {list(self._dataframe.columns)}")
+            log.debug("DataFrame com %d linhas e %d colunas", *self._dataframe.shape)
             
-        except Exception as e:
-            print(f"ERRO ao criar DataFrame: {e}")
+        except Exception:
+            log.exception("Erro ao criar o modelo da tabela")
             self._dataframe = None
             self._table_model = None
     
     @Slot(str, result=str)
     def getSuggestedType(self, attribute_name: str) -> str:
-        """Retorna o tipo sugerido para um atributo."""
-        suggested = self._suggested_types.get(attribute_name, 'Textual')
-        print(f"DEBUG: getSuggestedType('{attribute_name}') consultando tipos: {self._suggested_types}")
-        print(f"DEBUG: getSuggestedType('{attribute_name}') retornando: '{suggested}'")
-        return suggested
+        """Retorna o tipo sugerido para um atributo (ou o escolhido pelo usuário)."""
+        return self._effectiveType(attribute_name)
     
+    @Slot(str, result=float)
+    def getTypeConfidence(self, attribute_name: str) -> float:
+        """Confiança (0 a 1) do tipo sugerido; 1.0 quando o usuário escolheu."""
+        if attribute_name in self._selected_types:
+            return 1.0
+        profile = self._profiles.get(attribute_name)
+        return float(profile.get('confidence', 0.0)) if profile else 0.0
+
+    def _effectiveType(self, attribute_name: str) -> str:
+        """Escolha do usuário, se houver; senão a sugestão."""
+        if attribute_name in self._selected_types:
+            return self._selected_types[attribute_name]
+        return self._suggested_types.get(attribute_name, 'Textual')
+
+    def _rowCount(self) -> int:
+        if self._lazy_model is not None:
+            return self._lazy_model.rowCount()
+        return 0 if self._dataframe is None else len(self._dataframe)
+
     @Slot(str, result=list)
     def getAttributeExamples(self, attribute_name: str) -> List[str]:
         """Retorna os primeiros 5 exemplos de um atributo."""
-        if not self._data or not self._attributes:
-            return []
-        
-        # Encontra o índice do atributo
-        attr_index = None
-        for i, (name, _) in enumerate(self._attributes):
-            if name == attribute_name:
-                attr_index = i
-                break
-        
-        if attr_index is None:
-            return []
-        
-        # Coleta os primeiros 5 exemplos
-        examples = []
-        for i, row in enumerate(self._data[:5]):
-            if attr_index < len(row):
-                value = row[attr_index]
-                text = "" if value is None else str(value)
-                # Limita tamanho para evitar overflow visual
-                if len(text) > 30:
-                    text = text[:27] + "..."
-                examples.append(text)
-        
-        return examples
+        # Exemplos já formatados no carregamento (column_profile)
+        profile = self._profiles.get(attribute_name)
+        return list(profile['examples']) if profile else []
+
+    @Slot(result=list)
+    def getAttributeProfiles(self) -> List[Dict[str, Any]]:
+        """Todos os perfis de uma vez; o tipo vem do cabeçalho ou da escolha do usuário."""
+        from column_profile import profiles_for_qml
+
+        return profiles_for_qml(
+            self._profiles, {**self._suggested_types, **self._selected_types}, self._selected_types,
+            self._stats_engine.results,
+        )
     
     @Slot(result=list)
     def getAttributeNames(self) -> List[str]:
         """Retorna a lista de nomes dos atributos."""
-        names = [name for name, _ in self._attributes]
-        print(f"DEBUG: getAttributeNames() retornando: {names}")
-        return names
+        return [name for name, _ in self._attributes]
     
     @Slot(str, str)
     def setAttributeType(self, attribute_name: str, new_type: str) -> None:
         """Define um novo tipo para um atributo."""
-        print(f"DEBUG: setAttributeType('{attribute_name}', '{new_type}') chamado")
-        print(f"DEBUG: _suggested_types antes: {self._suggested_types}")
-        self._suggested_types[attribute_name] = new_type
-        print(f"DEBUG: _suggested_types depois: {self._suggested_types}")
+        log.debug("setAttributeType(%r, %r)", attribute_name, new_type)
+        self._selected_types[attribute_name] = new_type
+        # Escolha guardada com a base no cache: vale ao reabrir o arquivo
+        default_cache().update_in_background(self._cache_key, selectedTypes=dict(self._selected_types))
+        # Só o delegate deste atributo é notificado
+        self._attribute_model.updateAttribute(attribute_name, suggestedType=new_type, confidence=1.0)
     
     @Slot(str)
     def generateArff(self, output_path: str) -> None:
         """Gera um novo arquivo ARFF com os tipos selecionados."""
+        from dataframe_export import export_arff
+
         try:
-            if not self._data or not self._attributes:
+            if self._dataframe is None or not self._attributes:
                 self.errorOccurred.emit("Nenhum dado carregado para gerar ARFF")
                 return
+            if self._lazy_model is not None:
+                self.errorOccurred.emit("Base aberta em modo janela: exportação completa indisponível")
+                return
             
-            # Mapeia tipos em português de volta para ARFF
-            reverse_mapping = {
-                'Numérico': 'NUMERIC',
-                'Textual': 'STRING',
-                'Nominal': lambda values: list(set(str(v) for v in values if v is not None)),
-                'Data': 'DATE',
-                'Relacional': 'STRING'
-            }
-            
-            # Constrói novos atributos com tipos atualizados
-            new_attributes = []
-            for i, (attr_name, _) in enumerate(self._attributes):
-                selected_type = self._suggested_types.get(attr_name, 'Textual')
-                
-                if selected_type == 'Nominal':
-                    # Para nominal, precisamos extrair valores únicos da coluna
-                    column_values = [row[i] for row in self._data if i < len(row)]
-                    unique_values = list(set(str(v) for v in column_values if v is not None))
-                    new_attributes.append((attr_name, unique_values))
-                else:
-                    arff_type = reverse_mapping.get(selected_type, 'STRING')
-                    new_attributes.append((attr_name, arff_type))
-            
-            # Cria o dataset ARFF
-            dataset = {
-                'relation': self._relation_name,
-                'attributes': new_attributes,
-                'data': self._data
-            }
-            
-            # Salva o arquivo
-            with open(output_path, 'w', encoding='utf-8') as f:
-                arff.dump(dataset, f)
-            
-            self.successOccurred.emit(f"Arquivo ARFF salvo com sucesso em: {output_path}")
+            # Mapeia tipos em português de volta para ARFF (nominal: domínio da coluna)
+            chosen = [(attr_name, self._effectiveType(attr_name)) for attr_name, _ in self._attributes]
+            stats, notice = export_arff(output_path, self._relation_name, self._dataframe, chosen, self._nominalLimit(),
+                                        self._sort_nominal_values, self._sparse_output)
+            self._setStats("export", stats)
+            self.successOccurred.emit(f"Arquivo ARFF salvo com sucesso em: {output_path}" + notice)
             
         except Exception as e:
             self.errorOccurred.emit(f"Erro ao gerar arquivo ARFF: {e}")
 
+    @Slot(str)
+    def exportParquet(self, output_path: str) -> None:
+        """Grava a base em Parquet com os tipos escolhidos (columnar_io)."""
+        from dataframe_export import export_parquet
+
+        try:
+            if self._dataframe is None or not self._attributes:
+                self.errorOccurred.emit("Nenhum dado carregado para exportar")
+                return
+            if self._lazy_model is not None:
+                self.errorOccurred.emit("Base aberta em modo janela: exportação completa indisponível")
+                return
+            chosen = [(attr_name, self._effectiveType(attr_name)) for attr_name, _ in self._attributes]
+            self._setStats("export", export_parquet(output_path, self._dataframe, chosen, self._sort_nominal_values))
+            self.successOccurred.emit(f"Arquivo Parquet salvo em: {output_path}")
+        except Exception as e:
+            self.errorOccurred.emit(f"Erro ao exportar Parquet: {e}")
+
+    @Slot(str)
+    def exportCsv(self, output_path: str) -> None:
+        """Grava o `@data` do arquivo carregado em CSV, em fluxo (arff_io.write_csv).
+
+        Não usa o DataFrame: o arquivo é relido em blocos numa thread, com
+        memória constante, e vale também no modo janela. Nominais saem
+        decodificados, linhas esparsas densas e `?` como campo vazio. Os
+        tipos escolhidos na página 3 não se aplicam: o CSV não os guarda.
+        """
+        if not self._file_path:
+            self.errorOccurred.emit("Nenhum dado carregado para exportar")
+            return
+        self._export_started = time.perf_counter()
+        self._exporter.background = self._loader.background
+        self._exporter.start(self._file_path, partial(_stream_arff_to_csv, output_path=output_path))
+
+    @Slot()
+    def cancelExport(self) -> None:
+        """Cancela a exportação em fluxo (o arquivo de saída fica incompleto)."""
+        self._exporter.cancel()
+
+    def _onCsvExported(self, result: Dict[str, Any]) -> None:
+        elapsed = time.perf_counter() - self._export_started
+        log.info("CSV %s: %d linhas em fluxo em %.2f s", result['output'], result['rows'], elapsed)
+        self._setStats("export", load_stats(result['timings'], elapsed, result['rows'], file=result['output'],
+                                            streamed=True, format="csv"))
+        self.successOccurred.emit(f"Arquivo CSV salvo em: {result['output']}")
+
     @Slot(str)
     def saveMetadata(self, output_path: str) -> None:
         """Salva metadados + dados em formato ARFF, seguindo o padrão Weka ARFF.
@@ -301,42 +866,22 @@ class ARFFController(QObject):
         Observação: o nome do método permanece 'saveMetadata' porque a ação
         é guiada pela definição dos tipos na UI, mas persistimos também os dados.
         """
+        from dataframe_export import export_arff
+
         try:
             if not self._attributes:
                 self.errorOccurred.emit("Não há metadados carregados")
                 return
+            if self._lazy_model is not None:
+                self.errorOccurred.emit("Base aberta em modo janela: exportação completa indisponível")
+                return
 
             # Reaproveita a lógica de mapeamento de tipos escolhidos
-            new_attributes = []
-            for i, (attr_name, _) in enumerate(self._attributes):
-                selected_type = self._suggested_types.get(attr_name, 'Textual')
-                if selected_type == 'Nominal' and self._data:
-                    # Protege contra linhas com menos colunas do que o cabeçalho
-                    column_values = []
-                    for row in self._data:
-                        if i < len(row):
-                            column_values.append(row[i])
-                    unique_values = list(set(str(v) for v in column_values if v is not None))
-                    if len(unique_values) == 0:
-                        unique_values = ['_']
-                    new_attributes.append((attr_name, unique_values))
-                else:
-                    mapping = {
-                        'Numérico': 'NUMERIC',
-                        'Textual': 'STRING',
-                        'Data': 'DATE',
-                        'Relacional': 'STRING'
-                    }
-                    new_attributes.append((attr_name, mapping.get(selected_type, 'STRING')))
-
-            # Salva arquivo completo (metadados + dados)
-            dataset = {
-                'relation': self._relation_name or 'dataset',
-                'attributes': new_attributes,
-                'data': self._data or []
-            }
-            with open(output_path, 'w', encoding='utf-8') as f:
-                arff.dump(dataset, f)
-            self.successOccurred.emit(f"Arquivo ARFF salvo com sucesso em: {output_path}")
+            chosen = [(attr_name, self._effectiveType(attr_name)) for attr_name, _ in self._attributes]
+            # Salva arquivo completo (metadados + dados), em blocos
+            stats, notice = export_arff(output_path, self._relation_name or 'dataset', self._dataframe, chosen,
+                                        self._nominalLimit(), self._sort_nominal_values, self._sparse_output)
+            self._setStats("export", stats)
+            self.successOccurred.emit(f"Arquivo ARFF salvo com sucesso em: {output_path}" + notice)
         except Exception as e:
             self.errorOccurred.emit(f"Erro ao salvar metadados: {e}")
@@ -0,0 +1,603 @@
+"""Leitura e escrita de ARFF sem passar linha a linha por objetos Python.
+
+O liac-arff trabalha com listas de listas e formata célula por célula. Aqui
+o `@data` é escrito em blocos de linhas, formatando coluna a coluna com
+pandas/NumPy e gravando direto em um arquivo bufferizado: memória extra
+constante (um bloco) e sem a cópia completa da base em listas. Bases quase
+todas de zeros (bag-of-words, one-hot) saem no formato esparso do Weka
+(`{índice valor, ...}`), montado a partir dos índices das células não nulas.
+
+A leitura faz o caminho inverso: o cabeçalho é interpretado aqui e o `@data`
+vai, em blocos, para o tokenizador em C do pandas (aspas simples, `?` como
+ausente), já com os tipos certos: float64 para NUMERIC, Categorical para
+nominais e datetime64 para DATE. Linhas esparsas (`{i v, ...}`) e valores
+com escapes passam por um parser Python, só nas linhas que precisam.
+
+`write_csv` usa a mesma leitura em blocos, mas sem tipar: os valores saem
+como texto (já sem aspas e escapes), linhas esparsas viram densas e `?`
+vira campo vazio, para gravar o `@data` em CSV sem montar a base inteira.
+
+A formatação segue o liac-arff (mesmas regras de aspas e escapes), para que
+os arquivos gerados continuem sendo lidos por ele e pelo Weka.
+"""
+from __future__ import annotations
+
+import io
+import re
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+import pandas as pd
+
+from compressed_io import open_text_output
+from type_inference import parse_dates, parse_numeric
+
+# Caracteres que obrigam o valor a ir entre aspas (mesma regra do liac-arff)
+_QUOTE_CHARS = r"[\"'\\\s%,\x00-\x1f]"
+# Escapes de controle usados pelo liac-arff; demais viram \ooo (octal)
+_CONTROL_ESCAPES = {"\t": "\\t", "\n": "\\n", "\r": "\\r", "\b": "\\b", "\f": "\\f"}
+# Bloco padrão de linhas formatadas por vez no @data
+DEFAULT_CHUNK_ROWS = 100_000
+# Formato usado para colunas datetime64 (padrão ISO-8601 do Weka para DATE)
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+NUMERIC_TYPES = ("NUMERIC", "REAL", "INTEGER")
+# Fração de células implícitas (0 / 1º valor nominal) a partir da qual o
+# @data sai esparso: com índices de 2-3 dígitos, o arquivo já fica menor
+SPARSE_THRESHOLD = 0.7
+# Modos aceitos pelos controladores (setSparseOutput) e pelo convert.py
+SPARSE_MODES = {"auto": None, "always": True, "never": False}
+
+Attribute = Tuple[str, Any]
+
+# Um valor ARFF: 'aspas simples', "aspas duplas" ou texto até a vírgula
+_VALUE = re.compile(r"""\s*('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[^,]*?)\s*(,|$)""")
+# Nome entre aspas no início de uma declaração (@relation/@attribute)
+_QUOTED = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")""")
+# Entrada de uma linha esparsa: "3 valor" / "7 'outro valor'"
+_SPARSE_ENTRY = re.compile(r"""\s*(\d+)\s+('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[^,]*?)\s*(?:,|$)""")
+_ESCAPE = re.compile(r"\\(?:[0-7]{3}|.)")
+_UNESCAPES = {"t": "\t", "n": "\n", "r": "\r", "b": "\b", "f": "\f"}
+# Tokens do SimpleDateFormat (Java/Weka) -> strftime
+_JAVA_DATE = re.compile(r"'([^']*)'|yyyy|yy|MM|dd|HH|mm|ss|SSS|Z|z")
+_JAVA_DATE_TOKENS = {
+    "yyyy": "%Y", "yy": "%y", "MM": "%m", "dd": "%d", "HH": "%H",
+    "mm": "%M", "ss": "%S", "SSS": "%f", "Z": "%z", "z": "%Z",
+}
+
+
+def _escape_control(match) -> str:
+    char = match.group(0)
+    return _CONTROL_ESCAPES.get(char, "\\%03o" % ord(char))
+
+
+def encode_string(value: str) -> str:
+    """Codifica um único valor/nome ARFF (aspas simples + escapes se preciso)."""
+    return quote_strings(pd.Series([value], dtype=object)).iat[0]
+
+
+def quote_strings(text: pd.Series) -> pd.Series:
+    """Versão vetorizada de `encode_string` para uma Series de textos."""
+    needs_quotes = text.str.contains(_QUOTE_CHARS, regex=True).fillna(False).astype(bool)
+    # Sem aspas, "?" seria lido de volta como ausente
+    needs_quotes |= (text == "?").fillna(False).astype(bool)
+    if not needs_quotes.any():
+        return text
+    quoted = text[needs_quotes].str.replace(r"([\"'\\%])", r"\\\1", regex=True)
+    quoted = quoted.str.replace(r"[\x00-\x1f]", _escape_control, regex=True)
+    text = text.astype(object).copy()
+    text[needs_quotes] = "'" + quoted + "'"
+    return text
+
+
+def _attribute_type(type_: Any) -> str:
+    if isinstance(type_, (list, tuple)):
+        return "{%s}" % ", ".join(encode_string(str(v)) for v in type_)
+    return str(type_)
+
+
+def write_header(handle: TextIO, relation: str, attributes: Sequence[Attribute]) -> None:
+    """Escreve @RELATION, os @ATTRIBUTE e a linha @DATA."""
+    handle.write(f"@RELATION {encode_string(relation or 'dataset')}\n\n")
+    for name, type_ in attributes:
+        handle.write(f"@ATTRIBUTE {encode_string(str(name))} {_attribute_type(type_)}\n")
+    handle.write("\n@DATA\n")
+
+
+def _format_uniques(uniques: pd.Series, type_: Any) -> np.ndarray:
+    """Formata os valores distintos de uma coluna (sem ausentes)."""
+    dtype = uniques.dtype
+    is_numeric_type = isinstance(type_, str) and type_.upper() in NUMERIC_TYPES
+    if is_numeric_type and isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+        # str() de float Python = repr mais curto, igual ao liac-arff
+        return np.array(list(map(str, uniques.tolist())), dtype=object)
+    if is_numeric_type and isinstance(dtype, np.dtype) and dtype.kind == "b":
+        return np.array(list(map(str, uniques.astype(np.int8).tolist())), dtype=object)
+    if type_ == "DATE" and pd.api.types.is_datetime64_any_dtype(dtype):
+        raw = uniques.dt.strftime(DATE_FORMAT)
+    else:
+        raw = uniques.astype(object).astype(str)
+    text = quote_strings(pd.Series(raw.to_numpy(dtype=object), dtype=object)).to_numpy(dtype=object, copy=True)
+    # O liac-arff também grava texto vazio como ausente
+    text[text == ""] = "?"
+    return text
+
+
+def _is_numeric_type(type_: Any) -> bool:
+    return isinstance(type_, str) and type_.upper() in NUMERIC_TYPES
+
+
+def _factorize_column(values: pd.Series, type_: Any) -> Tuple[np.ndarray, pd.Series]:
+    """(códigos, valores distintos) de um trecho de coluna, já convertido para o tipo."""
+    if _is_numeric_type(type_) and not pd.api.types.is_numeric_dtype(values.dtype):
+        # Texto marcado como numérico ("3,5", " 42"): converte; o que não é número vira '?'
+        values = parse_numeric(values)
+    elif type_ == "DATE" and not pd.api.types.is_datetime64_any_dtype(values.dtype):
+        values = parse_dates(values)[0]
+    codes, uniques = pd.factorize(values)
+    return codes, pd.Series(uniques)
+
+
+def _format_column(values: pd.Series, type_: Any) -> np.ndarray:
+    """Formata um trecho de coluna como texto ARFF ('?' para ausentes).
+
+    Cada valor distinto é formatado uma única vez (pd.factorize) e o
+    resultado é espalhado pelos códigos; colunas nominais/repetitivas ficam
+    praticamente de graça.
+    """
+    codes, uniques = _factorize_column(values, type_)
+    formatted = _format_uniques(uniques, type_)
+    # Código -1 (ausente) cai na última posição: o '?'
+    formatted = np.append(formatted, "?")
+    return formatted[codes]
+
+
+def _implicit_uniques(uniques: pd.Series, type_: Any) -> np.ndarray:
+    """Quais valores distintos ficam implícitos numa linha esparsa.
+
+    Como no Weka: 0 em atributos numéricos e o primeiro valor declarado em
+    nominais. STRING e DATE são sempre gravados, assim como os ausentes.
+    """
+    if isinstance(type_, (list, tuple)) and type_:
+        return (uniques.astype(object).astype(str) == str(type_[0])).to_numpy(dtype=bool)
+    if _is_numeric_type(type_) and pd.api.types.is_numeric_dtype(uniques.dtype):
+        return (uniques == 0).to_numpy(dtype=bool)
+    return np.zeros(len(uniques), dtype=bool)
+
+
+def _implicit_mask(values: pd.Series, type_: Any) -> np.ndarray:
+    """Células de um trecho de coluna que uma linha esparsa omite."""
+    codes, uniques = _factorize_column(values, type_)
+    # Código -1 (ausente) cai na última posição: sempre gravado
+    return np.append(_implicit_uniques(uniques, type_), False)[codes]
+
+
+def sparsity(dataframe: Optional[pd.DataFrame], attributes: Sequence[Attribute]) -> float:
+    """Fração das células que o formato esparso omitiria (0.0 a 1.0).
+
+    Colunas numéricas são comparadas com 0 direto no array; só nominais e
+    texto marcado como numérico passam pelo pd.factorize.
+    """
+    if dataframe is None or dataframe.size == 0:
+        return 0.0
+    implicit = 0
+    for index, (_, type_) in enumerate(attributes):
+        values = dataframe.iloc[:, index]
+        if _is_numeric_type(type_) and pd.api.types.is_numeric_dtype(values.dtype):
+            implicit += int(values.eq(0).sum())
+        elif _is_numeric_type(type_) or (isinstance(type_, (list, tuple)) and type_):
+            implicit += int(np.count_nonzero(_implicit_mask(values, type_)))
+    return implicit / dataframe.size
+
+
+def resolve_sparse(
+    dataframe: Optional[pd.DataFrame],
+    attributes: Sequence[Attribute],
+    sparse: Optional[bool] = None,
+    threshold: float = SPARSE_THRESHOLD,
+) -> bool:
+    """Formato do @data: `sparse` quando forçado; com None, esparso acima de `threshold`."""
+    if sparse is not None:
+        return bool(sparse)
+    return sparsity(dataframe, attributes) >= threshold
+
+
+def _format_dense_rows(dataframe: pd.DataFrame, attributes: Sequence[Attribute]) -> List[str]:
+    columns = [_format_column(dataframe.iloc[:, i], type_) for i, (_, type_) in enumerate(attributes)]
+    return list(map(",".join, zip(*columns)))
+
+
+def _format_sparse_rows(dataframe: pd.DataFrame, attributes: Sequence[Attribute]) -> List[str]:
+    """Linhas `{índice valor, ...}` montadas pelos índices das células gravadas.
+
+    Coluna a coluna, só as células não implícitas são formatadas (com o
+    prefixo do índice): o custo segue as células gravadas, não a base. Uma
+    ordenação estável por linha as agrupa na ordem das colunas e
+    `searchsorted` dá o início de cada linha, como o indptr de uma matriz CSR.
+    """
+    rows_parts = [np.empty(0, dtype=np.intp)]
+    text_parts = [np.empty(0, dtype=object)]
+    for index, (_, type_) in enumerate(attributes):
+        values = dataframe.iloc[:, index]
+        if _is_numeric_type(type_) and pd.api.types.is_numeric_dtype(values.dtype):
+            # Comparação direta com 0 (ausente != 0): só as células gravadas passam pelo factorize
+            rows = np.flatnonzero(values.ne(0).to_numpy(dtype=bool, na_value=True))
+        else:
+            rows = np.flatnonzero(~_implicit_mask(values, type_))
+        rows_parts.append(rows)
+        text_parts.append(f"{index} " + _format_column(values.iloc[rows], type_))
+    rows = np.concatenate(rows_parts)
+    order = np.argsort(rows, kind="stable")
+    bounds = np.searchsorted(rows[order], np.arange(dataframe.shape[0] + 1))
+    entries = np.concatenate(text_parts)[order].tolist()
+    return ["{" + ",".join(entries[start:end]) + "}" for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def format_rows(dataframe: pd.DataFrame, attributes: Sequence[Attribute], sparse: bool = False) -> List[str]:
+    """Converte um bloco do DataFrame em linhas `@data` (sem quebra de linha).
+
+    Com `sparse`, as linhas saem no formato esparso do Weka.
+    """
+    if dataframe.shape[1] != len(attributes):
+        raise ValueError(
+            f"DataFrame com {dataframe.shape[1]} colunas para {len(attributes)} atributos"
+        )
+    if dataframe.shape[0] == 0:
+        return []
+    if sparse:
+        return _format_sparse_rows(dataframe, attributes)
+    return _format_dense_rows(dataframe, attributes)
+
+
+def write_rows(
+    handle: TextIO,
+    dataframe: Optional[pd.DataFrame],
+    attributes: Sequence[Attribute],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    sparse: bool = False,
+) -> int:
+    """Escreve as linhas do DataFrame em blocos; retorna quantas foram escritas."""
+    if dataframe is None:
+        return 0
+    written = 0
+    for start in range(0, dataframe.shape[0], chunk_rows):
+        lines = format_rows(dataframe.iloc[start:start + chunk_rows], attributes, sparse)
+        if lines:
+            handle.write("\n".join(lines))
+            handle.write("\n")
+        written += len(lines)
+    return written
+
+
+def open_output(output_path: str) -> TextIO:
+    """Abre o arquivo de saída com buffer grande (comprimido se terminar em .gz/.bz2/.xz/.zst)."""
+    return open_text_output(output_path)
+
+
+def write_arff(
+    output_path: str,
+    relation: str,
+    attributes: Sequence[Attribute],
+    dataframe: Optional[pd.DataFrame],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    sparse: bool = False,
+) -> int:
+    """Grava um ARFF completo (cabeçalho + dados); retorna o número de linhas.
+
+    `sparse` escolhe o formato do @data (ver `resolve_sparse`).
+    """
+    with open_output(output_path) as handle:
+        write_header(handle, relation, attributes)
+        return write_rows(handle, dataframe, attributes, chunk_rows, sparse)
+
+
+def _unescape_match(match) -> str:
+    escaped = match.group(0)[1:]
+    if len(escaped) == 3:
+        return chr(int(escaped, 8))
+    return _UNESCAPES.get(escaped, escaped)
+
+
+def decode_value(token: str) -> Optional[str]:
+    """Decodifica um valor bruto ARFF: remove aspas/escapes; '?' vira None."""
+    if token[:1] in ("'", '"') and len(token) >= 2 and token[-1] == token[0]:
+        inner = token[1:-1]
+        return _ESCAPE.sub(_unescape_match, inner) if "\\" in inner else inner
+    if token == "?":
+        return None
+    return token
+
+
+def split_values(text: str) -> List[Optional[str]]:
+    """Separa valores por vírgula respeitando aspas (linha densa ou nominal)."""
+    values: List[Optional[str]] = []
+    pos = 0
+    while True:
+        match = _VALUE.match(text, pos)
+        values.append(decode_value(match.group(1)))
+        if not match.group(2):
+            return values
+        pos = match.end()
+
+
+def parse_data_line(line: str, sparse_defaults: Sequence[Optional[str]]) -> List[Optional[str]]:
+    """Converte uma linha do @data (densa ou esparsa) em lista de textos.
+
+    Em linhas esparsas, colunas omitidas recebem `sparse_defaults[i]`.
+    """
+    stripped = line.strip()
+    if not stripped.startswith("{"):
+        return split_values(stripped)
+    row = list(sparse_defaults)
+    inner = stripped[1:stripped.rindex("}")] if "}" in stripped else stripped[1:]
+    for match in _SPARSE_ENTRY.finditer(inner):
+        column = int(match.group(1))
+        if column < len(row):
+            row[column] = decode_value(match.group(2))
+    return row
+
+
+def _java_date_format(pattern: str) -> str:
+    def convert(match) -> str:
+        if match.group(1) is not None:
+            return match.group(1).replace("%", "%%")
+        return _JAVA_DATE_TOKENS[match.group(0)]
+
+    return _JAVA_DATE.sub(convert, pattern)
+
+
+def _parse_attribute(text: str) -> Tuple[str, Any, Optional[str]]:
+    """Interpreta o que vem depois de '@attribute'; retorna (nome, tipo, formato de data)."""
+    text = text.strip()
+    match = _QUOTED.match(text)
+    if match:
+        name = decode_value(match.group(1)) or ""
+        rest = text[match.end(1):].strip()
+    else:
+        parts = text.split(None, 1)
+        name, rest = parts[0], (parts[1] if len(parts) > 1 else "")
+    if rest.startswith("{"):
+        inner = rest[1:rest.rindex("}")]
+        values = [v for v in split_values(inner) if v is not None]
+        # Categorias precisam ser únicas; preserva a ordem declarada
+        return name, list(dict.fromkeys(values)), None
+    keyword = rest.split(None, 1)[0].upper() if rest else ""
+    if keyword in NUMERIC_TYPES or keyword == "STRING":
+        return name, keyword, None
+    if keyword == "DATE":
+        pattern = rest[4:].strip()
+        date_format = decode_value(pattern) if pattern else None
+        return name, "DATE", _java_date_format(date_format) if date_format else None
+    if keyword == "RELATIONAL":
+        raise ValueError(f"Atributo relacional não suportado: {name}")
+    raise ValueError(f"Tipo de atributo inválido: {rest!r} ({name})")
+
+
+def read_header(handle: TextIO) -> Tuple[str, List[Attribute], Dict[str, Optional[str]]]:
+    """Lê até a linha @DATA (inclusive) e retorna (relação, atributos, formatos de data)."""
+    relation = ""
+    attributes: List[Attribute] = []
+    date_formats: Dict[str, Optional[str]] = {}
+    for line in iter(handle.readline, ""):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("%"):
+            continue
+        lower = stripped.lower()
+        if lower.startswith("@relation"):
+            relation = decode_value(stripped[len("@relation"):].strip()) or ""
+        elif lower.startswith("@attribute"):
+            name, type_, date_format = _parse_attribute(stripped[len("@attribute"):])
+            attributes.append((name, type_))
+            if type_ == "DATE":
+                date_formats[name] = date_format
+        elif lower.startswith("@data"):
+            return relation, attributes, date_formats
+        else:
+            raise ValueError(f"Linha inesperada no cabeçalho ARFF: {stripped[:60]!r}")
+    raise ValueError("Seção @data não encontrada")
+
+
+def _sparse_defaults(attributes: Sequence[Attribute]) -> List[Optional[str]]:
+    """Valor implícito (índice 0) de cada coluna em linhas esparsas."""
+    defaults: List[Optional[str]] = []
+    for _, type_ in attributes:
+        if isinstance(type_, list):
+            defaults.append(type_[0] if type_ else None)
+        elif type_ in NUMERIC_TYPES:
+            defaults.append("0")
+        else:
+            defaults.append("")
+    return defaults
+
+
+def _read_fast(text: str, names: List[str], attributes: Sequence[Attribute], as_text: bool = False) -> pd.DataFrame:
+    """Tokeniza linhas densas simples com o parser em C do pandas."""
+    dtypes = {name: (np.float64 if type_ in NUMERIC_TYPES and not as_text else str) for name, type_ in attributes}
+    return pd.read_csv(
+        io.StringIO(text),
+        header=None,
+        names=names,
+        dtype=dtypes,
+        quotechar="'",
+        skipinitialspace=True,
+        na_values=["?"],
+        keep_default_na=False,
+        comment="%",
+        skip_blank_lines=True,
+        engine="c",
+    )
+
+
+def _read_slow(lines: List[str], names: List[str], attributes: Sequence[Attribute], as_text: bool = False) -> pd.DataFrame:
+    """Linhas com escapes, aspas duplas ou formato esparso (parser Python)."""
+    defaults = _sparse_defaults(attributes)
+    rows = [parse_data_line(line, defaults) for line in lines]
+    width = len(names)
+    for row in rows:
+        if len(row) != width:
+            raise ValueError(f"Instância com {len(row)} valores, esperados {width}")
+    frame = pd.DataFrame(rows, columns=names, dtype=object)
+    if as_text:
+        return frame
+    for name, type_ in attributes:
+        if type_ in NUMERIC_TYPES:
+            frame[name] = pd.to_numeric(frame[name]).astype(np.float64)
+    return frame
+
+
+def _is_simple(line: str) -> bool:
+    # "'?'" é o texto "?", mas o na_values do pandas não distingue aspas
+    return "\\" not in line and '"' not in line and "'?'" not in line and not line.lstrip().startswith("{")
+
+
+def _read_chunk(lines: List[str], names: List[str], attributes: Sequence[Attribute], as_text: bool = False) -> pd.DataFrame:
+    """Bloco do `@data`; com `as_text`, todas as colunas ficam como texto."""
+    text = "".join(lines)
+    if "\\" not in text and '"' not in text and "{" not in text and "'?'" not in text:
+        return _read_fast(text, names, attributes, as_text)
+    # Separa as linhas que o pandas não entende e remonta na ordem original
+    lines = [line for line in lines if line.strip() and not line.lstrip().startswith("%")]
+    simple = [_is_simple(line) for line in lines]
+    fast_lines = [line for line, ok in zip(lines, simple) if ok]
+    slow_lines = [line for line, ok in zip(lines, simple) if not ok]
+    positions = np.arange(len(lines))
+    mask = np.array(simple, dtype=bool)
+    frames = []
+    if fast_lines:
+        fast = _read_fast("".join(fast_lines), names, attributes, as_text)
+        fast.index = positions[mask]
+        frames.append(fast)
+    slow = _read_slow(slow_lines, names, attributes, as_text)
+    slow.index = positions[~mask]
+    frames.append(slow)
+    return pd.concat(frames).sort_index().reset_index(drop=True)
+
+
+def _to_categorical(values: pd.Series, categories: List[str], name: str) -> pd.Series:
+    """Converte textos em Categorical com o domínio declarado, validando valores."""
+    dtype = pd.CategoricalDtype(categories)
+    codes, uniques = pd.factorize(values)
+    positions = dtype.categories.get_indexer(pd.Index(uniques, dtype=object).astype(str).str.strip())
+    if (positions < 0).any():
+        bad = uniques[int(np.flatnonzero(positions < 0)[0])]
+        raise ValueError(f"Valor nominal inválido em {name}: {bad!r}")
+    mapped = np.where(codes < 0, -1, positions[codes] if len(positions) else codes)
+    return pd.Series(pd.Categorical.from_codes(mapped, dtype=dtype), index=values.index, name=name)
+
+
+def _to_datetime(values: pd.Series, date_format: Optional[str]) -> pd.Series:
+    try:
+        return pd.to_datetime(values, format=date_format or "ISO8601")
+    except (ValueError, TypeError):
+        # Formato fora do padrão declarado: mantém o texto como veio
+        return values
+
+
+def _convert_chunk(frame: pd.DataFrame, attributes: Sequence[Attribute], date_formats: Dict[str, Optional[str]]) -> pd.DataFrame:
+    for name, type_ in attributes:
+        if isinstance(type_, list):
+            frame[name] = _to_categorical(frame[name], type_, name)
+        elif type_ == "DATE":
+            frame[name] = _to_datetime(frame[name], date_formats.get(name))
+    return frame
+
+
+def iter_chunks(
+    handle: TextIO,
+    attributes: Sequence[Attribute],
+    date_formats: Dict[str, Optional[str]],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    max_rows: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """Blocos tipados do `@data` (o cabeçalho já deve ter sido lido)."""
+    names = [name for name, _ in attributes]
+    remaining = max_rows
+    while remaining is None or remaining > 0:
+        size = chunk_rows if remaining is None else min(chunk_rows, remaining)
+        lines = list(islice(handle, size))
+        if not lines:
+            break
+        frame = _read_chunk(lines, names, attributes)
+        yield _convert_chunk(frame, attributes, date_formats)
+        if remaining is not None:
+            remaining -= len(frame)
+
+
+def read_arff(handle: TextIO, chunk_rows: int = DEFAULT_CHUNK_ROWS, max_rows: Optional[int] = None) -> Dict[str, Any]:
+    """Lê um ARFF inteiro (ou só `max_rows` instâncias) para um DataFrame tipado.
+
+    Retorna {'relation', 'attributes', 'dataframe'}; `attributes` segue o
+    formato do liac-arff: (nome, 'NUMERIC'|'REAL'|'INTEGER'|'STRING'|'DATE'|[valores]).
+    """
+    relation, attributes, date_formats = read_header(handle)
+    names = [name for name, _ in attributes]
+    frames = list(iter_chunks(handle, attributes, date_formats, chunk_rows, max_rows))
+    if frames:
+        dataframe = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    else:
+        dataframe = pd.DataFrame({name: pd.Series(dtype=object) for name in names})
+        dataframe = _convert_chunk(dataframe, attributes, date_formats)
+    return {'relation': relation, 'attributes': attributes, 'dataframe': dataframe}
+
+
+def _missing_to_empty(text: str) -> str:
+    """Troca os campos `?` por vazio num trecho fora de aspas (linhas terminadas em \\n)."""
+    text = text.replace("\n?,", "\n,").replace(",?\n", ",\n")
+    while ",?," in text:
+        text = text.replace(",?,", ",,")
+    return text
+
+
+def _dense_csv(text: str, columns: int) -> Optional[str]:
+    """Bloco de linhas densas já reescrito como CSV, sem passar pelo pandas.
+
+    Linhas densas simples de um ARFF já são CSV, a menos das aspas simples
+    (viram duplas) e do `?` (vira vazio): bastam operações de texto em C.
+    Retorna None quando o bloco precisa do parser (aspas duplas, escapes,
+    esparsas, comentários, linhas em branco, espaços fora de aspas ou uma
+    coluna só, em que `?` viraria linha vazia).
+    """
+    if columns < 2 or any(char in text for char in '"\\{%'):
+        return None
+    if not text.endswith("\n"):
+        text += "\n"
+    # Partes pares ficam fora de aspas: só nelas contam espaços e `?`
+    parts = ("\n" + text).split("'")
+    if len(parts) % 2 == 0:
+        return None
+    outside = "".join(parts[::2])
+    if " " in outside or "\t" in outside or "\n\n" in outside:
+        return None
+    if "?" in outside:
+        parts[::2] = [_missing_to_empty(part) if "?" in part else part for part in parts[::2]]
+    return '"'.join(parts)[1:]
+
+
+def write_csv(handle: TextIO, output_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, dense: bool = True) -> int:
+    """Grava o `@data` de `handle` em CSV, bloco a bloco; retorna o número de linhas.
+
+    Os valores não são tipados: saem como estão no arquivo, só sem aspas e
+    escapes (números e datas sem reformatação). Blocos de linhas densas
+    simples são reescritos direto como texto (`_dense_csv`); os demais passam
+    pelo tokenizador do pandas. Linhas esparsas viram densas com o valor
+    implícito de cada coluna e `?` vira campo vazio (`'?'`, entre aspas, é
+    o texto "?" nos dois caminhos). Com `dense=False` todo bloco passa pelo
+    tokenizador: o benchmark compara as duas saídas. A saída é comprimida
+    conforme a extensão (`dados.csv.gz`), como no `write_arff`.
+    """
+    _, attributes, _ = read_header(handle)
+    names = [name for name, _ in attributes]
+    written = 0
+    with open_text_output(output_path) as output:
+        # Cabeçalho com as mesmas regras de aspas do pandas, mesmo sem linhas
+        pd.DataFrame(columns=names).to_csv(output, index=False, lineterminator="\n")
+        for lines in iter(lambda: list(islice(handle, chunk_rows)), []):
+            text = _dense_csv("".join(lines), len(names)) if dense else None
+            if text is not None:
+                output.write(text)
+                written += len(lines)
+                continue
+            frame = _read_chunk(lines, names, attributes, as_text=True)
+            frame.to_csv(output, header=False, index=False, na_rep="", lineterminator="\n")
+            written += len(frame)
+    return written
@@ -0,0 +1,98 @@
+"""Montagem dos @ATTRIBUTE a partir dos tipos escolhidos na página 3.
+
+Usado por `generateArff`/`saveMetadata` dos dois controladores. O ponto
+central é o domínio dos atributos nominais: extraído em uma passada
+vetorizada (`pd.factorize`), em ordem estável (primeira aparição, ou
+ordenado) e com um teto de cardinalidade. Acima do teto o atributo é
+gravado como STRING — cortar o domínio geraria um ARFF inválido assim que
+aparecesse um valor fora da lista.
+"""
+from __future__ import annotations
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Máximo de valores distintos de um atributo nominal (None = sem limite)
+MAX_NOMINAL_VALUES = 1000
+
+# Rótulos da UI -> tipos ARFF (nominal é tratado à parte)
+TYPE_TO_ARFF = {
+    'Numérico': 'NUMERIC',
+    'Textual': 'STRING',
+    'Data': 'DATE',
+    'Relacional': 'STRING',
+}
+
+Attribute = Tuple[str, Any]
+
+
+def nominal_domain(
+    values: pd.Series,
+    max_values: Optional[int] = MAX_NOMINAL_VALUES,
+    sort: bool = False,
+) -> Optional[List[str]]:
+    """Valores distintos (como texto) de uma coluna, para um atributo nominal.
+
+    A ordem é a da primeira aparição, ou crescente com `sort` (numérica
+    quando a coluna é numérica). Colunas categóricas usam as categorias
+    declaradas. Ausentes e texto vazio ficam de fora (o escritor os grava
+    como '?'). Retorna None se houver mais de `max_values` valores.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        uniques = pd.Series(values.cat.categories)
+        if sort:
+            uniques = uniques.sort_values()
+    else:
+        try:
+            _, found = pd.factorize(values, sort=sort)
+        except TypeError:
+            # Tipos misturados não se ordenam: ordena depois, como texto
+            _, found = pd.factorize(values)
+        uniques = pd.Series(found)
+    # Mesma conversão para texto que o escritor (arff_io) aplica aos dados
+    text = uniques.astype(object).astype(str)
+    text = pd.unique(text[text != ""].to_numpy(dtype=object))
+    if sort and not pd.api.types.is_numeric_dtype(uniques.dtype):
+        text = sorted(text)
+    if max_values is not None and len(text) > max_values:
+        return None
+    return list(text)
+
+
+def build_attributes(
+    dataframe: Optional[pd.DataFrame],
+    chosen_types: Sequence[Tuple[str, str]],
+    max_nominal: Optional[int] = MAX_NOMINAL_VALUES,
+    sort_nominal: bool = False,
+) -> Tuple[List[Attribute], List[str]]:
+    """(nome, tipo ARFF) para cada (nome, rótulo da UI).
+
+    Retorna também os nomes dos atributos nominais que passaram de
+    `max_nominal` valores e foram gravados como STRING.
+    """
+    attributes: List[Attribute] = []
+    fallbacks: List[str] = []
+    for name, label in chosen_types:
+        if label == 'Nominal' and dataframe is not None and name in dataframe.columns:
+            domain = nominal_domain(dataframe[name], max_nominal, sort_nominal)
+            if domain:
+                attributes.append((name, domain))
+                continue
+            if domain is None:
+                fallbacks.append(name)
+            attributes.append((name, 'STRING'))
+        else:
+            attributes.append((name, TYPE_TO_ARFF.get(label, 'STRING')))
+    return attributes, fallbacks
+
+
+def fallback_warning(fallbacks: Sequence[str], max_nominal: Optional[int]) -> str:
+    """Aviso para a UI sobre nominais gravados como STRING ("" se nenhum)."""
+    if not fallbacks:
+        return ""
+    names = ", ".join(fallbacks)
+    return (
+        f" Atenção: {names} tinha(m) mais de {max_nominal} valores distintos "
+        f"e foi(ram) gravado(s) como STRING."
+    )
@@ -0,0 +1,107 @@
+"""Lista de atributos da página 3 como um modelo Qt com notificação por linha.
+
+Antes a página relia todos os perfis a cada `metadataChanged` e o Repeater
+recriava todos os delegates (cada um chamando o Python de novo). Com o
+`AttributeListModel`, trocar o tipo de um atributo emite `dataChanged` só
+para aquela linha e só com os papéis que mudaram; uma nova leitura com as
+mesmas colunas (ex.: `refineTypes()`) também só toca as linhas alteradas, e
+colunas novas no fim entram com `beginInsertRows`.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from PySide6.QtCore import QAbstractListModel, QByteArray, QModelIndex, QObject, Qt
+
+Profile = Dict[str, Any]
+
+
+class AttributeListModel(QAbstractListModel):
+    """Um item por atributo, com os campos do perfil (column_profile) como papéis."""
+
+    NameRole = Qt.UserRole + 1
+    SuggestedTypeRole = Qt.UserRole + 2
+    ExamplesRole = Qt.UserRole + 3
+    ConfidenceRole = Qt.UserRole + 4
+    InferredKindRole = Qt.UserRole + 5
+    StatsRole = Qt.UserRole + 6
+
+    # Papel -> chave do perfil (e nome do papel no QML)
+    _KEYS = {
+        NameRole: "name",
+        SuggestedTypeRole: "suggestedType",
+        ExamplesRole: "examples",
+        ConfidenceRole: "confidence",
+        InferredKindRole: "inferredKind",
+        # Resumo de column_stats (parcial enquanto o cálculo roda; None antes dele)
+        StatsRole: "stats",
+    }
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._profiles: List[Profile] = []
+        self._rows: Dict[str, int] = {}
+
+    # Leitura (QAbstractListModel)
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(self._profiles)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if not index.isValid() or not 0 <= index.row() < len(self._profiles):
+            return None
+        if role == Qt.DisplayRole:
+            role = self.NameRole
+        key = self._KEYS.get(role)
+        return None if key is None else self._profiles[index.row()].get(key)
+
+    def roleNames(self) -> Dict[int, QByteArray]:  # type: ignore[override]
+        return {role: QByteArray(key.encode()) for role, key in self._KEYS.items()}
+
+    # Atualização
+    def setProfiles(self, profiles: Sequence[Profile]) -> None:
+        """Troca a lista, notificando só o necessário.
+
+        Mesmas colunas: `dataChanged` nas linhas que mudaram. Colunas atuais
+        seguidas de novas: atualização das atuais + inserção das novas.
+        Qualquer outra mudança de colunas: reset.
+        """
+        names = [profile["name"] for profile in profiles]
+        current = [profile["name"] for profile in self._profiles]
+        if names[:len(current)] != current:
+            self.beginResetModel()
+            self._profiles = [dict(profile) for profile in profiles]
+            self._rows = {name: row for row, name in enumerate(names)}
+            self.endResetModel()
+            return
+        for row, profile in enumerate(profiles[:len(current)]):
+            self._updateRow(row, profile)
+        self.appendProfiles(profiles[len(current):])
+
+    def appendProfiles(self, profiles: Sequence[Profile]) -> None:
+        """Acrescenta atributos no fim (cargas em blocos) com beginInsertRows."""
+        if not profiles:
+            return
+        first = len(self._profiles)
+        self.beginInsertRows(QModelIndex(), first, first + len(profiles) - 1)
+        for profile in profiles:
+            self._rows[profile["name"]] = len(self._profiles)
+            self._profiles.append(dict(profile))
+        self.endInsertRows()
+
+    def updateAttribute(self, name: str, **changes: Any) -> None:
+        """Altera campos de um atributo (ex.: suggestedType) e notifica só a linha dele."""
+        row = self._rows.get(name)
+        if row is not None:
+            self._updateRow(row, {**self._profiles[row], **changes})
+
+    def clear(self) -> None:
+        if self._profiles:
+            self.setProfiles([])
+
+    def _updateRow(self, row: int, profile: Profile) -> None:
+        current = self._profiles[row]
+        roles = [role for role, key in self._KEYS.items() if current.get(key) != profile.get(key)]
+        self._profiles[row] = dict(profile)
+        if roles:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index, roles)
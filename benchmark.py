@@ -0,0 +1,504 @@
+"""Benchmark dos caminhos de carregamento, exibição e exportação.
+
+Gera bases sintéticas (de 1e3 a 1e7 linhas, em vários formatos), roda os
+controladores sem interface (plataforma Qt "offscreen") e mede cada etapa:
+tempo, pico de memória (RSS) e vazão. O resultado sai em JSON, para comparar
+versões:
+
+    python benchmark.py                                  # tamanhos padrão
+    python benchmark.py --rows 1e3,1e5,1e7 --shapes narrow,wide
+    python benchmark.py -o depois.json --compare antes.json
+
+Formatos ("shapes"):
+    narrow   8 colunas mistas (inteiros, reais, data, nominal, texto curto)
+    wide     1000 colunas numéricas
+    nominal  20 colunas nominais (3 a 60 valores)
+    string   6 colunas de texto livre (20 a 120 caracteres)
+    missing  o formato narrow com metade das células vazias
+
+Etapas, na ordem: load_csv (com o cache de parse ligado, como na
+aplicação), cache_store (espera a gravação do cache), display_csv (leitura
+de janelas da tabela via DataFrameModel.data, como o TableView faz ao
+rolar), generate_arff, save_metadata, save_compact (recarrega com a
+compactação de dtypes e confere que o ARFF sai idêntico ao de save_metadata),
+load_arff (o ARFF de save_metadata), display_arff, export_csv (esse ARFF
+em CSV pelos dois caminhos de arff_io.write_csv, conferindo que dão os
+mesmos valores) e load_csv_cached (reabertura com acerto no cache). As etapas
+load_csv e load_arff trazem também o pico previsto por memory_plan
+(estimated_peak_mb), para conferir o estimador contra rss_delta_mb.
+
+Cada base roda em um processo novo, para que o pico de memória de uma não
+contamine a outra. As bases geradas ficam em --data-dir e são reaproveitadas.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import filecmp
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from instrumentation import current_rss
+
+SHAPES = ("narrow", "wide", "nominal", "string", "missing")
+DEFAULT_ROWS = (1_000, 10_000, 100_000)
+# Bases acima disso (linhas x colunas) são puladas: --max-cells para mudar
+DEFAULT_MAX_CELLS = 50_000_000
+# Janela de rolagem simulada: linhas x colunas visíveis, e quantas posições
+VIEW_ROWS = 40
+VIEW_COLUMNS = 30
+VIEW_POSITIONS = 50
+# Linhas geradas (e gravadas) por vez: 1e7 linhas não passam pela memória de uma vez
+_GENERATE_CHUNK = 500_000
+# Comparação: etapa mais lenta que isso (razão) conta como regressão
+DEFAULT_TOLERANCE = 1.2
+# ... desde que leve pelo menos isso (etapas curtas demais são só ruído)
+DEFAULT_MIN_SECONDS = 0.05
+
+Result = Dict[str, Any]
+
+
+# Geração das bases
+
+def _words(rng, count: int, low: int, high: int) -> List[str]:
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choice(list(alphabet), size=rng.integers(3, 10))) for _ in range(500)]
+    lengths = rng.integers(low, high, size=count)
+    pieces = rng.choice(vocabulary, size=(count, max(high // 4, 1)))
+    return [" ".join(row)[:length] for row, length in zip(pieces, lengths)]
+
+
+def _narrow_chunk(rng, start: int, rows: int):
+    import numpy as np
+    import pandas as pd
+
+    days = rng.integers(0, 3650, size=rows).astype("timedelta64[D]")
+    return pd.DataFrame({
+        "id": np.arange(start, start + rows),
+        "valor": rng.normal(100.0, 25.0, size=rows).round(4),
+        "quantidade": rng.integers(0, 1000, size=rows),
+        "taxa": rng.random(size=rows).round(6),
+        "data": (np.datetime64("2015-01-01") + days).astype(str),
+        "categoria": rng.choice(["norte", "sul", "leste", "oeste", "centro"], size=rows),
+        "ativo": rng.choice(["sim", "não"], size=rows),
+        "descricao": rng.choice(_words(rng, 2000, 8, 30), size=rows),
+    })
+
+
+def _chunk(shape: str, rng, start: int, rows: int):
+    import numpy as np
+    import pandas as pd
+
+    if shape == "narrow":
+        return _narrow_chunk(rng, start, rows)
+    if shape == "wide":
+        values = rng.random(size=(rows, 1000)).round(4)
+        return pd.DataFrame(values, columns=[f"f{index:04d}" for index in range(1000)])
+    if shape == "nominal":
+        columns = {}
+        for index in range(20):
+            levels = [f"n{index}_{level}" for level in range(3 + index * 3)]
+            columns[f"nom{index:02d}"] = rng.choice(levels, size=rows)
+        return pd.DataFrame(columns)
+    if shape == "string":
+        columns = {"id": np.arange(start, start + rows)}
+        pool = _words(rng, 20_000, 20, 120)
+        for index in range(5):
+            columns[f"texto{index}"] = rng.choice(pool, size=rows)
+        return pd.DataFrame(columns)
+    if shape == "missing":
+        frame = _narrow_chunk(rng, start, rows)
+        for name in frame.columns[1:]:
+            frame[name] = frame[name].mask(rng.random(size=rows) < 0.5)
+        return frame
+    raise ValueError(f"Formato desconhecido: {shape}")
+
+
+def dataset_path(data_dir: str, shape: str, rows: int) -> str:
+    return os.path.join(data_dir, f"bench_{shape}_{rows}.csv")
+
+
+def generate_dataset(data_dir: str, shape: str, rows: int) -> str:
+    """Gera (ou reaproveita) a base sintética; a semente depende só do formato e do tamanho."""
+    import numpy as np
+
+    path = dataset_path(data_dir, shape, rows)
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    rng = np.random.default_rng([SHAPES.index(shape), rows])
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8", newline="") as handle:
+        for start in range(0, rows, _GENERATE_CHUNK):
+            frame = _chunk(shape, rng, start, min(_GENERATE_CHUNK, rows - start))
+            frame.to_csv(handle, index=False, header=start == 0)
+    os.replace(temporary, path)
+    return path
+
+
+def columns_of(shape: str) -> int:
+    return {"narrow": 8, "wide": 1000, "nominal": 20, "string": 6, "missing": 8}[shape]
+
+
+# Medição
+
+class RssSampler:
+    """Pico de RSS durante uma etapa (amostras de /proc a cada poucos ms).
+
+    Fora do Linux, cai para ru_maxrss, que é o pico do processo inteiro.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.start_bytes = 0
+        self.peak_bytes = 0
+
+    def __enter__(self) -> "RssSampler":
+        current = current_rss()
+        if current is None:
+            self.start_bytes = self.peak_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            return self
+        self.start_bytes = self.peak_bytes = current
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.peak_bytes = max(self.peak_bytes, current_rss() or 0)
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.peak_bytes = max(self.peak_bytes, current_rss() or 0)
+        else:
+            self.peak_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _stage(name: str, action: Callable[[], Optional[Dict[str, float]]], errors: List[str]) -> Result:
+    """Roda uma etapa e devolve tempo, memória e as contagens que ela informar."""
+    del errors[:]
+    with RssSampler() as rss, open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        try:
+            counts = action() or {}
+        except Exception as e:
+            errors.append(str(e))
+            counts = {}
+        seconds = time.perf_counter() - start
+    mb = 1024 * 1024
+    stage: Result = {
+        "stage": name,
+        "seconds": round(seconds, 6),
+        "peak_rss_mb": round(rss.peak_bytes / mb, 1),
+        "rss_delta_mb": round((rss.peak_bytes - rss.start_bytes) / mb, 1),
+    }
+    for unit, amount in counts.items():
+        stage[unit] = amount
+        stage[f"{unit}_per_s"] = round(amount / seconds, 1) if seconds > 0 else None
+    if errors:
+        stage["error"] = "; ".join(errors)
+    return stage
+
+
+def _with_estimate(stage: Result, controller) -> Result:
+    """Acrescenta à etapa de carregamento o modo e o pico previstos (memory_plan)."""
+    plan = controller.stats.get("load", {}).get("plan") or {}
+    if plan:
+        stage["load_mode"] = plan.get("mode")
+        stage["estimated_peak_mb"] = plan.get("estimatedPeakMb")
+    return stage
+
+
+def _scroll(model) -> Dict[str, float]:
+    """Lê janelas da tabela como o TableView ao rolar: início, fim e posições sorteadas."""
+    from PySide6.QtCore import Qt
+
+    rows, columns = model.rowCount(), model.columnCount()
+    if not rows or not columns:
+        return {"cells": 0}
+    rng = random.Random(0)
+    starts = [0, max(rows - VIEW_ROWS, 0)] + [rng.randrange(rows) for _ in range(VIEW_POSITIONS - 2)]
+    visible = range(min(VIEW_COLUMNS, columns))
+    cells = 0
+    for first in starts:
+        for row in range(first, min(first + VIEW_ROWS, rows)):
+            for column in visible:
+                model.data(model.index(row, column), Qt.DisplayRole)
+                cells += 1
+        for column in visible:
+            model.headerData(column, Qt.Horizontal, Qt.DisplayRole)
+    return {"cells": cells}
+
+
+def run_dataset(csv_path: str, shape: str, rows: int, work_dir: str, use_cache: bool) -> Result:
+    """Todas as etapas para uma base; roda no processo filho."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # Cache de parse isolado: o benchmark não reaproveita (nem suja) o do usuário
+    os.environ["MIDAS_CACHE_DIR"] = os.path.join(work_dir, "cache")
+    import importlib
+
+    from PySide6.QtCore import QCoreApplication, QUrl
+    from arff_controller import ARFFController
+    from csv_controller import CSVController
+    from parse_cache import default_cache
+    from startup import BACKEND_MODULES
+
+    # Como o aquecimento da aplicação: o import do pandas fica fora de load_csv
+    for module in BACKEND_MODULES:
+        importlib.import_module(module)
+
+    app = QCoreApplication.instance() or QCoreApplication([])  # noqa: F841 (mantida viva)
+    errors: List[str] = []
+    size = os.path.getsize(csv_path)
+
+    def controller(kind):
+        created = kind()
+        created.setBackgroundLoading(False)
+        # Base inteira em memória (o modo janela tem outro custo); sem limite de
+        # memória o plano só estima, e a estimativa vai para a etapa
+        created.setLazyThresholdMb(1 << 30)
+        created.setMemoryBudgetMb(0)
+        created.setCacheEnabled(use_cache)
+        created.errorOccurred.connect(errors.append)
+        return created
+
+    csv = controller(CSVController)
+    url = QUrl.fromLocalFile(os.path.abspath(csv_path))
+    generated = os.path.join(work_dir, "generate.arff")
+    saved = os.path.join(work_dir, "save.arff")
+    stages = []
+
+    def load_csv():
+        csv.loadCsv(url)
+        return {"rows": csv.rowCount(), "bytes": size}
+
+    stages.append(_with_estimate(_stage("load_csv", load_csv, errors), csv))
+    if use_cache:
+        stages.append(_stage("cache_store", lambda: default_cache().wait(), errors))
+    stages.append(_stage("display_csv", lambda: _scroll(csv.tableModel), errors))
+
+    def export(slot, path):
+        def run():
+            slot(path)
+            return {"rows": rows, "bytes": os.path.getsize(path) if os.path.exists(path) else 0}
+        return run
+
+    stages.append(_stage("generate_arff", export(csv.generateArff, generated), errors))
+    stages.append(_stage("save_metadata", export(csv.saveMetadata, saved), errors))
+
+    saved_compact = os.path.join(work_dir, "save_compact.arff")
+
+    def save_compact():
+        # A compactação só muda a memória: o ARFF tem de sair byte a byte igual.
+        # Controlador local: a base compactada é liberada ao fim da etapa
+        compact = controller(CSVController)
+        compact.setCompactMemory(True)
+        compact.loadCsv(url)
+        compact.saveMetadata(saved_compact)
+        if os.path.exists(saved) and not filecmp.cmp(saved, saved_compact, shallow=False):
+            errors.append("o ARFF com a compactação difere do ARFF sem ela")
+        return {"rows": compact.rowCount()}
+
+    stages.append(_stage("save_compact", save_compact, errors))
+
+    arff = controller(ARFFController)
+
+    def load_arff():
+        arff.loadArff(QUrl.fromLocalFile(saved))
+        return {"rows": arff.instanceCount, "bytes": os.path.getsize(saved)}
+
+    def export_csv():
+        # A reescrita direta (_dense_csv) e o tokenizador têm de dar os mesmos valores
+        import pandas as pd
+        from arff_io import write_csv
+
+        outputs = [os.path.join(work_dir, name) for name in ("export.csv", "export_parser.csv")]
+        for output, dense in zip(outputs, (True, False)):
+            with open(saved, encoding="utf-8") as handle:
+                exported = write_csv(handle, output, dense=dense)
+        frames = [pd.read_csv(output, dtype=str, keep_default_na=False) for output in outputs]
+        if not frames[0].equals(frames[1]):
+            errors.append("write_csv difere entre a reescrita direta e o tokenizador")
+        return {"rows": exported, "bytes": os.path.getsize(outputs[0])}
+
+    if os.path.exists(saved):
+        stages.append(_with_estimate(_stage("load_arff", load_arff, errors), arff))
+        stages.append(_stage("display_arff", lambda: _scroll(arff.tableModel), errors))
+        stages.append(_stage("export_csv", export_csv, errors))
+    if use_cache:
+        default_cache().wait()
+        reopened = controller(CSVController)
+
+        def load_cached():
+            reopened.loadCsv(url)
+            if not reopened.loadedFromCache:
+                errors.append("a reabertura não veio do cache")
+            return {"rows": reopened.rowCount(), "bytes": size}
+
+        stages.append(_stage("load_csv_cached", load_cached, errors))
+    return {
+        "dataset": os.path.basename(csv_path),
+        "shape": shape,
+        "rows": rows,
+        "columns": columns_of(shape),
+        "file_mb": round(size / (1024 * 1024), 2),
+        "stages": stages,
+    }
+
+
+def _dataset_job(csv_path: str, shape: str, rows: int, use_cache: bool) -> Result:
+    """Ponto de entrada dos processos filhos (precisa ser de nível de módulo)."""
+    work_dir = tempfile.mkdtemp(prefix="midas-bench-")
+    try:
+        return run_dataset(csv_path, shape, rows, work_dir, use_cache)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# Relatório e comparação
+
+def environment() -> Dict[str, Any]:
+    import pandas as pd
+    import PySide6
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "pyside6": PySide6.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def print_results(results: List[Result]) -> None:
+    print(f"\n{'base':<28} {'etapa':<16} {'tempo (s)':>10} {'pico MB':>9} {'previsto':>9} {'vazão':>22}")
+    for result in results:
+        for stage in result["stages"]:
+            if "cells_per_s" in stage:
+                rate = f"{stage['cells_per_s'] or 0:,.0f} células/s"
+            elif "rows_per_s" in stage:
+                rate = f"{stage['rows_per_s'] or 0:,.0f} linhas/s"
+            else:
+                rate = ""
+            note = f"  ERRO: {stage['error']}" if "error" in stage else ""
+            # Pico previsto por memory_plan, comparável a rss_delta_mb (só nas cargas)
+            estimated = stage.get("estimated_peak_mb")
+            estimated = f"{estimated:.1f}" if estimated is not None else ""
+            print(f"{result['dataset'][:28]:<28} {stage['stage']:<16} {stage['seconds']:>10.3f} "
+                  f"{stage['peak_rss_mb']:>9.1f} {estimated:>9} {rate:>22}{note}")
+
+
+def compare(
+    results: List[Result],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+    min_seconds: float = DEFAULT_MIN_SECONDS,
+) -> List[str]:
+    """Etapas mais lentas que a linha de base além da tolerância (mesma base e etapa)."""
+    before = {
+        (result["dataset"], stage["stage"]): stage["seconds"]
+        for result in baseline.get("results", [])
+        for stage in result["stages"]
+    }
+    regressions = []
+    print(f"\n{'base':<28} {'etapa':<16} {'antes (s)':>10} {'agora (s)':>10} {'razão':>7}")
+    for result in results:
+        for stage in result["stages"]:
+            old = before.get((result["dataset"], stage["stage"]))
+            if not old:
+                continue
+            ratio = stage["seconds"] / old
+            slow = ratio > tolerance and max(old, stage["seconds"]) >= min_seconds
+            flag = "  <- regressão" if slow else ""
+            print(f"{result['dataset'][:28]:<28} {stage['stage']:<16} {old:>10.3f} "
+                  f"{stage['seconds']:>10.3f} {ratio:>7.2f}{flag}")
+            if flag:
+                regressions.append(f"{result['dataset']}/{stage['stage']}: {ratio:.2f}x")
+    return regressions
+
+
+def _parse_rows(text: str) -> List[int]:
+    return [int(float(item)) for item in text.split(",") if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mede carregamento, exibição e exportação em bases sintéticas.")
+    parser.add_argument("--rows", default=",".join(str(r) for r in DEFAULT_ROWS),
+                        help="tamanhos, separados por vírgula (aceita 1e6)")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help=f"formatos: {', '.join(SHAPES)}")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "midas-bench-data"),
+                        help="onde as bases geradas ficam (reaproveitadas entre execuções)")
+    parser.add_argument("--max-cells", type=float, default=DEFAULT_MAX_CELLS,
+                        help="pula bases com mais células (linhas x colunas) que isso")
+    parser.add_argument("--no-cache", action="store_true", help="mede sem o cache de parse em disco")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="arquivo JSON do resultado")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="razão de tempo acima da qual a etapa conta como regressão")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="etapas mais curtas que isso não contam como regressão")
+    args = parser.parse_args(argv)
+
+    shapes = [shape.strip() for shape in args.shapes.split(",") if shape.strip()]
+    unknown = [shape for shape in shapes if shape not in SHAPES]
+    if unknown:
+        print(f"Formato desconhecido: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    sizes = _parse_rows(args.rows)
+
+    plan = []
+    for shape in shapes:
+        for rows in sizes:
+            if rows * columns_of(shape) > args.max_cells:
+                print(f"pulando {shape} x {rows} linhas (acima de --max-cells)")
+                continue
+            plan.append((shape, rows))
+
+    results = []
+    # "spawn" e um processo por base: pico de RSS medido do zero em cada uma
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        for index, (shape, rows) in enumerate(plan, start=1):
+            start = time.perf_counter()
+            csv_path = generate_dataset(args.data_dir, shape, rows)
+            generated = time.perf_counter() - start
+            result = executor.submit(_dataset_job, csv_path, shape, rows, not args.no_cache).result()
+            result["generate_seconds"] = round(generated, 3)
+            results.append(result)
+            total = sum(stage["seconds"] for stage in result["stages"])
+            print(f"[{index}/{len(plan)}] {result['dataset']}: {total:.2f} s", flush=True)
+
+    print_results(results)
+    report = {"environment": environment(), "results": results}
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, ensure_ascii=False, indent=2)
+    print(f"\nResultado gravado em {args.output}")
+
+    failed = any("error" in stage for result in results for stage in result["stages"])
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), args.tolerance, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} etapa(s) mais lenta(s) que {args.compare}: {', '.join(regressions)}")
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Perfil por coluna calculado uma vez por carregamento.
+
+A página 3 consulta nomes, tipo sugerido e exemplos de cada atributo várias
+vezes (um delegate por coluna, recriado a cada `metadataChanged`). Em vez de
+recalcular `nunique()`/`head()` sobre a coluna inteira a cada chamada, os
+controladores montam estes perfis no worker de carregamento e respondem a
+partir deles. O perfil só muda quando uma nova base é carregada; a escolha
+manual de tipo fica em uma camada à parte (`_selected_types`).
+"""
+from __future__ import annotations
+
+from typing import Any, Collection, Dict, List, Optional
+
+import pandas as pd
+
+# Exemplos mostrados por atributo na página 3
+EXAMPLE_COUNT = 5
+# Exemplos mais longos que isso são cortados com "..."
+EXAMPLE_WIDTH = 30
+# Heurística de nominal: até N valores distintos e menos de 10% das linhas
+NOMINAL_MAX_UNIQUE = 10
+NOMINAL_MAX_RATIO = 0.1
+
+Profile = Dict[str, Any]
+
+
+def format_example(value: Any) -> str:
+    """Texto curto de um valor para exibição ("" para ausentes)."""
+    text = "" if pd.isna(value) else str(value)
+    if len(text) > EXAMPLE_WIDTH:
+        text = text[:EXAMPLE_WIDTH - 3] + "..."
+    return text
+
+
+def suggest_type(series: pd.Series, unique_count: Optional[int]) -> str:
+    """Sugere o tipo (rótulo da UI) a partir do dtype do pandas."""
+    dtype = series.dtype
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "Numérico"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "Data"
+    total = len(series)
+    # Verifica se parece com dados nominais (poucos valores únicos)
+    if unique_count is not None and total and unique_count <= NOMINAL_MAX_UNIQUE and unique_count / total < NOMINAL_MAX_RATIO:
+        return "Nominal"
+    return "Textual"
+
+
+def profile_column(name: str, series: pd.Series) -> Profile:
+    """Perfil de uma coluna: dtype, contagens, exemplos e tipo sugerido.
+
+    `uniqueCount` só é calculado onde a sugestão depende dele (colunas não
+    numéricas/não data); nas demais fica `None`, evitando um `nunique()`
+    caro por coluna numérica.
+    """
+    dtype = series.dtype
+    needs_unique = not (
+        pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype)
+    )
+    unique_count = int(series.nunique()) if needs_unique else None
+    return {
+        "name": str(name),
+        "dtype": str(dtype),
+        "rowCount": int(len(series)),
+        "nullCount": int(series.isna().sum()),
+        "uniqueCount": unique_count,
+        "examples": [format_example(v) for v in series.head(EXAMPLE_COUNT)],
+        "suggestedType": suggest_type(series, unique_count),
+    }
+
+
+def build_profiles(dataframe: Optional[pd.DataFrame]) -> Dict[str, Profile]:
+    """Perfis de todas as colunas, na ordem do DataFrame."""
+    if dataframe is None:
+        return {}
+    return {str(name): profile_column(name, dataframe[name]) for name in dataframe.columns}
+
+
+def profiles_for_qml(
+    profiles: Dict[str, Profile],
+    effective_types: Dict[str, str],
+    user_choices: Collection[str] = (),
+    stats: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[Profile]:
+    """Lista de perfis para o QML com o tipo efetivo (override do usuário).
+
+    Atributos em `user_choices` (tipo escolhido à mão) saem com confiança 1.0;
+    `stats` acrescenta o resumo de column_stats de cada atributo.
+    """
+    result: List[Profile] = []
+    for name, profile in profiles.items():
+        item = dict(profile)
+        item["suggestedType"] = effective_types.get(name, profile["suggestedType"])
+        if name in user_choices:
+            item["confidence"] = 1.0
+        if stats is not None:
+            item["stats"] = stats.get(name)
+        result.append(item)
+    return result
@@ -0,0 +1,418 @@
+"""Resumo estatístico por coluna para a página 3, calculado em segundo plano.
+
+Cinco exemplos por atributo não bastam para escolher entre Nominal,
+Numérico e Textual. Aqui cada coluna ganha um resumo:
+
+- numéricas e datas: ausentes, mínimo, máximo, média, desvio padrão e um
+  histograma de `HISTOGRAM_BINS` faixas de mesma largura;
+- nominais, texto e booleanos: ausentes e os `TOP_K` valores mais
+  frequentes com as contagens.
+
+Tudo é acumulado bloco a bloco de linhas, com operações vetorizadas do
+NumPy/pandas por coluna (nada de laço por célula): média e variância são
+combinadas entre blocos (fórmula de Chan) e o histograma dobra a largura
+das faixas quando um bloco traz valores fora do intervalo atual (as faixas
+antigas se juntam duas a duas, sem perder contagens). Contagens de valores
+guardam no máximo `MAX_TRACKED_VALUES` distintos; acima disso o top-k
+passa a ser aproximado (`topExact` falso).
+
+O `ColumnStatsEngine` roda a acumulação em uma thread e entrega resultados
+parciais para a interface a cada `UPDATE_INTERVAL` segundos; a fonte dos
+blocos é o DataFrame carregado (`frame_chunks`) ou, no modo janela, o
+próprio arquivo (`csv_chunks`/`arff_chunks`).
+"""
+from __future__ import annotations
+
+import io
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+from compressed_io import decompressed
+from instrumentation import span
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# Faixas do histograma (par: as faixas se juntam duas a duas ao dobrar a largura)
+HISTOGRAM_BINS = 20
+# Valores mais frequentes mostrados por coluna
+TOP_K = 10
+# Teto de valores distintos contados por coluna (acima dele o top-k é aproximado)
+MAX_TRACKED_VALUES = 10_000
+# Células por bloco: linhas do bloco = CHUNK_CELLS / colunas
+CHUNK_CELLS = 4_000_000
+# Intervalo mínimo entre resultados parciais enviados à interface
+UPDATE_INTERVAL = 0.25
+
+Summary = Dict[str, Any]
+# Bloco de linhas e fração da fonte já lida (0 a 1)
+Chunks = Iterator[Tuple["pd.DataFrame", float]]
+
+
+def _present_numbers(series: pd.Series) -> Tuple[np.ndarray, int]:
+    """(valores presentes como array numérico, quantidade de ausentes)."""
+    import numpy as np
+    import pandas as pd
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        return series.to_numpy(), 0
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        values = series.to_numpy(dtype="datetime64[ns]")
+        missing = np.isnat(values)
+        values = values.view("i8")
+    else:
+        if isinstance(dtype, np.dtype) and dtype.kind == "f":
+            values = series.to_numpy()
+        else:
+            # Extensões (Int64, Float64) ou texto num bloco do modo janela
+            values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        finite = np.isfinite(values)
+        if finite.all():
+            return values, 0
+        missing = np.isnan(values)
+        # ±inf conta como presente, mas fica fora da média e do histograma
+        return values[finite], int(missing.sum())
+    return (values[~missing], int(missing.sum())) if missing.any() else (values, 0)
+
+
+class NumericSummary:
+    """Contagens, extremos, momentos e histograma de uma coluna numérica ou de datas."""
+
+    def __init__(self, kind: str = "numeric") -> None:
+        self.kind = kind
+        self.rows = 0
+        self.nulls = 0
+        self.present = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum: Any = None
+        self.maximum: Any = None
+        self._start = 0.0
+        self._width = 1.0
+        self._counts: Optional[np.ndarray] = None
+
+    def add(self, series: pd.Series) -> None:
+        import numpy as np
+
+        values, missing = _present_numbers(series)
+        self.rows += len(series)
+        self.nulls += missing
+        if not len(values):
+            return
+        low, high = values.min(), values.max()
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        # Média e M2 do bloco combinadas com as acumuladas (Chan et al.)
+        count = len(values)
+        mean = float(values.mean())
+        centered = values - mean
+        m2 = float(np.dot(centered, centered))
+        total = self.present + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.present * count / total
+        self.present = total
+        self._addHistogram(values, float(low), float(high))
+
+    def _addHistogram(self, values: np.ndarray, low: float, high: float) -> None:
+        import numpy as np
+
+        bins = HISTOGRAM_BINS
+        if self._counts is None:
+            self._start = low
+            self._width = (high - low) / bins if high > low else 1.0
+            self._counts = np.zeros(bins, dtype=np.int64)
+        while low < self._start or high > self._start + bins * self._width:
+            # Dobra a largura: faixas vizinhas se juntam e o conteúdo ocupa meia escala
+            merged = self._counts.reshape(-1, 2).sum(axis=1)
+            empty = np.zeros(bins // 2, dtype=np.int64)
+            self._width *= 2
+            if low < self._start:
+                self._counts = np.concatenate([empty, merged])
+                self._start -= bins // 2 * self._width
+            else:
+                self._counts = np.concatenate([merged, empty])
+        scaled = values - self._start
+        scaled *= 1.0 / self._width
+        index = scaled.astype(np.intp)
+        # O máximo cai exatamente na borda superior: entra na última faixa
+        np.minimum(index, bins - 1, out=index)
+        self._counts += np.bincount(index, minlength=bins)
+
+    def _format(self, value: Any) -> Any:
+        import pandas as pd
+
+        if value is None:
+            return None
+        if self.kind == "date":
+            return pd.Timestamp(int(value)).isoformat()
+        return float(value)
+
+    def result(self) -> Summary:
+        import numpy as np
+
+        counts = self._counts if self._counts is not None else np.zeros(0, dtype=np.int64)
+        used = np.flatnonzero(counts)
+        first, last = (int(used[0]), int(used[-1]) + 1) if len(used) else (0, 0)
+        return {
+            "kind": self.kind,
+            "count": self.rows,
+            "nullCount": self.nulls,
+            "nullRatio": self.nulls / self.rows if self.rows else 0.0,
+            "min": self._format(self.minimum),
+            "max": self._format(self.maximum),
+            "mean": self._format(self.mean) if self.present else None,
+            "std": float(np.sqrt(self.m2 / self.present)) if self.present and self.kind != "date" else None,
+            # Só as faixas entre a primeira e a última com valores
+            "histogram": [int(count) for count in counts[first:last]],
+            "binStart": self._start + first * self._width,
+            "binWidth": self._width,
+        }
+
+
+class ValueSummary:
+    """Ausentes e valores mais frequentes de uma coluna nominal, de texto ou booleana."""
+
+    def __init__(self, kind: str = "text") -> None:
+        self.kind = kind
+        self.rows = 0
+        self.nulls = 0
+        self.exact = True
+        self._counts: Optional[pd.Series] = None
+        # Coluna praticamente só de valores únicos (ex.: identificador): não há o que contar
+        self._unique = False
+
+    def add(self, series: pd.Series) -> None:
+        import numpy as np
+        import pandas as pd
+
+        self.rows += len(series)
+        if self._unique:
+            self.nulls += int(series.isna().sum())
+            return
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Contagem direta pelos códigos (-1 = ausente)
+            codes = series.cat.codes.to_numpy()
+            present = codes[codes >= 0]
+            self.nulls += len(codes) - len(present)
+            tally = np.bincount(present, minlength=len(series.cat.categories))
+            found = pd.Series(tally, index=series.cat.categories.astype(object))
+            found = found[found > 0]
+        else:
+            # factorize + bincount: bem mais rápido que value_counts em texto
+            codes, uniques = pd.factorize(series)
+            present = codes[codes >= 0]
+            self.nulls += len(codes) - len(present)
+            found = pd.Series(np.bincount(present, minlength=len(uniques)), index=pd.Index(uniques, dtype=object))
+        self._counts = found if self._counts is None else self._counts.add(found, fill_value=0)
+        if len(self._counts) > MAX_TRACKED_VALUES:
+            # Guarda só os mais frequentes: contagens dos demais passam a ser parciais
+            self._counts = self._counts.nlargest(MAX_TRACKED_VALUES)
+            self.exact = False
+            # Nem os mais frequentes se repetem: os próximos blocos só contam ausentes
+            self._unique = self._counts.iat[0] <= 1
+
+    def result(self) -> Summary:
+        top = self._counts.nlargest(TOP_K).items() if self._counts is not None else ()
+        return {
+            "kind": self.kind,
+            "count": self.rows,
+            "nullCount": self.nulls,
+            "nullRatio": self.nulls / self.rows if self.rows else 0.0,
+            "top": [{"value": str(value), "count": int(count)} for value, count in top],
+            "topExact": self.exact,
+            # Distintos só são conhecidos enquanto a contagem é exata
+            "distinct": len(self._counts) if self._counts is not None and self.exact else None,
+        }
+
+
+def summary_for(series: pd.Series):
+    """Acumulador adequado ao dtype da coluna (decidido pelo primeiro bloco)."""
+    import numpy as np
+    import pandas as pd
+
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return ValueSummary("boolean")
+    if isinstance(dtype, pd.CategoricalDtype):
+        return ValueSummary("nominal")
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return NumericSummary("date")
+    if pd.api.types.is_numeric_dtype(dtype) and not (isinstance(dtype, np.dtype) and dtype.kind == "c"):
+        return NumericSummary("numeric")
+    return ValueSummary("text")
+
+
+class StatsAccumulator:
+    """Resumos de todas as colunas, acumuláveis bloco a bloco."""
+
+    def __init__(self) -> None:
+        self._summaries: Dict[str, Any] = {}
+
+    def add(self, frame: pd.DataFrame) -> None:
+        for index, name in enumerate(frame.columns):
+            series = frame.iloc[:, index]
+            summary = self._summaries.get(str(name))
+            if summary is None:
+                summary = self._summaries[str(name)] = summary_for(series)
+            summary.add(series)
+
+    def results(self) -> Dict[str, Summary]:
+        return {name: summary.result() for name, summary in self._summaries.items()}
+
+
+def chunk_rows_for(columns: int) -> int:
+    """Linhas por bloco para manter ~CHUNK_CELLS células por bloco."""
+    return max(CHUNK_CELLS // max(columns, 1), 1000)
+
+
+def frame_chunks(dataframe: pd.DataFrame) -> Chunks:
+    """Blocos de linhas de um DataFrame em memória (fatias, sem cópia)."""
+    rows = len(dataframe)
+    step = chunk_rows_for(dataframe.shape[1])
+    for start in range(0, rows, step):
+        stop = min(start + step, rows)
+        yield dataframe.iloc[start:stop], stop / rows
+
+
+def csv_chunks(file_path: str, columns: int) -> Chunks:
+    """Blocos lidos do CSV (modo janela: o DataFrame é só uma amostra)."""
+    import pandas as pd
+
+    total = max(os.path.getsize(file_path), 1)
+    with open(file_path, "rb") as raw, pd.read_csv(decompressed(raw), chunksize=chunk_rows_for(columns)) as reader:
+        for chunk in reader:
+            yield chunk, min(raw.tell() / total, 1.0)
+
+
+def arff_chunks(file_path: str, columns: int) -> Chunks:
+    """Blocos tipados do `@data` de um ARFF (modo janela)."""
+    from arff_io import iter_chunks, read_header
+
+    total = max(os.path.getsize(file_path), 1)
+    with open(file_path, "rb") as raw, io.TextIOWrapper(decompressed(raw), encoding="utf-8") as handle:
+        _, attributes, date_formats = read_header(handle)
+        for chunk in iter_chunks(handle, attributes, date_formats, chunk_rows_for(columns)):
+            yield chunk, min(raw.tell() / total, 1.0)
+
+
+class ColumnStatsEngine(QObject):
+    """Executa a acumulação em uma thread e publica resultados parciais.
+
+    Cada `start()` recebe uma geração; resultados de execuções anteriores
+    (canceladas ou substituídas) são descartados ao chegar. Guarda também o
+    estado da carga atual que os controladores expõem ao QML: `results`,
+    `progress` e `complete` (resumo final, calculado ou vindo do cache).
+    """
+
+    # Resultados (parciais ou finais) e progresso mudaram
+    updated = Signal()
+    runningChanged = Signal()
+    # Resultado final: {nome: resumo}
+    finished = Signal(object)
+    failed = Signal(str)
+    # Vindos da thread: (geração, resultados, progresso) e (geração, resultados, erro)
+    _partial = Signal(int, object, float)
+    _done = Signal(int, object, str)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._generation = 0
+        self._cancel = threading.Event()
+        self._running = False
+        self.results: Dict[str, Summary] = {}
+        self.progress = 0.0
+        self.complete = False
+        # Desligado, roda na thread chamadora (scripts sem event loop)
+        self.background = True
+        self._partial.connect(self._onPartial)
+        self._done.connect(self._onDone)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self, chunks: Callable[[], Chunks]) -> None:
+        """Calcula os resumos dos blocos de `chunks()`, cancelando a execução anterior."""
+        self.cancel()
+        self._generation += 1
+        self._cancel = threading.Event()
+        self.results, self.progress, self.complete = {}, 0.0, False
+        self._setRunning(True)
+        self.updated.emit()
+        if self.background:
+            threading.Thread(
+                target=self._run, args=(self._generation, chunks, self._cancel), name="column-stats", daemon=True
+            ).start()
+        else:
+            self._run(self._generation, chunks, self._cancel)
+
+    def restore(self, results: Dict[str, Summary]) -> None:
+        """Nova base: cancela o cálculo e adota os resumos já prontos (cache), ou nenhum."""
+        self.cancel()
+        self.results = dict(results)
+        self.complete = bool(results)
+        self.progress = 1.0 if self.complete else 0.0
+
+    def cancel(self) -> None:
+        if self._running:
+            self._cancel.set()
+            self._generation += 1
+            self._setRunning(False)
+
+    def _run(self, generation: int, chunks: Callable[[], Chunks], cancel: threading.Event) -> None:
+        accumulator = StatsAccumulator()
+        last = time.perf_counter()
+        try:
+            with span("column_stats"):
+                for frame, fraction in chunks():
+                    if cancel.is_set():
+                        return
+                    accumulator.add(frame)
+                    if time.perf_counter() - last >= UPDATE_INTERVAL:
+                        last = time.perf_counter()
+                        self._emit(self._partial, generation, accumulator.results(), fraction)
+        except Exception as e:
+            log.warning("Falha nas estatísticas por coluna: %s", e)
+            self._emit(self._done, generation, None, str(e))
+            return
+        self._emit(self._done, generation, accumulator.results(), "")
+
+    @staticmethod
+    def _emit(signal, *args) -> None:
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            # Aplicação encerrando: o QObject já foi destruído
+            pass
+
+    def _onPartial(self, generation: int, results: Dict[str, Summary], fraction: float) -> None:
+        if generation != self._generation:
+            return
+        self.results, self.progress = results, fraction
+        self.updated.emit()
+
+    def _onDone(self, generation: int, results: Optional[Dict[str, Summary]], error: str) -> None:
+        if generation != self._generation:
+            return
+        self._setRunning(False)
+        if results is None:
+            self.failed.emit(error)
+            return
+        self.results, self.progress, self.complete = results, 1.0, True
+        self.updated.emit()
+        self.finished.emit(results)
+
+    def _setRunning(self, running: bool) -> None:
+        if running != self._running:
+            self._running = running
+            self.runningChanged.emit()
@@ -0,0 +1,247 @@
+"""Leitura e escrita de formatos colunares: Parquet, Feather e Arrow IPC.
+
+Ao contrário de CSV e ARFF, esses arquivos já guardam os dados tipados e
+por coluna: não há texto para tokenizar a cada abertura. A leitura usa o
+pyarrow (dependência opcional) com:
+
+- projeção de colunas: só as colunas pedidas saem do disco;
+- mapeamento em memória: Arrow IPC/Feather v2 sem compressão viram
+  DataFrame praticamente sem cópia; o Parquet é lido grupo de linhas a
+  grupo de linhas, o que dá progresso e cancelamento entre os grupos.
+
+A escrita em Parquet aplica os tipos escolhidos na página 3: Numérico vira
+int64/float64, Nominal um dicionário (int32 -> string) com o domínio da
+coluna, Data um timestamp e Textual/Relacional string. O arquivo é gravado
+em blocos de linhas (um row group por bloco), com compressão zstd.
+"""
+from __future__ import annotations
+
+import importlib.util
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# Extensões oferecidas nos diálogos (o formato é detectado pelo conteúdo)
+EXTENSIONS = (".parquet", ".feather", ".arrow", ".ipc")
+# Assinatura no início do arquivo -> formato
+MAGIC = {b"PAR1": "parquet", b"ARROW1": "arrow", b"FEA1": "feather"}
+# Resolução das colunas Data no Parquet
+TIMESTAMP_UNIT = "us"
+PARQUET_COMPRESSION = "zstd"
+
+# (nome, rótulo da UI, domínio nominal ou None)
+ColumnSpec = Tuple[str, str, Optional[List[str]]]
+
+
+def arrow_available() -> bool:
+    """True se o pyarrow estiver instalado (dependência opcional).
+
+    Só procura o pacote, sem importá-lo: a página 1 consulta isto antes do
+    primeiro quadro (ParquetController.available), quando nem o pandas foi
+    carregado ainda (startup.py).
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def require_pyarrow() -> None:
+    """Erro legível quando o pyarrow (opcional) não está instalado."""
+    if not arrow_available():
+        raise RuntimeError("Parquet/Feather/Arrow indisponível: instale o pacote pyarrow")
+
+
+def detect_format(file_path: str) -> str:
+    """"parquet", "arrow" (IPC em arquivo / Feather v2) ou "feather" (v1)."""
+    with open(file_path, "rb") as handle:
+        head = handle.read(6)
+    for magic, name in MAGIC.items():
+        if head.startswith(magic):
+            return name
+    raise ValueError("Arquivo não é Parquet, Feather nem Arrow IPC")
+
+
+def read_column_names(file_path: str) -> List[str]:
+    """Nomes das colunas, lidos só do esquema (sem dados)."""
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    kind = detect_format(file_path)
+    if kind == "parquet":
+        return list(pq.read_schema(file_path, memory_map=True).names)
+    if kind == "arrow":
+        with pa.memory_map(file_path) as source:
+            return list(pa.ipc.open_file(source).schema.names)
+    return list(feather.read_table(file_path, memory_map=True).column_names)
+
+
+def read_table(
+    file_path: str,
+    columns: Optional[Sequence[str]] = None,
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> pa.Table:
+    """Tabela Arrow com as colunas pedidas (todas com `columns=None`).
+
+    `on_progress(fração)` é chamado entre grupos de linhas (Parquet) ou
+    lotes (Arrow IPC); é onde o loader verifica o cancelamento.
+    """
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    columns = list(columns) if columns else None
+    kind = detect_format(file_path)
+    if kind == "parquet":
+        parquet = pq.ParquetFile(file_path, memory_map=True)
+        groups = parquet.num_row_groups
+        parts = []
+        for group in range(groups):
+            parts.append(parquet.read_row_group(group, columns=columns))
+            if on_progress is not None:
+                on_progress((group + 1) / groups)
+        return pa.concat_tables(parts) if parts else parquet.schema_arrow.empty_table()
+    if kind == "arrow":
+        # Lotes apontam para o mapeamento: sem cópia enquanto não houver compressão
+        source = pa.memory_map(file_path)
+        reader = pa.ipc.open_file(source)
+        batches = []
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            batches.append(batch.select(columns) if columns else batch)
+            if on_progress is not None:
+                on_progress((index + 1) / reader.num_record_batches)
+        schema = reader.schema if not columns else pa.schema([reader.schema.field(name) for name in columns])
+        return pa.Table.from_batches(batches, schema=schema)
+    return feather.read_table(file_path, columns=columns, memory_map=True)
+
+
+def table_to_dataframe(table: pa.Table) -> pd.DataFrame:
+    """DataFrame a partir da tabela; dicionários viram Categorical.
+
+    `self_destruct` libera cada coluna Arrow assim que ela é convertida:
+    o pico de memória não chega a duas cópias da base.
+    """
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def column_specs(
+    dataframe: pd.DataFrame,
+    chosen_types: Sequence[Tuple[str, str]],
+    sort_nominal: bool = False,
+) -> List[ColumnSpec]:
+    """(nome, rótulo, domínio) para cada coluna; o domínio só existe em nominais.
+
+    O Parquet não tem teto de cardinalidade como o ARFF: o domínio nominal
+    sai completo (`arff_schema.nominal_domain` sem limite).
+    """
+    from arff_schema import nominal_domain
+
+    return [
+        (name, label, nominal_domain(dataframe[name], None, sort_nominal) if label == "Nominal" else None)
+        for name, label in chosen_types
+    ]
+
+
+def arrow_type(label: str, dtype: Any) -> pa.DataType:
+    """Tipo Arrow de uma coluna a partir do rótulo da UI (e do dtype, nos números)."""
+    import numpy as np
+    import pyarrow as pa
+
+    if label == "Numérico":
+        integer = isinstance(dtype, np.dtype) and dtype.kind in "iu"
+        return pa.int64() if integer else pa.float64()
+    if label == "Nominal":
+        return pa.dictionary(pa.int32(), pa.string())
+    if label == "Data":
+        return pa.timestamp(TIMESTAMP_UNIT)
+    return pa.string()
+
+
+def _text(values: pd.Series) -> Tuple[Any, Any]:
+    """(valores como texto, máscara de ausentes), como o escritor ARFF converte."""
+    missing = values.isna().to_numpy()
+    text = values.astype(object).astype(str).to_numpy(dtype=object)
+    return text, missing | (text == "")
+
+
+def arrow_array(values: pd.Series, label: str, type_: pa.DataType, domain: Optional[List[str]]) -> pa.Array:
+    """Converte um trecho de coluna para o tipo Arrow escolhido (ausentes: null)."""
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+    from type_inference import parse_dates, parse_numeric
+
+    if label == "Numérico":
+        if not pd.api.types.is_numeric_dtype(values.dtype):
+            values = parse_numeric(values)
+        if pa.types.is_integer(type_):
+            return pa.array(values.to_numpy(), type=type_)
+        return pa.array(values.to_numpy(dtype="float64", na_value=np.nan), type=type_, from_pandas=True)
+    if label == "Nominal":
+        text, missing = _text(values)
+        # Fora do domínio (ex.: texto vazio, já marcado em `missing`) vira -1
+        codes = pd.Index(domain or [], dtype=object).get_indexer(text).astype(np.int32)
+        codes[missing] = -1
+        indices = pa.array(codes, type=pa.int32(), mask=codes < 0)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(domain or [], type=pa.string()))
+    if label == "Data":
+        if not pd.api.types.is_datetime64_any_dtype(values.dtype):
+            values = parse_dates(values)[0]
+        stamps = values.dt.tz_localize(None) if getattr(values.dt, "tz", None) is not None else values
+        return pa.array(stamps.astype(f"datetime64[{TIMESTAMP_UNIT}]").to_numpy(), type=type_, from_pandas=True)
+    text, missing = _text(values)
+    return pa.array(text, type=type_, mask=missing)
+
+
+def arrow_schema(specs: Sequence[ColumnSpec], dtypes: Sequence[Any]) -> pa.Schema:
+    """Esquema do Parquet de saída (um campo por coluna, na ordem de `specs`)."""
+    import pyarrow as pa
+
+    return pa.schema([pa.field(str(name), arrow_type(label, dtype)) for (name, label, _), dtype in zip(specs, dtypes)])
+
+
+def write_parquet(
+    output_path: str,
+    specs: Sequence[ColumnSpec],
+    schema: pa.Schema,
+    frames: Iterable[pd.DataFrame],
+) -> int:
+    """Grava os blocos (um row group cada) com os tipos de `schema`; retorna as linhas."""
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    written = 0
+    with pq.ParquetWriter(output_path, schema, compression=PARQUET_COMPRESSION) as writer:
+        for frame in frames:
+            arrays = [
+                arrow_array(frame.iloc[:, index], label, schema.field(index).type, domain)
+                for index, (_, label, domain) in enumerate(specs)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            written += len(frame)
+    return written
+
+
+def dataframe_chunks(dataframe: pd.DataFrame, chunk_rows: int) -> Iterable[pd.DataFrame]:
+    """Fatias de `chunk_rows` linhas (sem cópia) para `write_parquet`."""
+    for start in range(0, len(dataframe), chunk_rows):
+        yield dataframe.iloc[start:start + chunk_rows]
+
+
+def export_dataframe(
+    output_path: str,
+    dataframe: pd.DataFrame,
+    chosen_types: Sequence[Tuple[str, str]],
+    sort_nominal: bool = False,
+    chunk_rows: int = 1_000_000,
+) -> int:
+    """Grava o DataFrame em Parquet com os tipos da página 3; retorna as linhas."""
+    require_pyarrow()
+    specs = column_specs(dataframe, chosen_types, sort_nominal)
+    schema = arrow_schema(specs, [dataframe[name].dtype for name, _ in chosen_types])
+    return write_parquet(output_path, specs, schema, dataframe_chunks(dataframe, chunk_rows))
@@ -0,0 +1,151 @@
+"""Compactação dos dtypes de uma base carregada (opcional, por controlador).
+
+Depois da leitura, o pandas deixa inteiros em int64, números em float64 e
+texto como str/object (um objeto Python por célula). Com a compactação
+ligada, cada coluna passa para o menor tipo que guarda os mesmos valores:
+
+- inteiros: menor inteiro (int8/int16/int32, ou uint*) que cabe a faixa;
+- reais: float32 quando todos os valores voltam idênticos para float64
+  (a exportação ARFF grava exatamente os mesmos números);
+- texto com poucos valores distintos (até `CATEGORY_MAX_RATIO` das
+  linhas): Categorical, um código por linha + cada texto uma vez, com as
+  categorias na ordem de aparição (o domínio nominal exportado não muda);
+- demais textos: strings em Arrow (um buffer contíguo) quando o pyarrow
+  está instalado; sem ele ficam como estão.
+
+Nominais do ARFF já chegam como Categorical com o domínio declarado
+(arff_io). `memory_report` compara os bytes por coluna antes e depois.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Texto vira Categorical com até esta fração de valores distintos por linha
+CATEGORY_MAX_RATIO = 0.5
+
+Report = Dict[str, Any]
+
+
+def _arrow_string_dtype():
+    """dtype de texto em Arrow com NaN como ausente (None sem pyarrow)."""
+    import numpy as np
+    import pandas as pd
+    from columnar_io import arrow_available
+
+    if not arrow_available():
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:
+        # pandas < 2.3: mesmo comportamento com o nome antigo
+        return pd.StringDtype("pyarrow_numpy")
+
+
+def _compact_numeric(series: pd.Series) -> pd.Series:
+    import numpy as np
+    import pandas as pd
+
+    kind = series.dtype.kind
+    if kind in "iu":
+        return pd.to_numeric(series, downcast="unsigned" if kind == "u" or series.min() >= 0 else "integer")
+    if kind == "f" and series.dtype.itemsize > 4:
+        values = series.to_numpy()
+        narrow = values.astype(np.float32)
+        # Só sem perda: NaN continua NaN, o resto volta bit a bit igual
+        same = (narrow.astype(values.dtype) == values) | np.isnan(values)
+        if same.all():
+            return pd.Series(narrow, index=series.index, name=series.name)
+    return series
+
+
+def in_appearance_order(series: pd.Series) -> pd.Series:
+    """Categorical com as categorias na ordem da primeira aparição.
+
+    `astype("category")` (e o `dtype="category"` do read_csv) ordena as
+    categorias, e arff_schema.nominal_domain exporta nessa ordem: sem
+    isto o domínio nominal do ARFF mudaria com a compactação. Categorias
+    sem ocorrência vão para o fim.
+    """
+    import numpy as np
+    import pandas as pd
+
+    categories = series.cat.categories
+    codes = series.cat.codes.to_numpy()
+    seen = pd.unique(codes[codes >= 0]).astype(np.intp)
+    order = np.concatenate([seen, np.setdiff1d(np.arange(len(categories)), seen)])
+    if (order == np.arange(len(categories))).all():
+        return series
+    return series.cat.reorder_categories(categories[order])
+
+
+def compact_column(series: pd.Series, string_dtype: Any = None) -> pd.Series:
+    """A coluna no menor dtype que guarda os mesmos valores (ou ela mesma)."""
+    import numpy as np
+    import pandas as pd
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+        return _compact_numeric(series)
+    if not (pd.api.types.is_string_dtype(dtype) or dtype == object) or isinstance(dtype, pd.CategoricalDtype):
+        return series
+    if dtype == object and pd.api.types.infer_dtype(series, skipna=True) != "string":
+        # object misto (números e texto): a conversão mudaria os valores
+        return series
+    if len(series) and series.nunique() <= CATEGORY_MAX_RATIO * len(series):
+        return in_appearance_order(series.astype("category"))
+    if string_dtype is not None and dtype != string_dtype:
+        return series.astype(string_dtype)
+    return series
+
+
+def column_bytes(dataframe: pd.DataFrame) -> List[int]:
+    """Bytes ocupados por coluna (inclui os objetos Python de colunas de texto)."""
+    return [int(size) for size in dataframe.memory_usage(index=False, deep=True)]
+
+
+def compact_dataframe(dataframe: pd.DataFrame) -> Tuple[pd.DataFrame, Report]:
+    """DataFrame com as colunas compactadas e o relatório de memória."""
+    import pandas as pd
+
+    string_dtype = _arrow_string_dtype()
+    columns = {index: compact_column(dataframe.iloc[:, index], string_dtype) for index in range(dataframe.shape[1])}
+    compacted = pd.DataFrame(columns, index=dataframe.index, copy=False)
+    compacted.columns = dataframe.columns
+    return compacted, memory_report(dataframe, compacted)
+
+
+def memory_report(original: pd.DataFrame, compacted: pd.DataFrame) -> Report:
+    """Bytes e dtype por coluna antes/depois da compactação, com os totais."""
+    bytes_before, after = column_bytes(original), column_bytes(compacted)
+    columns = [
+        {
+            "name": str(name),
+            "dtypeBefore": str(dtype_before),
+            "dtypeAfter": str(dtype_after),
+            "bytesBefore": size_before,
+            "bytesAfter": size_after,
+        }
+        for name, dtype_before, dtype_after, size_before, size_after
+        in zip(original.columns, original.dtypes, compacted.dtypes, bytes_before, after)
+    ]
+    total_before, total_after = sum(bytes_before), sum(after)
+    return {
+        "columns": columns,
+        "bytesBefore": total_before,
+        "bytesAfter": total_after,
+        "ratio": round(total_before / total_after, 2) if total_after else 1.0,
+    }
+
+
+def memory_stats(report: Report) -> Dict[str, Any]:
+    """Totais do relatório em MB, para a propriedade `stats` ({} sem compactação)."""
+    if not report:
+        return {}
+    mb = 1024 * 1024
+    return {
+        "memoryBeforeMb": round(report["bytesBefore"] / mb, 1),
+        "memoryMb": round(report["bytesAfter"] / mb, 1),
+    }
@@ -0,0 +1,226 @@
+"""Leitura e escrita de arquivos comprimidos (gzip, bz2, xz, zstd) em fluxo.
+
+Na leitura o formato é detectado pelos primeiros bytes (assinatura), não
+pela extensão: `decompressed(stream)` devolve um arquivo binário com os
+dados já descomprimidos, que vai direto para o parser (pandas, arff_io).
+Nada é extraído para arquivo temporário. Com `threaded`, a descompressão
+roda numa thread própria, alguns blocos à frente do parser (zlib, bz2,
+lzma e zstd soltam o GIL enquanto descomprimem).
+
+Na escrita o formato vem da extensão do arquivo de saída (`.gz`, `.bz2`,
+`.xz`, `.zst`); sem uma delas o arquivo sai sem compressão. O zstd usa o
+módulo `compression.zstd` do Python 3.14 ou o pacote `zstandard`
+(opcional); com o `zstandard`, a compressão usa todos os núcleos.
+"""
+from __future__ import annotations
+
+import io
+import os
+import queue
+import threading
+from typing import BinaryIO, Optional, TextIO
+
+# Assinatura no início do arquivo -> formato
+MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+# Extensão do arquivo de saída -> formato
+SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+# Bytes descomprimidos por bloco e blocos prontos à frente do parser
+READ_BLOCK = 1 << 20
+PREFETCH_BLOCKS = 4
+# Níveis de compressão na escrita (equilíbrio entre tamanho e tempo)
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def detect(head: bytes) -> Optional[str]:
+    """Formato de compressão pelos primeiros bytes (None = sem compressão)."""
+    for magic, name in MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def detect_file(file_path: str) -> Optional[str]:
+    """Formato de compressão do arquivo (lê só a assinatura)."""
+    with open(file_path, "rb") as handle:
+        return detect(handle.read(6))
+
+
+def strip_suffix(file_name: str) -> str:
+    """Nome sem a extensão de compressão ("dados.csv.gz" -> "dados.csv")."""
+    stem, extension = os.path.splitext(file_name)
+    return stem if extension.lower() in SUFFIXES else file_name
+
+
+def _zstd_module():
+    """Implementação de zstd disponível: stdlib (3.14+) ou `zstandard`.
+
+    As duas têm `ZstdCompressor`/`ZstdDecompressor`, com APIs diferentes:
+    quem usa distingue pela `ZstdFile`, que só a stdlib tem.
+    """
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        return zstandard
+    except ImportError:
+        raise RuntimeError("Arquivo zstd: instale o pacote zstandard") from None
+
+
+def _decoder(name: str, stream: BinaryIO) -> BinaryIO:
+    if name == "gzip":
+        import gzip
+
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if name == "bz2":
+        import bz2
+
+        return bz2.BZ2File(stream, mode="rb")
+    if name == "xz":
+        import lzma
+
+        return lzma.LZMAFile(stream, mode="rb")
+    zstd = _zstd_module()
+    if hasattr(zstd, "ZstdFile"):
+        # stdlib: lê todos os frames em sequência
+        return zstd.ZstdFile(stream, mode="rb")
+    return zstd.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+
+
+class _DecodedReader(io.RawIOBase):
+    """Dados descomprimidos de `stream`; fechar fecha também o arquivo comprimido."""
+
+    def __init__(self, decoder: BinaryIO, stream: BinaryIO) -> None:
+        super().__init__()
+        self._decoder = decoder
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        return self._decoder.readinto(buffer)
+
+    def close(self) -> None:
+        if not self.closed:
+            # GzipFile/BZ2File/LZMAFile não fecham o arquivo recebido
+            self._decoder.close()
+            self._stream.close()
+        super().close()
+
+
+class _PrefetchReader(io.RawIOBase):
+    """Lê `source` numa thread, até `PREFETCH_BLOCKS` blocos à frente.
+
+    Erros da thread (inclusive o cancelamento do loader) são levantados no
+    consumidor, na ordem em que aconteceram.
+    """
+
+    def __init__(self, source: BinaryIO) -> None:
+        super().__init__()
+        self._source = source
+        self._blocks: "queue.Queue[object]" = queue.Queue(PREFETCH_BLOCKS)
+        self._pending = memoryview(b"")
+        self._stop = threading.Event()
+        self._done = False
+        self._thread = threading.Thread(target=self._fill, name="decompress", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self) -> None:
+        try:
+            while True:
+                block = self._source.read(READ_BLOCK)
+                if not self._put(block) or not block:
+                    return
+        except BaseException as e:
+            self._put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        while not self._pending and not self._done:
+            item = self._blocks.get()
+            if isinstance(item, BaseException):
+                self._done = True
+                raise item
+            if not item:
+                self._done = True
+            self._pending = memoryview(item)
+        count = min(len(buffer), len(self._pending))
+        buffer[:count] = self._pending[:count]
+        self._pending = self._pending[count:]
+        return count
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+def decompressed(stream: BinaryIO, threaded: bool = False) -> BinaryIO:
+    """`stream` descomprimido conforme a assinatura (ou ele mesmo, sem compressão).
+
+    `stream` precisa ter `peek` (io.BufferedReader, como o de `open(..., "rb")`).
+    """
+    name = detect(stream.peek(6)[:6])
+    if name is None:
+        return stream
+    reader: io.RawIOBase = _DecodedReader(_decoder(name, stream), stream)
+    if threaded:
+        reader = _PrefetchReader(io.BufferedReader(reader, buffer_size=READ_BLOCK))
+    return io.BufferedReader(reader, buffer_size=READ_BLOCK)
+
+
+def open_input(file_path: str, threaded: bool = False) -> BinaryIO:
+    """Abre o arquivo para leitura binária, descomprimindo se preciso."""
+    return decompressed(open(file_path, "rb"), threaded)
+
+
+def open_text_output(output_path: str) -> TextIO:
+    """Abre a saída em texto UTF-8, comprimida conforme a extensão."""
+    name = SUFFIXES.get(os.path.splitext(output_path)[1].lower())
+    if name is None:
+        return open(output_path, "w", encoding="utf-8", newline="\n", buffering=1 << 20)
+    if name == "gzip":
+        import gzip
+
+        raw: BinaryIO = gzip.open(output_path, "wb", compresslevel=GZIP_LEVEL)
+    elif name == "bz2":
+        import bz2
+
+        raw = bz2.open(output_path, "wb")
+    elif name == "xz":
+        import lzma
+
+        raw = lzma.open(output_path, "wb")
+    else:
+        zstd = _zstd_module()
+        if hasattr(zstd, "ZstdFile"):
+            raw = zstd.ZstdFile(output_path, "wb", level=ZSTD_LEVEL)
+        else:
+            compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+            raw = compressor.stream_writer(open(output_path, "wb"), closefd=True)
+    # Buffer grande: o compressor recebe blocos, não uma chamada por linha
+    return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=1 << 20), encoding="utf-8", newline="\n")
@@ -0,0 +1,317 @@
+"""Conversão em lote CSV -> ARFF pela linha de comando, sem interface gráfica.
+
+Reaproveita o mesmo caminho da aplicação: o controlador carrega o arquivo,
+sugere os tipos (type_inference), aplica as escolhas de um arquivo de tipos
+(como se fossem feitas na página 3) e grava com `saveMetadata`. Só usa
+QCoreApplication, então roda em servidor sem display.
+
+Exemplos:
+    python convert.py dados.csv
+    python convert.py entrada/ -o saida/ --types tipos.json --workers 8
+    python convert.py dados.csv.gz --compress zst
+
+Entradas comprimidas (.gz, .bz2, .xz, .zst) são lidas direto, sem extrair;
+com `--compress` a saída também sai comprimida. Bases quase todas de zeros
+saem no formato esparso do Weka (`--sparse auto`, o padrão).
+
+Arquivo de tipos (JSON): colunas -> tipo, para todos os arquivos, e/ou por
+arquivo em "files". Tipos aceitos: os rótulos da UI (Numérico, Textual,
+Nominal, Data, Relacional) ou NUMERIC, STRING, NOMINAL, DATE.
+
+    {"default": {"id": "STRING"}, "files": {"vendas.csv": {"data": "DATE"}}}
+
+Um objeto sem "default"/"files" vale como "default".
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+# Nomes aceitos no arquivo de tipos -> rótulos usados pelos controladores
+TYPE_ALIASES = {
+    'numérico': 'Numérico', 'numerico': 'Numérico', 'numeric': 'Numérico',
+    'real': 'Numérico', 'integer': 'Numérico',
+    'textual': 'Textual', 'string': 'Textual',
+    'nominal': 'Nominal',
+    'data': 'Data', 'date': 'Data',
+    'relacional': 'Relacional', 'relational': 'Relacional',
+}
+INPUT_EXTENSIONS = ('.csv', '.arff')
+# Extensões de `--compress` (compressed_io.SUFFIXES)
+COMPRESS_CHOICES = ('gz', 'bz2', 'xz', 'zst')
+# Formato do @data (arff_io.SPARSE_MODES)
+SPARSE_CHOICES = ('auto', 'always', 'never')
+
+Result = Dict[str, Any]
+
+
+def load_type_spec(path: Optional[str]) -> Dict[str, Any]:
+    """Lê e valida o arquivo de tipos; devolve {'default': {...}, 'files': {...}}."""
+    if not path:
+        return {'default': {}, 'files': {}}
+    with open(path, encoding='utf-8') as handle:
+        raw = json.load(handle)
+    if not isinstance(raw, dict):
+        raise ValueError("Arquivo de tipos deve conter um objeto JSON")
+    if 'default' not in raw and 'files' not in raw:
+        raw = {'default': raw}
+    spec = {'default': _normalize_types(raw.get('default', {})), 'files': {}}
+    for file_name, types in raw.get('files', {}).items():
+        spec['files'][file_name] = _normalize_types(types)
+    return spec
+
+
+def _normalize_types(types: Dict[str, str]) -> Dict[str, str]:
+    normalized = {}
+    for column, type_name in types.items():
+        label = TYPE_ALIASES.get(str(type_name).strip().lower())
+        if label is None:
+            raise ValueError(f"Tipo desconhecido para '{column}': {type_name}")
+        normalized[str(column)] = label
+    return normalized
+
+
+def overrides_for(spec: Dict[str, Any], input_path: str) -> Dict[str, str]:
+    """Tipos do "default" mais os do arquivo (por nome ou caminho)."""
+    overrides = dict(spec['default'])
+    files = spec['files']
+    overrides.update(files.get(os.path.basename(input_path), {}))
+    overrides.update(files.get(input_path, {}))
+    return overrides
+
+
+def _is_arff(input_path: str) -> bool:
+    from compressed_io import strip_suffix
+
+    return strip_suffix(input_path).lower().endswith('.arff')
+
+
+def _controller_for(input_path: str, options: Dict[str, Any]):
+    """Controlador configurado para uso síncrono (sem event loop)."""
+    from PySide6.QtCore import QCoreApplication
+
+    if QCoreApplication.instance() is None:
+        # Mantida viva até o fim do processo
+        _controller_for.app = QCoreApplication([])  # type: ignore[attr-defined]
+    if _is_arff(input_path):
+        from arff_controller import ARFFController
+        controller = ARFFController()
+    else:
+        from csv_controller import CSVController
+        controller = CSVController()
+        controller.setCsvEngine(options.get('engine', 'single'))
+    controller.setBackgroundLoading(False)
+    if options.get('stream') and not _is_arff(input_path):
+        # Modo janela desde o início: saveMetadata converte em fluxo (csv_stream)
+        controller.setLazyThresholdMb(0)
+    else:
+        # A conversão precisa da base inteira em memória (sem modo janela)
+        controller.setLazyThresholdMb(1 << 30)
+    controller.setInferenceSampleRows(options.get('sample_rows', 10_000))
+    controller.setMaxNominalValues(options.get('max_nominal', 1000))
+    controller.setSortNominalValues(options.get('sort_nominal', False))
+    controller.setCacheEnabled(options.get('cache', False))
+    controller.setCompactMemory(options.get('compact', False))
+    controller.setSparseOutput(options.get('sparse', 'auto'))
+    # Base que não cabe: CSV abre em modo janela (saveMetadata em fluxo),
+    # ARFF e comprimidos falham com a estimativa em vez de esgotar a memória
+    controller.setMemoryBudgetMb(options.get('memory_budget', -1))
+    return controller
+
+
+def convert_file(input_path: str, output_path: str, overrides: Dict[str, str], options: Dict[str, Any]) -> Result:
+    """Converte um arquivo; nunca levanta, o erro volta no resultado."""
+    from PySide6.QtCore import QUrl
+
+    start = time.perf_counter()
+    result: Result = {
+        'input': input_path, 'output': output_path, 'rows': 0, 'columns': 0,
+        'seconds': 0.0, 'ok': False, 'messages': [],
+    }
+    errors: List[str] = []
+    is_arff = _is_arff(input_path)
+    try:
+        controller = _controller_for(input_path, options)
+        controller.errorOccurred.connect(errors.append)
+        controller.successOccurred.connect(result['messages'].append)
+        url = QUrl.fromLocalFile(os.path.abspath(input_path))
+        if is_arff:
+            controller.loadArff(url)
+        else:
+            controller.loadCsv(url)
+        if not errors and options.get('refine'):
+            controller.refineTypes()
+        names = controller.getAttributeNames() if not errors else []
+        for column, label in overrides.items():
+            if column in names:
+                controller.setAttributeType(column, label)
+            else:
+                result['messages'].append(f"Coluna '{column}' do arquivo de tipos não existe")
+        if not errors:
+            controller.saveMetadata(output_path)
+            # Linhas gravadas (no modo janela rowCount() só conhece as já indexadas)
+            result['rows'] = controller.stats.get('export', {}).get('rows', 0)
+            result['columns'] = len(names)
+        if options.get('cache'):
+            # O processo pode terminar logo depois: a entrada não pode ficar pela metade
+            from parse_cache import default_cache
+            default_cache().wait()
+    except Exception as e:
+        errors.append(str(e))
+    result['ok'] = not errors
+    result['messages'] = errors + result['messages']
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _convert_job(input_path: str, output_path: str, overrides: Dict[str, str], options: Dict[str, Any]) -> Result:
+    """Ponto de entrada dos processos do pool (precisa ser de nível de módulo)."""
+    return convert_file(input_path, output_path, overrides, options)
+
+
+def _list_inputs(directory: str, recursive: bool) -> List[str]:
+    from compressed_io import strip_suffix
+
+    found = []
+    for root, dirs, files in os.walk(directory):
+        for file_name in files:
+            if strip_suffix(file_name).lower().endswith(INPUT_EXTENSIONS):
+                found.append(os.path.join(root, file_name))
+        if not recursive:
+            break
+    return sorted(found)
+
+
+def _with_compression(output_path: str, compress: Optional[str]) -> str:
+    """Troca a extensão de compressão da saída pela de `--compress` (se houver)."""
+    from compressed_io import strip_suffix
+
+    return strip_suffix(output_path) + '.' + compress if compress else output_path
+
+
+def _output_for(input_path: str, input_root: Optional[str], output: Optional[str], compress: Optional[str] = None) -> str:
+    from compressed_io import strip_suffix
+
+    stem = os.path.splitext(strip_suffix(input_path))[0]
+    base = _with_compression(stem + ('.convertido.arff' if _is_arff(input_path) else '.arff'), compress)
+    if not output:
+        return base
+    relative = os.path.relpath(base, input_root) if input_root else os.path.basename(base)
+    return os.path.join(output, relative)
+
+
+def run_batch(inputs: List[str], outputs: List[str], spec: Dict[str, Any], options: Dict[str, Any], workers: int) -> List[Result]:
+    """Converte todos os arquivos; com workers > 1 usa um pool de processos."""
+    for output_path in outputs:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    jobs = [(i, o, overrides_for(spec, i), options) for i, o in zip(inputs, outputs)]
+    if workers <= 1 or len(jobs) <= 1:
+        results = []
+        for job in jobs:
+            results.append(convert_file(*job))
+            _print_progress(results[-1], len(results), len(jobs))
+        return results
+    results = []
+    # "spawn": cada processo sobe limpo (PySide6/pandas não lidam bem com fork)
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [executor.submit(_convert_job, *job) for job in jobs]
+        for future in as_completed(futures):
+            results.append(future.result())
+            _print_progress(results[-1], len(results), len(jobs))
+    order = {path: index for index, path in enumerate(inputs)}
+    return sorted(results, key=lambda result: order[result['input']])
+
+
+def _print_progress(result: Result, done: int, total: int) -> None:
+    status = 'ok' if result['ok'] else 'ERRO'
+    print(f"[{done}/{total}] {status:<4} {result['seconds']:7.2f} s  {result['input']}", flush=True)
+    for message in result['messages']:
+        if not result['ok'] or 'Atenção' in message or 'não existe' in message:
+            print(f"         {message}", flush=True)
+
+
+def print_summary(results: List[Result], elapsed: float) -> None:
+    """Tabela por arquivo (linhas, colunas, tempo) e totais."""
+    print()
+    print(f"{'arquivo':<40} {'linhas':>10} {'colunas':>8} {'tempo (s)':>10}  status")
+    for result in results:
+        name = os.path.basename(result['input'])
+        status = 'ok' if result['ok'] else 'erro'
+        print(f"{name[:40]:<40} {result['rows']:>10} {result['columns']:>8} {result['seconds']:>10.2f}  {status}")
+    converted = [r for r in results if r['ok']]
+    rows = sum(r['rows'] for r in converted)
+    busy = sum(r['seconds'] for r in results)
+    print(
+        f"\n{len(converted)}/{len(results)} convertidos, {rows} linhas em {elapsed:.2f} s "
+        f"(soma por arquivo {busy:.2f} s, {rows / elapsed if elapsed else 0:.0f} linhas/s)"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Converte CSV (ou ARFF) em ARFF sem abrir a interface.")
+    parser.add_argument('input', help="arquivo .csv/.arff ou diretório")
+    parser.add_argument('-o', '--output', help="arquivo de saída (um arquivo) ou diretório (lote)")
+    parser.add_argument('--types', help="arquivo JSON com tipos por coluna")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="processos no modo diretório")
+    parser.add_argument('--recursive', action='store_true', help="inclui subdiretórios")
+    parser.add_argument('--engine', default='single', help="motor de leitura de CSV (single, parallel, arrow)")
+    parser.add_argument('--sample-rows', type=int, default=10_000, help="amostra da inferência de tipos")
+    parser.add_argument('--refine', action='store_true', help="confere os tipos com uma passada completa")
+    parser.add_argument('--max-nominal', type=int, default=1000, help="teto de valores nominais (0 = sem limite)")
+    parser.add_argument('--sort-nominal', action='store_true', help="domínio nominal ordenado")
+    parser.add_argument('--cache', action='store_true', help="usa o cache em disco das leituras (parse_cache)")
+    parser.add_argument('--compact', action='store_true', help="compacta os dtypes ao carregar (menos memória)")
+    parser.add_argument('--stream', action='store_true', help="CSV maior que a memória: converte em blocos, sem carregar tudo")
+    parser.add_argument('--memory-budget', type=int, default=-1,
+                        help="memória por carregamento em MB (-1 = automático, 0 = sem limite)")
+    parser.add_argument('--compress', choices=COMPRESS_CHOICES, help="grava o ARFF comprimido (extensão .gz, .bz2, .xz ou .zst)")
+    parser.add_argument('--sparse', choices=SPARSE_CHOICES, default='auto',
+                        help="@data esparso: auto (quase tudo zero), always ou never")
+    parser.add_argument('--summary', help="grava o resumo por arquivo em JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_type_spec(args.types)
+    except (OSError, ValueError) as e:
+        print(f"Erro no arquivo de tipos: {e}", file=sys.stderr)
+        return 2
+    options = {
+        'engine': args.engine, 'sample_rows': args.sample_rows, 'refine': args.refine,
+        'max_nominal': args.max_nominal, 'sort_nominal': args.sort_nominal,
+        'cache': args.cache, 'compact': args.compact, 'stream': args.stream,
+        'sparse': args.sparse, 'memory_budget': args.memory_budget,
+    }
+
+    if os.path.isdir(args.input):
+        inputs = _list_inputs(args.input, args.recursive)
+        outputs = [_output_for(path, args.input, args.output, args.compress) for path in inputs]
+    elif os.path.isfile(args.input):
+        inputs = [args.input]
+        # `-o saida.arff --compress gz` grava saida.arff.gz, como no modo pasta
+        outputs = [_with_compression(args.output, args.compress) if args.output
+                   else _output_for(args.input, None, None, args.compress)]
+    else:
+        print(f"Entrada não encontrada: {args.input}", file=sys.stderr)
+        return 2
+    if not inputs:
+        print(f"Nenhum arquivo {'/'.join(INPUT_EXTENSIONS)} em {args.input}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    results = run_batch(inputs, outputs, spec, options, max(args.workers, 1))
+    print_summary(results, time.perf_counter() - start)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, ensure_ascii=False, indent=2)
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
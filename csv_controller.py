@@ -1,9 +1,204 @@
+from __future__ import annotations
+
+import copy
+import logging
 import os
-from typing import Optional, List, Dict
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, Optional, List, Dict, Tuple
 
-import pandas as pd
 from PySide6.QtCore import QObject, Signal, Slot, QUrl, Property
+from attribute_model import AttributeListModel
+from column_stats import ColumnStatsEngine, csv_chunks, frame_chunks
+from compaction import memory_stats
+from compressed_io import strip_suffix
+from instrumentation import Timings, load_stats, span
 from table_model import DataFrameModel
+from lazy_table_model import LazyFileModel
+from loader import BackgroundLoader, report_progress
+from parse_cache import ParseCache, default_cache, fingerprint
+
+# pandas e os módulos que dependem dele (arff_io, arff_schema, column_profile,
+# csv_parallel, type_inference) são importados dentro das funções: a janela
+# abre sem eles e o primeiro carregamento (ou startup.warm_up_backend) os traz
+if TYPE_CHECKING:
+    import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# Arquivos a partir deste tamanho abrem em "modo janela" (LazyFileModel);
+# abaixo dele, memory_plan decide pela memória disponível
+LAZY_THRESHOLD_BYTES = 1024 * 1024 * 1024
+# Linhas lidas no modo janela para sugerir tipos/exemplos na página 3
+LAZY_SAMPLE_ROWS = 10_000
+# Linhas por bloco na passada completa de inferência de tipos
+REFINE_CHUNK_ROWS = 100_000
+
+
+def _profiled(dataframe: pd.DataFrame, sample_rows: Optional[int], timings: Timings) -> Dict[str, object]:
+    """Perfis das colunas com os tipos inferidos sobre uma amostra."""
+    from column_profile import build_profiles
+    from type_inference import DEFAULT_SAMPLE_ROWS, apply_inference, infer_types
+
+    with span("profile", timings, columns=dataframe.shape[1]):
+        profiles = build_profiles(dataframe)
+    with span("infer", timings):
+        apply_inference(profiles, infer_types(dataframe, sample_rows or DEFAULT_SAMPLE_ROWS))
+    return {'dataframe': dataframe, 'profiles': profiles, 'timings': timings}
+
+
+def _read_csv(
+    handle,
+    file_path: str,
+    engine: str = "single",
+    sample_rows: Optional[int] = None,
+    cache: Optional[ParseCache] = None,
+    compact: bool = False,
+    dtype: Optional[Dict[str, str]] = None,
+) -> Dict[str, object]:
+    """Parse executado no worker do BackgroundLoader (inclui os perfis).
+
+    Com `cache`, um arquivo já lido volta do disco (parse_cache) e uma
+    leitura nova é gravada lá em segundo plano. Com `compact`, as colunas
+    passam para dtypes menores (compaction) depois dos perfis; `dtype`
+    já lê colunas de texto como Categorical (plano "compact").
+    """
+    from csv_parallel import read_csv_with_engine
+
+    timings: Timings = []
+    key = None
+    if cache is not None and cache.enabled:
+        with span("cache", timings, file=file_path):
+            key = fingerprint(file_path, f"csv:{engine}" + (":compact" if compact else ""))
+            cached = cache.load(key)
+        if cached is not None:
+            report_progress(handle, os.path.getsize(file_path))
+            return {**cached, 'cacheKey': key, 'fromCache': True, 'timings': timings}
+    with span("read", timings, file=file_path, engine=engine):
+        dataframe = read_csv_with_engine(
+            handle, file_path, engine, on_progress=lambda position: report_progress(handle, position), dtype=dtype
+        )
+    parsed = _profiled(dataframe, sample_rows, timings)
+    if compact:
+        from compaction import compact_dataframe
+
+        with span("compact", timings):
+            parsed['dataframe'], parsed['memoryReport'] = compact_dataframe(parsed['dataframe'])
+    if key is not None:
+        # Cópia dos perfis: a thread da interface pode alterá-los (refineTypes)
+        cache.store_in_background(key, {**parsed, 'profiles': copy.deepcopy(parsed['profiles'])})
+        parsed['cacheKey'] = key
+    return parsed
+
+
+def _read_csv_sample(handle, sample_rows: Optional[int] = None) -> Dict[str, object]:
+    """Lê só as primeiras linhas (modo janela)."""
+    import pandas as pd
+
+    timings: Timings = []
+    with span("read", timings, rows=LAZY_SAMPLE_ROWS):
+        dataframe = pd.read_csv(handle, nrows=LAZY_SAMPLE_ROWS)
+    return _profiled(dataframe, sample_rows, timings)
+
+
+def _load_csv(
+    handle,
+    file_path: str,
+    budget: Optional[int] = None,
+    lazy_threshold: Optional[int] = None,
+    sample_rows: Optional[int] = None,
+    compact: bool = False,
+    **options: Any,
+) -> Dict[str, object]:
+    """Escolhe o modo pela memória (memory_plan) e lê o CSV nele.
+
+    Em "lazy" só a amostra é lida (modo janela); em "compact" as colunas
+    de texto repetitivo já saem do parser como Categorical. O plano volta
+    no resultado ('plan').
+    """
+    from memory_plan import plan_load
+
+    timings: Timings = []
+    with span("plan", timings, file=file_path):
+        plan = plan_load(file_path, "csv", budget, lazy_threshold, compact, LAZY_SAMPLE_ROWS)
+    if plan['mode'] == "lazy":
+        parsed = _read_csv_sample(handle, sample_rows)
+    else:
+        dtype = {name: "category" for name in plan['categories']} or None
+        parsed = _read_csv(handle, file_path, sample_rows=sample_rows, compact=plan['mode'] == "compact",
+                           dtype=dtype, **options)
+    parsed['timings'] = timings + list(parsed.get('timings', []))
+    parsed['plan'] = plan
+    return parsed
+
+
+def _refine_csv_types(handle) -> Dict[str, Dict]:
+    """Passada completa: infere os tipos sobre todas as linhas, como texto."""
+    import pandas as pd
+    from type_inference import TypeAccumulator
+
+    accumulator = TypeAccumulator()
+    with span("refine"), pd.read_csv(handle, dtype=str, chunksize=REFINE_CHUNK_ROWS) as reader:
+        for chunk in reader:
+            accumulator.add(chunk)
+    return accumulator.results(exact=True)
+
+
+def _stream_csv_to_arff(
+    handle,
+    file_path: str,
+    output_path: str,
+    relation: str,
+    chosen: List[Tuple[str, str]],
+    max_nominal: Optional[int],
+    sort_nominal: bool,
+    sparse: Optional[bool] = False,
+) -> Dict[str, object]:
+    """Exportação em fluxo (csv_stream) executada no worker do BackgroundLoader.
+
+    O arquivo é relido em blocos pelas duas passadas; `handle` só serve
+    para o progresso e o cancelamento (report_progress). Com a primeira
+    passada, cada uma vale metade da barra.
+    """
+    from csv_stream import plan_columns, write_arff_stream
+
+    share = 0.5 if any(label in ('Nominal', 'Numérico') for _, label in chosen) else 0.0
+
+    def progress(step: int, position: int, total: int) -> None:
+        done = position * share if step == 1 else total * share + position * (1 - share)
+        report_progress(handle, int(done))
+
+    timings: Timings = []
+    with span("plan", timings, file=file_path):
+        attributes, dtypes, fallbacks = plan_columns(
+            file_path, chosen, max_nominal, sort_nominal, on_progress=progress
+        )
+    with span("write", timings, file=output_path):
+        rows = write_arff_stream(file_path, output_path, relation, attributes, dtypes, on_progress=progress,
+                                 sparse=sparse)
+    return {'output': output_path, 'rows': rows, 'fallbacks': fallbacks, 'timings': timings}
+
+
+def _stream_csv_to_parquet(
+    handle,
+    file_path: str,
+    output_path: str,
+    chosen: List[Tuple[str, str]],
+    sort_nominal: bool,
+) -> Dict[str, object]:
+    """Como `_stream_csv_to_arff`, gravando Parquet (csv_stream.write_parquet_stream)."""
+    from csv_stream import write_parquet_stream
+
+    share = 0.5 if any(label in ('Nominal', 'Numérico') for _, label in chosen) else 0.0
+
+    def progress(step: int, position: int, total: int) -> None:
+        done = position * share if step == 1 else total * share + position * (1 - share)
+        report_progress(handle, int(done))
+
+    timings: Timings = []
+    with span("write", timings, file=output_path):
+        rows = write_parquet_stream(file_path, output_path, chosen, sort_nominal, on_progress=progress)
+    return {'output': output_path, 'rows': rows, 'fallbacks': [], 'timings': timings, 'format': 'parquet'}
 
 
 class CSVController(QObject):
@@ -16,15 +211,93 @@ class CSVController(QObject):
     infoChanged = Signal()
     # Mantém simetria com ARFFController para a tela de tipos
     metadataChanged = Signal()
+    # Carregamento em segundo plano (barra de progresso da página 1)
+    loadingChanged = Signal()
+    loadProgressChanged = Signal()
+    # Passada completa de inferência de tipos (refineTypes)
+    refiningTypesChanged = Signal()
+    csvEngineChanged = Signal()
+    statsChanged = Signal()
+    # Estatísticas por coluna da página 3 (column_stats): resultados parciais e andamento
+    columnStatsChanged = Signal()
+    computingColumnStatsChanged = Signal()
+    # Modo de carregamento escolhido pelo orçamento de memória (memory_plan)
+    loadPlanChanged = Signal()
+    # Exportação em fluxo (exportArffStreaming): andamento e progresso
+    exportingChanged = Signal()
+    exportProgressChanged = Signal()
 
     def __init__(self) -> None:
         super().__init__()
         self._df: Optional[pd.DataFrame] = None
         self._file_name: str = ""
+        # Arquivo da base carregada (e do carregamento em andamento)
+        self._file_path: Optional[str] = None
+        self._pending_path: Optional[str] = None
         # Model baseado em QAbstractTableModel para ser usado no QML
         self._model = DataFrameModel()
+        self._model.queryFailed.connect(lambda message: self.errorOccurred.emit(f"Erro ao ordenar/filtrar: {message}"))
         # Tipos selecionados manualmente pelo usuário (override)
         self._selected_types: Dict[str, str] = {}
+        # Lista de atributos da página 3 (atualizada linha a linha)
+        self._attribute_model = AttributeListModel(self)
+        # Cache em disco das leituras (chave da base atual; None = fora do cache)
+        self._cache_key: Optional[str] = None
+        self._loaded_from_cache: bool = False
+        # Perfil por coluna (dtype, contagens, exemplos, sugestão), um por carga
+        self._profiles: Dict[str, Dict] = {}
+        # Modo janela: a tabela pagina o arquivo e _df guarda só uma amostra
+        self._lazy_threshold_bytes: int = LAZY_THRESHOLD_BYTES
+        self._lazy_model: Optional[LazyFileModel] = None
+        # Orçamento de memória do carregamento (memory_plan) e o último plano
+        # -1 = automático (fração da memória disponível), 0 = sem limite
+        self._memory_budget_mb: int = -1
+        self._load_plan: Dict[str, Any] = {}
+        # Leitura do arquivo em thread separada; o resultado volta por sinais
+        self._loader = BackgroundLoader(self)
+        self._loader.loadingChanged.connect(self.loadingChanged)
+        self._loader.progressChanged.connect(self.loadProgressChanged)
+        self._loader.finished.connect(self._onCsvLoaded)
+        self._loader.failed.connect(self._onLoadFailed)
+        # Domínio dos atributos nominais na exportação (acima do teto: STRING)
+        # -1 = padrão (arff_schema.MAX_NOMINAL_VALUES), 0 = sem limite
+        self._max_nominal_values: int = -1
+        self._sort_nominal_values: bool = False
+        # Formato do @data: None = automático (arff_io.resolve_sparse)
+        self._sparse_output: Optional[bool] = None
+        # Motor de leitura: "single" (pandas), "parallel" (processos) ou "arrow"
+        self._csv_engine: str = "single"
+        # Inferência de tipos: amostra no carregamento, passada completa opcional
+        # None = padrão (type_inference.DEFAULT_SAMPLE_ROWS)
+        self._inference_sample_rows: Optional[int] = None
+        self._auto_refine_types: bool = False
+        self._types_refined: bool = False
+        self._refiner = BackgroundLoader(self)
+        self._refiner.loadingChanged.connect(self.refiningTypesChanged)
+        self._refiner.finished.connect(self._onTypesRefined)
+        self._refiner.failed.connect(self._onRefineFailed)
+        # Tempos do último carregamento e da última exportação (propriedade stats)
+        self._load_started: float = 0.0
+        self._stats: Dict[str, Any] = {}
+        # Compactação dos dtypes no carregamento e bytes por coluna antes/depois
+        self._compact_memory: bool = False
+        self._memory_report: Dict[str, Any] = {}
+        # Resumo por coluna (mín./máx./média, histograma, top-k) da carga atual, no engine
+        self._stats_engine = ColumnStatsEngine(self)
+        self._stats_engine.updated.connect(self._onColumnStatsUpdated)
+        self._stats_engine.runningChanged.connect(self.computingColumnStatsChanged)
+        self._stats_engine.finished.connect(self._onColumnStatsFinished)
+        self._stats_engine.failed.connect(
+            lambda message: self.errorOccurred.emit(f"Erro ao calcular as estatísticas: {message}")
+        )
+        # Exportação CSV→ARFF em fluxo, sem o DataFrame inteiro (csv_stream)
+        self._exporter = BackgroundLoader(self)
+        self._exporter.loadingChanged.connect(self.exportingChanged)
+        self._exporter.progressChanged.connect(self.exportProgressChanged)
+        self._exporter.finished.connect(self._onStreamExported)
+        self._exporter.failed.connect(self._onStreamExportFailed)
+        self._export_started: float = 0.0
+        self._export_limit: Optional[int] = None
 
     @Property(str, notify=fileNameChanged)
     def fileName(self) -> str:
@@ -35,16 +308,255 @@ class CSVController(QObject):
         if self._df is None:
             return "Nenhum dado carregado"
         rows, cols = self._df.shape
+        if self._lazy_model is not None:
+            return f"Linhas: {self._lazy_model.rowCount()}+ (modo janela) | Colunas: {cols}"
         return f"Linhas: {rows} | Colunas: {cols}"
 
-    @Property(QObject, constant=True)
+    @Property(QObject, notify=dataframeChanged)
     def tableModel(self) -> QObject:
         """Exposto ao QML para `model: controller.tableModel`."""
+        if self._lazy_model is not None:
+            return self._lazy_model
         return self._model
 
+    @Property(QObject, constant=True)
+    def attributeModel(self) -> QObject:
+        """Atributos (nome, tipo efetivo, exemplos, confiança) para a página 3."""
+        return self._attribute_model
+
+    @Property('QVariantMap', notify=statsChanged)
+    def stats(self) -> Dict[str, Any]:
+        """Último carregamento ("load") e exportação ("export"): tempo, linhas/s, memória, etapas."""
+        return self._stats
+
+    def _setStats(self, operation: str, stats: Dict[str, Any]) -> None:
+        self._stats = {**self._stats, operation: stats}
+        self.statsChanged.emit()
+
+    @Property('QVariantMap', notify=dataframeChanged)
+    def memoryReport(self) -> Dict[str, Any]:
+        """Bytes por coluna antes/depois da compactação ({} se ela estava desligada)."""
+        return self._memory_report
+
+    @Slot(bool)
+    def setCompactMemory(self, enabled: bool) -> None:
+        """Ligado, os próximos carregamentos compactam os dtypes (ver compaction)."""
+        self._compact_memory = bool(enabled)
+
+    @Property(bool, notify=computingColumnStatsChanged)
+    def computingColumnStats(self) -> bool:
+        """Indica se as estatísticas por coluna estão sendo calculadas."""
+        return self._stats_engine.running
+
+    @Property(float, notify=columnStatsChanged)
+    def columnStatsProgress(self) -> float:
+        """Fração da base já resumida (0.0 a 1.0)."""
+        return self._stats_engine.progress
+
+    @Slot()
+    def computeColumnStats(self) -> None:
+        """Calcula em segundo plano o resumo de cada coluna (column_stats).
+
+        Os resultados parciais chegam a cada bloco pelo `attributeModel`
+        (papel `stats`) e por `columnStatsChanged`. Calculado uma vez por
+        carga e guardado com a base no cache em disco.
+        """
+        if self._df is None or self._stats_engine.complete or self._stats_engine.running:
+            return
+        if self._lazy_model is not None:
+            # Modo janela: a base em memória é só uma amostra; o resumo lê o arquivo
+            source = partial(csv_chunks, self._file_path, self._df.shape[1])
+        else:
+            source = partial(frame_chunks, self._df)
+        self._stats_engine.background = self._loader.background
+        self._stats_engine.start(source)
+
+    @Slot()
+    def cancelColumnStats(self) -> None:
+        """Interrompe o cálculo; o que já foi resumido continua visível."""
+        self._stats_engine.cancel()
+
+    @Slot(str, result='QVariantMap')
+    def getColumnStats(self, attribute_name: str) -> Dict[str, Any]:
+        """Resumo de um atributo ({} se ainda não calculado)."""
+        return self._stats_engine.results.get(attribute_name) or {}
+
+    def _onColumnStatsUpdated(self) -> None:
+        # Cada delegate da página 3 só é notificado se o seu resumo mudou
+        for name, summary in self._stats_engine.results.items():
+            self._attribute_model.updateAttribute(name, stats=summary)
+        self.columnStatsChanged.emit()
+
+    def _onColumnStatsFinished(self, results: Dict[str, Dict[str, Any]]) -> None:
+        default_cache().update_in_background(self._cache_key, columnStats=results)
+        self.columnStatsChanged.emit()
+
+    def _resetColumnStats(self, stats: Dict[str, Dict[str, Any]]) -> None:
+        self._stats_engine.restore(stats)
+        self.columnStatsChanged.emit()
+
+    @Property(bool, notify=dataframeChanged)
+    def loadedFromCache(self) -> bool:
+        """True se a base atual veio do cache em disco (sem parse)."""
+        return self._loaded_from_cache
+
+    @Slot(bool)
+    def setCacheEnabled(self, enabled: bool) -> None:
+        """Liga/desliga o cache em disco (compartilhado com o ARFFController)."""
+        default_cache().enabled = bool(enabled)
+
+    @Slot(int)
+    def setCacheLimitMb(self, megabytes: int) -> None:
+        """Teto do diretório de cache; as entradas menos usadas saem primeiro."""
+        cache = default_cache()
+        cache.max_bytes = max(int(megabytes), 0) * 1024 * 1024
+        cache.evict()
+
+    @Slot()
+    def invalidateCache(self) -> None:
+        """Descarta a entrada da base atual: o próximo loadCsv relê o arquivo."""
+        if self._cache_key:
+            default_cache().invalidate(self._cache_key)
+            self._cache_key = None
+
+    @Slot()
+    def clearCache(self) -> None:
+        """Apaga todo o diretório de cache."""
+        default_cache().clear()
+        self._cache_key = None
+
+    @Property(bool, notify=dataframeChanged)
+    def lazyMode(self) -> bool:
+        """True quando o arquivo foi aberto em modo janela (maior que o limite)."""
+        return self._lazy_model is not None
+
+    @Slot(int)
+    def setLazyThresholdMb(self, megabytes: int) -> None:
+        """Tamanho a partir do qual o CSV abre em modo janela."""
+        self._lazy_threshold_bytes = max(int(megabytes), 0) * 1024 * 1024
+
+    @Slot(int)
+    def setMemoryBudgetMb(self, megabytes: int) -> None:
+        """Memória que um carregamento pode usar (-1 = automático, 0 = sem limite)."""
+        self._memory_budget_mb = int(megabytes)
+
+    def _memoryBudget(self) -> Optional[int]:
+        """Orçamento em bytes para memory_plan (None = automático)."""
+        if self._memory_budget_mb < 0:
+            return None
+        return self._memory_budget_mb * 1024 * 1024
+
+    @Property('QVariantMap', notify=loadPlanChanged)
+    def loadPlan(self) -> Dict[str, Any]:
+        """Modo escolhido no último carregamento ("eager", "compact", "lazy"), motivo e estimativas."""
+        return self._load_plan
+
+    @Property(bool, notify=loadingChanged)
+    def loading(self) -> bool:
+        """Indica se há um carregamento em andamento."""
+        return self._loader.loading
+
+    @Property(float, notify=loadProgressChanged)
+    def loadProgress(self) -> float:
+        """Fração do arquivo já lida (0.0 a 1.0)."""
+        return self._loader.progress
+
+    @Property(str, notify=loadProgressChanged)
+    def loadStatus(self) -> str:
+        """Texto de progresso, ex.: "120.0 MB de 2048.0 MB"."""
+        mb = 1024 * 1024
+        return f"{self._loader.bytesRead / mb:.1f} MB de {self._loader.bytesTotal / mb:.1f} MB"
+
+    @Slot(bool)
+    def setBackgroundLoading(self, enabled: bool) -> None:
+        """Desligado, loadCsv bloqueia até o fim (scripts sem event loop)."""
+        self._loader.background = bool(enabled)
+
+    @Property(bool, notify=exportingChanged)
+    def exporting(self) -> bool:
+        """Indica se há uma exportação em fluxo em andamento."""
+        return self._exporter.loading
+
+    @Property(float, notify=exportProgressChanged)
+    def exportProgress(self) -> float:
+        """Fração da exportação em fluxo já concluída (0.0 a 1.0, as duas passadas)."""
+        return self._exporter.progress
+
+    @Property(bool, notify=refiningTypesChanged)
+    def refiningTypes(self) -> bool:
+        """Indica se a passada completa de inferência de tipos está rodando."""
+        return self._refiner.loading
+
+    @Property(bool, notify=metadataChanged)
+    def typesRefined(self) -> bool:
+        """True quando os tipos sugeridos vêm da passada completa (não da amostra)."""
+        return self._types_refined
+
+    @Slot(int)
+    def setInferenceSampleRows(self, rows: int) -> None:
+        """Tamanho da amostra usada para sugerir os tipos no carregamento."""
+        self._inference_sample_rows = max(int(rows), 1)
+
+    @Slot(bool)
+    def setAutoRefineTypes(self, enabled: bool) -> None:
+        """Ligado, cada carregamento dispara refineTypes() ao terminar."""
+        self._auto_refine_types = bool(enabled)
+
+    @Property(str, notify=csvEngineChanged)
+    def csvEngine(self) -> str:
+        """Motor usado por loadCsv: "single", "parallel" ou "arrow"."""
+        return self._csv_engine
+
+    @Property(list, constant=True)
+    def availableCsvEngines(self) -> List[str]:
+        """Motores disponíveis neste ambiente ("arrow" só com pyarrow instalado)."""
+        from csv_parallel import available_engines
+
+        return available_engines()
+
+    @Slot(str)
+    def setCsvEngine(self, engine: str) -> None:
+        """Escolhe o motor de leitura dos próximos carregamentos."""
+        from csv_parallel import available_engines
+
+        if engine not in available_engines():
+            self.errorOccurred.emit(f"Motor de leitura indisponível: {engine}")
+            return
+        if engine != self._csv_engine:
+            self._csv_engine = engine
+            self.csvEngineChanged.emit()
+
+    @Slot(int)
+    def setMaxNominalValues(self, limit: int) -> None:
+        """Teto de valores de um atributo nominal na exportação (0 = sem limite)."""
+        self._max_nominal_values = max(int(limit), 0)
+
+    def _nominalLimit(self) -> Optional[int]:
+        """Teto em vigor para build_attributes (None = sem limite)."""
+        from arff_schema import MAX_NOMINAL_VALUES
+
+        if self._max_nominal_values < 0:
+            return MAX_NOMINAL_VALUES
+        return self._max_nominal_values or None
+
+    @Slot(bool)
+    def setSortNominalValues(self, enabled: bool) -> None:
+        """Ligado, o domínio nominal sai ordenado; desligado, na ordem de aparição."""
+        self._sort_nominal_values = bool(enabled)
+
+    @Slot(str)
+    def setSparseOutput(self, mode: str) -> None:
+        """Formato do @data no ARFF: "auto" (esparso se quase tudo for zero), "always" ou "never"."""
+        from arff_io import SPARSE_MODES
+
+        if mode not in SPARSE_MODES:
+            self.errorOccurred.emit(f"Modo esparso inválido: {mode} (use {', '.join(SPARSE_MODES)})")
+            return
+        self._sparse_output = SPARSE_MODES[mode]
+
     @Slot(QUrl)
     def loadCsv(self, file_url: QUrl) -> None:
-        """Recebe um QUrl do QML, carrega CSV com pandas e notifica a UI."""
+        """Recebe um QUrl do QML e inicia a leitura do CSV em segundo plano."""
         try:
             if file_url.scheme() == "file":
                 file_path = file_url.toLocalFile()
@@ -53,24 +565,135 @@ class CSVController(QObject):
 
             self._file_name = os.path.basename(file_path)
             self.fileNameChanged.emit()
+            self._refiner.cancel()
+            self._stats_engine.cancel()
+            self._pending_path = file_path
+            self._load_started = time.perf_counter()
 
-            self._df = pd.read_csv(file_path)
+            # O resultado chega em _onCsvLoaded / _onLoadFailed; o modo
+            # (completo, compacto ou janela) é escolhido no worker
+            self._loader.start(
+                file_path,
+                partial(
+                    _load_csv,
+                    file_path=file_path,
+                    budget=self._memoryBudget(),
+                    lazy_threshold=self._lazy_threshold_bytes,
+                    engine=self._csv_engine,
+                    sample_rows=self._inference_sample_rows,
+                    cache=default_cache(),
+                    compact=self._compact_memory,
+                ),
+            )
+        except Exception as e:
+            self._onLoadFailed(str(e))
+
+    @Slot()
+    def cancelLoad(self) -> None:
+        """Cancela o carregamento em andamento; a base anterior é mantida."""
+        self._loader.cancel()
+
+    def _onCsvLoaded(self, parsed: Dict[str, object]) -> None:
+        """Recebe o DataFrame e os perfis do worker já na thread da interface."""
+        self._df = parsed['dataframe']
+        self._profiles = parsed['profiles']
+        self._file_path = self._pending_path
+        self._cache_key = parsed.get('cacheKey')
+        self._loaded_from_cache = bool(parsed.get('fromCache'))
+        self._types_refined = bool(parsed.get('typesRefined'))
+        self._memory_report = dict(parsed.get('memoryReport', {}))
+        self._setLoadPlan(dict(parsed.get('plan', {})))
+        self._resetLazyModel()
+        if self._load_plan.get('mode') == "lazy":
+            # A tabela lê o arquivo sob demanda; _df fica como amostra
+            self._lazy_model = LazyFileModel(self._file_path, kind="csv")
+        timings = list(parsed.get('timings', []))
+        with span("model", timings):
             # Atualiza o QAbstractTableModel (a view QML se atualiza automaticamente)
             self._model.setDataFrame(self._df)
             self.dataframeChanged.emit()
             self.infoChanged.emit()
-            # Reset de escolhas de tipos ao carregar nova base
-            self._selected_types.clear()
+            # Escolhas de tipos: as guardadas no cache, ou nenhuma numa base nova
+            self._selected_types = dict(parsed.get('selectedTypes', {}))
+            # Resumos por coluna: os guardados no cache, ou calculados sob demanda
+            self._resetColumnStats(parsed.get('columnStats', {}))
+            self._attribute_model.setProfiles(self.getAttributeProfiles())
             self.metadataChanged.emit()
-        except Exception as e: 
-            self._df = None
-            self.dataframeChanged.emit()
-            self.infoChanged.emit()
-            self.errorOccurred.emit(f"Erro ao carregar CSV: {e}")
+        elapsed = time.perf_counter() - self._load_started
+        rows = self.rowCount()
+        log.info("CSV %s: %d linhas em %.2f s%s, modo %s (%s)", self._file_name, rows, elapsed,
+                 " (cache)" if self._loaded_from_cache else "", self._load_plan.get('mode'),
+                 self._load_plan.get('reason'))
+        self._setStats("load", load_stats(timings, elapsed, rows, file=self._file_name,
+                                          fromCache=self._loaded_from_cache, plan=self._load_plan,
+                                          **memory_stats(self._memory_report)))
+        if self._auto_refine_types:
+            self.refineTypes()
+
+    @Slot()
+    def refineTypes(self) -> None:
+        """Confere os tipos sugeridos com uma passada completa, em segundo plano.
+
+        A sugestão do carregamento usa só uma amostra; aqui o arquivo inteiro
+        é relido em blocos e, ao terminar, os perfis recebem os tipos exatos
+        (as escolhas manuais do usuário continuam valendo).
+        """
+        if not self._file_path or self._refiner.loading:
+            return
+        self._refiner.background = self._loader.background
+        self._refiner.start(self._file_path, _refine_csv_types)
+
+    def _onTypesRefined(self, inferences: Dict[str, Dict]) -> None:
+        from type_inference import apply_inference
+
+        apply_inference(self._profiles, inferences)
+        self._types_refined = True
+        default_cache().update_in_background(self._cache_key, profiles=copy.deepcopy(self._profiles), typesRefined=True)
+        # Só as linhas cujo tipo/confiança mudou são notificadas
+        self._attribute_model.setProfiles(self.getAttributeProfiles())
+        self.metadataChanged.emit()
+
+    def _onRefineFailed(self, message: str) -> None:
+        self.errorOccurred.emit(f"Erro ao conferir os tipos: {message}")
+
+    @Slot(str, result=float)
+    def getTypeConfidence(self, attribute_name: str) -> float:
+        """Confiança (0 a 1) do tipo sugerido; 1.0 quando o usuário escolheu."""
+        if attribute_name in self._selected_types:
+            return 1.0
+        profile = self._profiles.get(attribute_name)
+        return float(profile.get('confidence', 0.0)) if profile else 0.0
+
+    def _setLoadPlan(self, plan: Dict[str, Any]) -> None:
+        self._load_plan = plan
+        self.loadPlanChanged.emit()
+
+    def _resetLazyModel(self) -> None:
+        if self._lazy_model is not None:
+            self._lazy_model.close()
+            self._lazy_model = None
+
+    def _onLoadFailed(self, message: str) -> None:
+        self._df = None
+        self._file_path = None
+        self._cache_key = None
+        self._loaded_from_cache = False
+        self._memory_report = {}
+        self._setLoadPlan({})
+        self._refiner.cancel()
+        self._resetColumnStats({})
+        self._profiles = {}
+        self._attribute_model.clear()
+        self._resetLazyModel()
+        self.dataframeChanged.emit()
+        self.infoChanged.emit()
+        self.errorOccurred.emit(f"Erro ao carregar CSV: {message}")
 
     # API para a TableView em QML
     @Slot(result=int)
     def rowCount(self) -> int:
+        if self._lazy_model is not None:
+            return self._lazy_model.rowCount()
         return 0 if self._df is None else int(self._df.shape[0])
 
     @Slot(result=int)
@@ -87,12 +710,17 @@ class CSVController(QObject):
 
     @Slot(int, int, result=str)
     def dataAt(self, row: int, column: int) -> str:
+        if self._lazy_model is not None:
+            value = self._lazy_model.data(self._lazy_model.index(row, column))
+            return value or ""
         if self._df is None:
             return ""
         if row < 0 or column < 0:
             return ""
         if row >= self._df.shape[0] or column >= self._df.shape[1]:
             return ""
+        import pandas as pd
+
         value = self._df.iat[row, column]
         return "" if pd.isna(value) else str(value)
     
@@ -108,39 +736,25 @@ class CSVController(QObject):
     def getSuggestedType(self, attribute_name: str) -> str:
         """Sugere tipo ARFF baseado no tipo de dados do pandas."""
         # 1) Prioriza o que o usuário escolheu manualmente
-        if attribute_name in getattr(self, "_selected_types", {}):
+        if attribute_name in self._selected_types:
             return self._selected_types[attribute_name]
 
-        if self._df is None or attribute_name not in self._df.columns:
-            return "Textual"
-        
-        dtype = self._df[attribute_name].dtype
-        if pd.api.types.is_numeric_dtype(dtype):
-            return "Numérico"
-        elif pd.api.types.is_datetime64_any_dtype(dtype):
-            return "Data"
-        else:
-            # Verifica se parece com dados nominais (poucos valores únicos)
-            unique_count = self._df[attribute_name].nunique()
-            total_count = len(self._df[attribute_name])
-            if unique_count <= 10 and unique_count / total_count < 0.1:
-                return "Nominal"
-            return "Textual"
+        # 2) Sugestão calculada uma vez no carregamento (column_profile)
+        profile = self._profiles.get(attribute_name)
+        return profile['suggestedType'] if profile else "Textual"
     
     @Slot(str, result=list)
     def getAttributeExamples(self, attribute_name: str) -> List[str]:
         """Retorna os primeiros 5 exemplos de uma coluna."""
-        if self._df is None or attribute_name not in self._df.columns:
-            return []
-        
-        examples: List[str] = []
-        series = self._df[attribute_name].head(5)
-        for value in series:
-            text = "" if pd.isna(value) else str(value)
-            if len(text) > 30:
-                text = text[:27] + "..."
-            examples.append(text)
-        return examples
+        profile = self._profiles.get(attribute_name)
+        return list(profile['examples']) if profile else []
+
+    @Slot(result=list)
+    def getAttributeProfiles(self) -> List[Dict]:
+        """Todos os perfis de uma vez: nome, tipo (com override), exemplos, contagens."""
+        from column_profile import profiles_for_qml
+
+        return profiles_for_qml(self._profiles, self._selected_types, self._selected_types, self._stats_engine.results)
     
     @Property(list, constant=True)
     def availableTypes(self) -> List[str]:
@@ -152,68 +766,38 @@ class CSVController(QObject):
         """Define um novo tipo para um atributo (armazenado internamente)."""
         if not attribute_name:
             return
-        if not hasattr(self, "_selected_types"):
-            self._selected_types = {}
         self._selected_types[attribute_name] = new_type
-        # Notifica UI para possíveis re-renderizações (ex.: exemplos/tipos)
-        self.metadataChanged.emit()
+        # Escolha guardada com a base no cache: vale ao reabrir o arquivo
+        default_cache().update_in_background(self._cache_key, selectedTypes=dict(self._selected_types))
+        # Só o delegate deste atributo é notificado
+        self._attribute_model.updateAttribute(attribute_name, suggestedType=new_type, confidence=1.0)
     
     @Slot(str)
     def generateArff(self, output_path: str) -> None:
         """Gera arquivo ARFF a partir dos dados CSV."""
+        import pandas as pd
+        from dataframe_export import export_arff
+
         try:
             if self._df is None:
                 self.errorOccurred.emit("Nenhum dado carregado para gerar ARFF")
                 return
             
-            # Para simplificar, vamos gerar com tipos básicos
-            import arff
-            
-            # Constrói atributos respeitando overrides do usuário
-            attributes = []
+            # Tipos respeitando overrides do usuário; sem override, heurística do dtype
+            chosen = []
             for col in self._df.columns:
-                selected = self._selected_types.get(col) if hasattr(self, "_selected_types") else None
-                if selected == 'Numérico':
-                    attributes.append((col, 'NUMERIC'))
-                elif selected == 'Data':
-                    attributes.append((col, 'DATE'))
-                elif selected == 'Nominal':
-                    uniques = list(set(str(v) for v in self._df[col].dropna().unique().tolist()))[:50]
-                    attributes.append((col, uniques if uniques else 'STRING'))
-                elif selected == 'Relacional':
-                    attributes.append((col, 'STRING'))
-                else:
-                    # fallback: heurística baseada no dtype do pandas
-                    dtype = self._df[col].dtype
-                    if pd.api.types.is_numeric_dtype(dtype):
-                        attributes.append((col, 'NUMERIC'))
-                    else:
-                        attributes.append((col, 'STRING'))
-            
-            # Converte dados
-            data = []
-            for _, row in self._df.iterrows():
-                data_row = []
-                for col in self._df.columns:
-                    value = row[col]
-                    if pd.isna(value):
-                        data_row.append(None)
-                    else:
-                        data_row.append(value)
-                data.append(data_row)
-            
-            # Dataset ARFF
-            dataset = {
-                'relation': self._file_name.replace('.csv', ''),
-                'attributes': attributes,
-                'data': data
-            }
-            
-            # Salva arquivo
-            with open(output_path, 'w', encoding='utf-8') as f:
-                arff.dump(dataset, f)
-            
-            self.successOccurred.emit(f"Arquivo ARFF salvo com sucesso em: {output_path}")
+                selected = self._selected_types.get(col)
+                if selected is None:
+                    selected = 'Numérico' if pd.api.types.is_numeric_dtype(self._df[col].dtype) else 'Textual'
+                chosen.append((col, selected))
+            if self._lazy_model is not None:
+                # _df é só uma amostra: o arquivo é convertido em fluxo
+                self._startStreamingExport(output_path, chosen)
+                return
+            stats, notice = export_arff(output_path, strip_suffix(self._file_name).replace('.csv', ''), self._df,
+                                        chosen, self._nominalLimit(), self._sort_nominal_values, self._sparse_output)
+            self._setStats("export", stats)
+            self.successOccurred.emit(f"Arquivo ARFF salvo com sucesso em: {output_path}" + notice)
             
         except Exception as e:
             self.errorOccurred.emit(f"Erro ao gerar arquivo ARFF: {e}")
@@ -221,46 +805,110 @@ class CSVController(QObject):
     @Slot(str)
     def saveMetadata(self, output_path: str) -> None:
         """Salva metadados + dados do CSV em formato ARFF (compatível Weka)."""
+        from dataframe_export import export_arff
+
         try:
             if self._df is None:
                 self.errorOccurred.emit("Nenhum dado carregado para salvar metadados")
                 return
 
-            import arff
+            # getSuggestedType já devolve o override do usuário, se houver
+            chosen = [(col, self.getSuggestedType(col)) for col in self._df.columns]
+            if self._lazy_model is not None:
+                # _df é só uma amostra: o arquivo é convertido em fluxo
+                self._startStreamingExport(output_path, chosen)
+                return
+            relation = strip_suffix(self._file_name).replace('.csv', '') or 'dataset'
+            stats, notice = export_arff(output_path, relation, self._df, chosen, self._nominalLimit(),
+                                        self._sort_nominal_values, self._sparse_output)
+            self._setStats("export", stats)
+            self.successOccurred.emit(f"Arquivo ARFF salvo em: {output_path}" + notice)
+        except Exception as e:
+            self.errorOccurred.emit(f"Erro ao salvar metadados: {e}")
 
-            attributes = []
-            for col in self._df.columns:
-                selected = self._selected_types.get(col) if hasattr(self, "_selected_types") else None
-                # Se não houver override, usa a sugestão (que também respeita override)
-                chosen = selected or self.getSuggestedType(col)
-                if chosen == 'Numérico':
-                    attributes.append((col, 'NUMERIC'))
-                elif chosen == 'Data':
-                    attributes.append((col, 'DATE'))
-                elif chosen == 'Nominal':
-                    uniques = list(set(str(v) for v in self._df[col].dropna().unique().tolist()))[:50]
-                    attributes.append((col, uniques if uniques else 'STRING'))
-                else:
-                    attributes.append((col, 'STRING'))
-
-            # Converte os dados do DataFrame para lista de listas
-            data = []
-            for _, row in self._df.iterrows():
-                row_list = []
-                for col in self._df.columns:
-                    v = row[col]
-                    row_list.append(None if pd.isna(v) else v)
-                data.append(row_list)
-
-            dataset = {
-                'relation': self._file_name.replace('.csv', '') or 'dataset',
-                'attributes': attributes,
-                'data': data
-            }
-
-            with open(output_path, 'w', encoding='utf-8') as f:
-                arff.dump(dataset, f)
-
-            self.successOccurred.emit(f"Arquivo ARFF salvo em: {output_path}")
+    @Slot(str)
+    def exportArffStreaming(self, output_path: str) -> None:
+        """Converte o CSV carregado em ARFF em fluxo, bloco a bloco (csv_stream).
+
+        Não usa o DataFrame em memória: o arquivo é relido em duas passadas
+        (domínios nominais, depois o @data), com os tipos da página 3. A
+        memória fica proporcional ao bloco; é o caminho de `saveMetadata` no
+        modo janela. O fim chega em `successOccurred`/`errorOccurred`.
+        """
+        if self._df is None or not self._file_path:
+            self.errorOccurred.emit("Nenhum dado carregado para salvar metadados")
+            return
+        self._startStreamingExport(output_path, [(col, self.getSuggestedType(col)) for col in self._df.columns])
+
+    @Slot(str)
+    def exportParquet(self, output_path: str) -> None:
+        """Grava a base em Parquet com os tipos da página 3 (columnar_io).
+
+        Nominal vira coluna dicionário, Data timestamp e Numérico int64/float64.
+        No modo janela o arquivo é convertido em fluxo, em segundo plano.
+        """
+        from dataframe_export import export_parquet
+
+        try:
+            if self._df is None:
+                self.errorOccurred.emit("Nenhum dado carregado para exportar")
+                return
+            chosen = [(col, self.getSuggestedType(col)) for col in self._df.columns]
+            if self._lazy_model is not None:
+                self._startStreamingExport(output_path, chosen, "parquet")
+                return
+            self._setStats("export", export_parquet(output_path, self._df, chosen, self._sort_nominal_values))
+            self.successOccurred.emit(f"Arquivo Parquet salvo em: {output_path}")
         except Exception as e:
-            self.errorOccurred.emit(f"Erro ao salvar metadados: {e}")
\ No newline at end of file
+            self.errorOccurred.emit(f"Erro ao exportar Parquet: {e}")
+
+    @Slot()
+    def cancelExport(self) -> None:
+        """Cancela a exportação em fluxo (o arquivo de saída fica incompleto)."""
+        self._exporter.cancel()
+
+    def _startStreamingExport(self, output_path: str, chosen: List[Tuple[str, str]], target: str = "arff") -> None:
+        self._export_started = time.perf_counter()
+        self._export_limit = self._nominalLimit()
+        self._exporter.background = self._loader.background
+        if target == "parquet":
+            self._exporter.start(
+                self._file_path,
+                partial(
+                    _stream_csv_to_parquet,
+                    file_path=self._file_path,
+                    output_path=output_path,
+                    chosen=chosen,
+                    sort_nominal=self._sort_nominal_values,
+                ),
+            )
+            return
+        self._exporter.start(
+            self._file_path,
+            partial(
+                _stream_csv_to_arff,
+                file_path=self._file_path,
+                output_path=output_path,
+                relation=strip_suffix(self._file_name).replace('.csv', '') or 'dataset',
+                chosen=chosen,
+                max_nominal=self._export_limit,
+                sort_nominal=self._sort_nominal_values,
+                sparse=self._sparse_output,
+            ),
+        )
+
+    def _onStreamExported(self, result: Dict[str, Any]) -> None:
+        from arff_schema import fallback_warning
+
+        elapsed = time.perf_counter() - self._export_started
+        label = "Parquet" if result.get('format') == 'parquet' else "ARFF"
+        log.info("%s %s: %d linhas em fluxo em %.2f s", label, result['output'], result['rows'], elapsed)
+        self._setStats("export", load_stats(result['timings'], elapsed, result['rows'], file=result['output'],
+                                            streamed=True, format=result.get('format', 'arff')))
+        self.successOccurred.emit(
+            f"Arquivo {label} salvo em: {result['output']}"
+            + fallback_warning(result['fallbacks'], self._export_limit)
+        )
+
+    def _onStreamExportFailed(self, message: str) -> None:
+        self.errorOccurred.emit(f"Erro ao salvar metadados: {message}")
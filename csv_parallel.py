@@ -0,0 +1,263 @@
+"""Leitura de CSV em paralelo (vários processos) ou pelo motor do Arrow.
+
+O `pd.read_csv` usa um núcleo só. No modo "parallel" o arquivo é mapeado
+em memória (mmap), dividido em faixas de bytes alinhadas a fim de linha
+(respeitando campos entre aspas com quebra de linha) e cada faixa vira um
+DataFrame em um processo do pool; o resultado é a concatenação das partes,
+com os mesmos tipos que a leitura única daria. O modo "arrow" delega ao
+leitor multithread do pyarrow, quando instalado. Arquivos comprimidos não
+podem ser fatiados por bytes: no modo "parallel" são lidos com um núcleo só.
+
+Uso como benchmark:  python csv_parallel.py arquivo.csv [--workers N]
+"""
+from __future__ import annotations
+
+import io
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from columnar_io import arrow_available
+from compressed_io import detect_file, open_input
+
+ENGINES = ("single", "parallel", "arrow")
+# Abaixo disso o custo de subir processos não compensa: lê com um núcleo só
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+# Faixas por processo (faixas menores equilibram melhor a carga)
+RANGES_PER_WORKER = 4
+# Janela usada para contar aspas sem copiar o arquivo inteiro
+_QUOTE_WINDOW = 64 * 1024 * 1024
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+
+
+def available_engines() -> List[str]:
+    """Motores utilizáveis neste ambiente, na ordem de ENGINES."""
+    return [engine for engine in ENGINES if engine != "arrow" or arrow_available()]
+
+
+def _count_quotes(buffer: mmap.mmap, start: int, end: int) -> int:
+    count = 0
+    for position in range(start, end, _QUOTE_WINDOW):
+        count += buffer[position:min(position + _QUOTE_WINDOW, end)].count(b'"')
+    return count
+
+
+def _line_end(buffer: mmap.mmap, position: int, quoted: bool, state: List[int]) -> int:
+    """Início da próxima linha a partir de `position`, fora de aspas (-1 no fim).
+
+    `state` = [posição já contada, paridade das aspas até ela]; aspas
+    dobradas ("") não mudam a paridade, então a contagem simples basta.
+    """
+    newline = buffer.find(b"\n", position)
+    while newline != -1:
+        if not quoted:
+            return newline + 1
+        state[1] ^= _count_quotes(buffer, state[0], newline + 1) & 1
+        state[0] = newline + 1
+        if state[1] == 0:
+            return newline + 1
+        newline = buffer.find(b"\n", newline + 1)
+    return -1
+
+
+def split_ranges(buffer: mmap.mmap, parts: int) -> Tuple[int, List[Tuple[int, int]]]:
+    """Fim do cabeçalho e as faixas (início, fim) alinhadas a fim de linha."""
+    size = len(buffer)
+    quoted = buffer.find(b'"') != -1
+    state = [0, 0]
+    data_start = _line_end(buffer, 0, quoted, state)
+    if data_start == -1:
+        return size, []
+    bounds = [data_start]
+    step = max((size - data_start) // max(parts, 1), 1)
+    for index in range(1, parts):
+        target = max(data_start + index * step, bounds[-1])
+        if quoted and target < state[0]:
+            target = state[0]
+        position = _line_end(buffer, target, quoted, state)
+        if position == -1 or position >= size:
+            break
+        if position > bounds[-1]:
+            bounds.append(position)
+    bounds.append(size)
+    return data_start, [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i + 1] > bounds[i]]
+
+
+def _parse_range(file_path: str, start: int, end: int, names: List[str], text_columns: Sequence[str]) -> pd.DataFrame:
+    """Executado no processo do pool: lê uma faixa de bytes do CSV."""
+    with open(file_path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        data = buffer[start:end]
+    dtype: Optional[Dict[str, type]] = {name: str for name in text_columns} or None
+    return pd.read_csv(io.BytesIO(data), header=None, names=names, dtype=dtype)
+
+
+def _kind(series: pd.Series) -> Optional[str]:
+    """Classe do dtype de uma parte (None se a parte não tem valores)."""
+    if series.isna().all():
+        return None
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return "number"
+    return "text"
+
+
+def _mixed_columns(parts: Sequence[pd.DataFrame]) -> Set[str]:
+    """Colunas lidas com tipos incompatíveis em faixas diferentes."""
+    mixed: Set[str] = set()
+    for name in parts[0].columns:
+        kinds = {_kind(part[name]) for part in parts} - {None}
+        if len(kinds) > 1:
+            mixed.add(name)
+    return mixed
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Pool reaproveitado entre cargas ("spawn": seguro com threads do Qt)."""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _executor_workers = workers
+    return _executor
+
+
+def _run_ranges(
+    file_path: str,
+    ranges: Sequence[Tuple[int, int]],
+    names: List[str],
+    text_columns: Sequence[str],
+    workers: int,
+    on_progress: Optional[Callable[[int], None]],
+    done_before: int,
+) -> List[pd.DataFrame]:
+    executor = _get_executor(workers)
+    futures: Dict[Future, int] = {
+        executor.submit(_parse_range, file_path, start, end, names, list(text_columns)): index
+        for index, (start, end) in enumerate(ranges)
+    }
+    parts: List[Optional[pd.DataFrame]] = [None] * len(ranges)
+    done = done_before
+    pending = set(futures)
+    try:
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = futures[future]
+                parts[index] = future.result()
+                done += ranges[index][1] - ranges[index][0]
+            if on_progress is not None:
+                # Pode levantar (cancelamento): as faixas ainda na fila são descartadas
+                on_progress(done)
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+    return parts  # type: ignore[return-value]
+
+
+def read_csv_parallel(
+    file_path: str,
+    workers: Optional[int] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> pd.DataFrame:
+    """Lê o CSV inteiro em faixas paralelas; mesmos tipos que `pd.read_csv`."""
+    workers = max(int(workers or os.cpu_count() or 1), 1)
+    with open(file_path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return pd.read_csv(file_path)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            data_start, ranges = split_ranges(buffer, workers * RANGES_PER_WORKER)
+            header = buffer[:data_start]
+    names = list(pd.read_csv(io.BytesIO(header), nrows=0).columns)
+    if not ranges:
+        return pd.read_csv(io.BytesIO(header))
+
+    parts = _run_ranges(file_path, ranges, names, (), workers, on_progress, data_start)
+    mixed = _mixed_columns(parts)
+    if mixed:
+        # Uma faixa viu só números e outra viu texto: a leitura única daria
+        # texto para a coluna toda, então essas colunas são relidas como str
+        parts = _run_ranges(file_path, ranges, names, sorted(mixed), workers, None, data_start)
+    dataframe = pd.concat(parts, ignore_index=True)
+    for name in names:
+        if dataframe[name].dtype == object:
+            kinds = {_kind(part[name]) for part in parts} - {None}
+            if kinds == {"text"}:
+                # Faixas sem valores vêm como float64 vazio; volta ao dtype de texto
+                dataframe[name] = dataframe[name].astype("str")
+    return dataframe
+
+
+def read_csv_with_engine(
+    handle,
+    file_path: str,
+    engine: str = "single",
+    on_progress: Optional[Callable[[int], None]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """Lê o CSV com o motor escolhido ("single", "parallel" ou "arrow").
+
+    `dtype` (ex.: {"cidade": "category"}, vindo de memory_plan) vale nos
+    motores single e arrow; o paralelo lê sem ele. As categorias lidas
+    assim ficam na ordem de aparição, como na compactação.
+    """
+    if engine == "arrow":
+        if not arrow_available():
+            raise RuntimeError("Motor 'arrow' indisponível: instale o pacote pyarrow")
+        return _in_appearance_order(pd.read_csv(handle, engine="pyarrow", dtype=dtype), dtype)
+    if engine == "parallel" and os.path.getsize(file_path) >= PARALLEL_MIN_BYTES and detect_file(file_path) is None:
+        return read_csv_parallel(file_path, on_progress=on_progress)
+    if engine not in ENGINES:
+        raise ValueError(f"Motor de leitura desconhecido: {engine}")
+    return _in_appearance_order(pd.read_csv(handle, dtype=dtype), dtype)
+
+
+def _in_appearance_order(dataframe: pd.DataFrame, dtype: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """Reordena as colunas lidas como "category": o parser ordena as categorias.
+
+    Sem isto o domínio nominal exportado dependeria do modo escolhido pelo
+    orçamento de memória (memory_plan).
+    """
+    from compaction import in_appearance_order
+
+    for name, kind in (dtype or {}).items():
+        if kind == "category" and name in dataframe.columns:
+            dataframe[name] = in_appearance_order(dataframe[name])
+    return dataframe
+
+
+def _benchmark(file_path: str, workers: Optional[int]) -> None:
+    size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    print(f"{file_path}: {size_mb:.1f} MB, {os.cpu_count()} núcleos")
+    reference: Optional[pd.DataFrame] = None
+    baseline = 0.0
+    for engine in available_engines():
+        start = time.perf_counter()
+        if engine == "parallel":
+            dataframe = read_csv_parallel(file_path, workers=workers)
+        else:
+            with io.TextIOWrapper(open_input(file_path), encoding="utf-8") as handle:
+                dataframe = read_csv_with_engine(handle, file_path, engine)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference, baseline = dataframe, elapsed
+        same = dataframe.equals(reference) and list(dataframe.dtypes) == list(reference.dtypes)
+        print(f"  {engine:<9} {elapsed:7.2f} s  {baseline / elapsed:5.2f}x  {size_mb / elapsed:8.1f} MB/s  igual={same}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("uso: python csv_parallel.py arquivo.csv [--workers N]")
+        sys.exit(1)
+    _workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+    _benchmark(sys.argv[1], _workers)
@@ -0,0 +1,175 @@
+"""Conversão CSV→ARFF em fluxo, sem montar o DataFrame do arquivo inteiro.
+
+Para arquivos maiores que a memória (modo janela) o caminho
+`loadCsv` → DataFrame → `saveMetadata` não serve. Aqui são duas passadas
+em blocos de `chunk_rows` linhas, com memória proporcional ao bloco:
+
+1. `plan_columns` lê só as colunas que precisam (nominais e numéricas):
+   monta o domínio de cada nominal (até o teto; acima dele o atributo vira
+   STRING, como em `arff_schema.build_attributes`) e descobre o dtype que
+   cada numérica teria na leitura completa (int64 só se todos os blocos
+   forem inteiros; senão float64). Sem colunas desses tipos, é pulada.
+2. `write_arff_stream` escreve o cabeçalho e relê o arquivo com esses
+   dtypes fixos, formatando cada bloco com `arff_io.format_rows` (no
+   formato esparso quando pedido; no automático, decidido bloco a bloco).
+
+Nominais e textos são lidos como texto nas duas passadas: o domínio
+declarado e os valores do `@data` saem exatamente como estão no arquivo.
+O progresso de cada passada vai para `on_progress(passada, bytes, total)`,
+em bytes do arquivo em disco (comprimido, se for o caso: compressed_io).
+`write_parquet_stream` faz o mesmo caminho gravando Parquet (columnar_io).
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from arff_io import Attribute, format_rows, open_output, resolve_sparse, write_header
+from compressed_io import decompressed
+from arff_schema import TYPE_TO_ARFF
+
+# Linhas por bloco nas duas passadas
+STREAM_CHUNK_ROWS = 100_000
+
+# (passada, bytes lidos do arquivo, tamanho do arquivo)
+Progress = Callable[[int, int, int], None]
+
+
+def _numeric_dtype(kinds: Set[str]) -> Any:
+    """dtype que a leitura completa daria a partir dos dtypes de cada bloco."""
+    if kinds == {"i"}:
+        return "int64"
+    if kinds == {"u"}:
+        return "uint64"
+    if kinds and kinds <= set("iuf"):
+        return "float64"
+    if kinds == {"b"}:
+        return "bool"
+    # Texto em algum bloco ("3,5", "n/d"): fica texto e o escritor converte
+    return str
+
+
+def _sorted_domain(values: List[str]) -> List[str]:
+    """Domínio ordenado: numérico se todos os valores forem números, senão texto."""
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+    if len(values) and not numbers.isna().any():
+        return [values[i] for i in np.argsort(numbers.to_numpy(), kind="stable")]
+    return sorted(values)
+
+
+def plan_columns(
+    file_path: str,
+    chosen_types: Sequence[Tuple[str, str]],
+    max_nominal: Optional[int],
+    sort_nominal: bool = False,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+    on_progress: Optional[Progress] = None,
+) -> Tuple[List[Attribute], Dict[str, Any], List[str]]:
+    """Primeira passada: (atributos, dtypes da segunda passada, nominais que viraram STRING)."""
+    nominal = {name for name, label in chosen_types if label == 'Nominal'}
+    numeric = {name for name, label in chosen_types if label == 'Numérico'}
+    domains: Dict[str, Dict[str, None]] = {name: {} for name in nominal}
+    kinds: Dict[str, Set[str]] = {name: set() for name in numeric}
+    fallbacks: Set[str] = set()
+    if nominal or numeric:
+        total = os.path.getsize(file_path)
+        with open(file_path, "rb") as raw, pd.read_csv(
+            decompressed(raw),
+            usecols=list(nominal | numeric),
+            dtype={name: str for name in nominal},
+            chunksize=chunk_rows,
+        ) as reader:
+            for chunk in reader:
+                for name in nominal - fallbacks:
+                    values = chunk[name].dropna()
+                    # dict como conjunto ordenado: ordem da primeira aparição
+                    domains[name].update(dict.fromkeys(pd.unique(values[values != ""].to_numpy(dtype=object))))
+                    if max_nominal is not None and len(domains[name]) > max_nominal:
+                        fallbacks.add(name)
+                        domains[name].clear()
+                for name in numeric:
+                    kinds[name].add(chunk[name].dtype.kind)
+                if on_progress is not None:
+                    on_progress(1, raw.tell(), total)
+    attributes: List[Attribute] = []
+    dtypes: Dict[str, Any] = {}
+    for name, label in chosen_types:
+        if name in nominal and name not in fallbacks and domains[name]:
+            values = list(domains[name])
+            attributes.append((name, _sorted_domain(values) if sort_nominal else values))
+        elif name in nominal:
+            attributes.append((name, 'STRING'))
+        else:
+            attributes.append((name, TYPE_TO_ARFF.get(label, 'STRING')))
+        dtypes[name] = _numeric_dtype(kinds[name]) if name in numeric else str
+    return attributes, dtypes, [name for name, _ in chosen_types if name in fallbacks]
+
+
+def write_arff_stream(
+    file_path: str,
+    output_path: str,
+    relation: str,
+    attributes: Sequence[Attribute],
+    dtypes: Dict[str, Any],
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+    on_progress: Optional[Progress] = None,
+    sparse: Optional[bool] = False,
+) -> int:
+    """Segunda passada: cabeçalho + `@data` bloco a bloco; retorna o número de linhas.
+
+    Com `sparse=None` cada bloco escolhe o próprio formato (`resolve_sparse`):
+    o ARFF aceita linhas densas e esparsas misturadas.
+    """
+    total = os.path.getsize(file_path)
+    written = 0
+    with open_output(output_path) as handle, open(file_path, "rb") as raw, pd.read_csv(
+        decompressed(raw), dtype=dtypes, chunksize=chunk_rows
+    ) as reader:
+        write_header(handle, relation, attributes)
+        for chunk in reader:
+            lines = format_rows(chunk, attributes, resolve_sparse(chunk, attributes, sparse))
+            if lines:
+                handle.write("\n".join(lines))
+                handle.write("\n")
+            written += len(lines)
+            if on_progress is not None:
+                on_progress(2, raw.tell(), total)
+    return written
+
+
+def write_parquet_stream(
+    file_path: str,
+    output_path: str,
+    chosen_types: Sequence[Tuple[str, str]],
+    sort_nominal: bool = False,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+    on_progress: Optional[Progress] = None,
+) -> int:
+    """CSV→Parquet nas mesmas duas passadas; retorna o número de linhas.
+
+    A primeira passada dá o domínio completo de cada nominal (o Parquet não
+    tem o teto do ARFF) e os dtypes; a segunda grava um row group por bloco
+    (columnar_io.write_parquet).
+    """
+    from columnar_io import arrow_schema, require_pyarrow, write_parquet
+
+    require_pyarrow()
+    attributes, dtypes, _ = plan_columns(file_path, chosen_types, None, sort_nominal, chunk_rows, on_progress)
+    specs = [
+        (name, label, list(type_) if isinstance(type_, list) else None)
+        for (name, label), (_, type_) in zip(chosen_types, attributes)
+    ]
+    schema = arrow_schema(specs, [np.dtype(object if dtypes[name] is str else dtypes[name]) for name, _ in chosen_types])
+    total = os.path.getsize(file_path)
+
+    def chunks():
+        with open(file_path, "rb") as raw, pd.read_csv(decompressed(raw), dtype=dtypes, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                yield chunk
+                if on_progress is not None:
+                    on_progress(2, raw.tell(), total)
+
+    return write_parquet(output_path, specs, schema, chunks())
@@ -0,0 +1,64 @@
+"""Exportação da base em memória (ARFF e Parquet), comum aos controladores.
+
+`CSVController`, `ARFFController` e `ParquetController` gravam o DataFrame
+carregado do mesmo jeito: atributos (arff_schema), formato esparso ou não
+(arff_io.resolve_sparse) e escrita em blocos, com as etapas medidas. Cada
+função devolve as estatísticas que vão para `stats.export`; o controlador
+só escolhe os tipos, emite a mensagem e trata o modo janela (exportação
+em fluxo, que não passa por aqui).
+"""
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple
+
+from instrumentation import load_stats, span
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def export_arff(
+    output_path: str,
+    relation: str,
+    dataframe: Optional[pd.DataFrame],
+    chosen_types: Sequence[Tuple[str, str]],
+    max_nominal: Optional[int],
+    sort_nominal: bool = False,
+    sparse_mode: Optional[bool] = None,
+) -> Tuple[Dict[str, Any], str]:
+    """Grava o ARFF; retorna (estatísticas, complemento da mensagem de sucesso).
+
+    O complemento avisa do formato esparso e dos nominais que passaram do
+    teto e foram gravados como STRING ("" se nada disso aconteceu).
+    """
+    from arff_io import resolve_sparse, write_arff
+    from arff_schema import build_attributes, fallback_warning
+
+    started, timings = time.perf_counter(), []
+    with span("schema", timings):
+        attributes, fallbacks = build_attributes(dataframe, chosen_types, max_nominal, sort_nominal)
+    with span("sparsity", timings):
+        sparse = resolve_sparse(dataframe, attributes, sparse_mode)
+    # Cabeçalho + @data gravados em blocos, direto no arquivo
+    with span("write", timings, file=output_path):
+        write_arff(output_path, relation, attributes, dataframe, sparse=sparse)
+    # ARFF sem instâncias: o ARFFController guarda None no lugar do DataFrame
+    rows = 0 if dataframe is None else len(dataframe)
+    stats = load_stats(timings, time.perf_counter() - started, rows, file=output_path, sparse=sparse)
+    return stats, (" (formato esparso)" if sparse else "") + fallback_warning(fallbacks, max_nominal)
+
+
+def export_parquet(
+    output_path: str,
+    dataframe: pd.DataFrame,
+    chosen_types: Sequence[Tuple[str, str]],
+    sort_nominal: bool = False,
+) -> Dict[str, Any]:
+    """Grava o Parquet com os tipos da página 3 (columnar_io); retorna as estatísticas."""
+    from columnar_io import export_dataframe
+
+    started, timings = time.perf_counter(), []
+    with span("write", timings, file=output_path):
+        rows = export_dataframe(output_path, dataframe, chosen_types, sort_nominal)
+    return load_stats(timings, time.perf_counter() - started, rows, file=output_path, format="parquet")
@@ -0,0 +1,125 @@
+"""Logging e medição de tempo por etapa (leitura, perfis, modelo, exportação).
+
+Os módulos registram mensagens com `logging` (`log = logging.getLogger(__name__)`)
+e formatação preguiçosa (`log.debug("... %s", valor)`): abaixo do nível
+configurado a mensagem nem é montada. `configure_logging` define o nível
+(padrão WARNING, ou $MIDAS_LOG_LEVEL) e, opcionalmente, um arquivo de trace.
+
+`span(nome, timings, **campos)` mede uma etapa: registra a duração em DEBUG,
+acrescenta (nome, segundos) à lista `timings` (que o controlador transforma
+na propriedade `stats` do QML) e, com trace ligado, guarda o evento no
+formato Trace Event do Chrome (abre em chrome://tracing ou ui.perfetto.dev).
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+Timings = List[Tuple[str, float]]
+
+_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(threadName)s] %(message)s"
+
+
+def current_rss() -> Optional[int]:
+    """Memória residente do processo em bytes (Linux; None se indisponível)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> int:
+    """Pico de memória residente do processo em bytes (ru_maxrss)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class TraceRecorder:
+    """Eventos "X" (início + duração) de todas as threads, gravados em JSON no fim."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def add(self, name: str, started: float, seconds: float, fields: Dict[str, Any]) -> None:
+        event = {
+            "name": name,
+            "cat": "midas",
+            "ph": "X",
+            "ts": round((started - self._origin) * 1e6, 1),
+            "dur": round(seconds * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {key: value if isinstance(value, (int, float, bool)) else str(value)
+                     for key, value in fields.items()},
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def write(self) -> None:
+        with self._lock:
+            events = list(self._events)
+        try:
+            with open(self.path, "w", encoding="utf-8") as handle:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+        except OSError as e:
+            log.warning("Não foi possível gravar o trace em %s: %s", self.path, e)
+
+
+_trace: Optional[TraceRecorder] = None
+
+
+def configure_logging(level: Optional[str] = None, trace_path: Optional[str] = None) -> None:
+    """Nível do log (ex.: "DEBUG") e arquivo de trace; sem argumentos, usa o ambiente.
+
+    $MIDAS_LOG_LEVEL e $MIDAS_TRACE valem quando o argumento não é dado.
+    """
+    global _trace
+    name = (level or os.environ.get("MIDAS_LOG_LEVEL") or "WARNING").upper()
+    logging.basicConfig(level=getattr(logging, name, logging.WARNING), format=_LOG_FORMAT)
+    trace_path = trace_path or os.environ.get("MIDAS_TRACE")
+    if trace_path and _trace is None:
+        _trace = TraceRecorder(trace_path)
+        atexit.register(_trace.write)
+
+
+@contextmanager
+def span(name: str, timings: Optional[Timings] = None, **fields: Any) -> Iterator[None]:
+    """Mede o bloco: log em DEBUG, (nome, segundos) em `timings` e evento no trace."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        if timings is not None:
+            timings.append((name, seconds))
+        if _trace is not None:
+            _trace.add(name, started, seconds, fields)
+        log.debug("%s: %.1f ms %s", name, seconds * 1000, fields or "")
+
+
+def load_stats(timings: Timings, seconds: float, rows: int, **extra: Any) -> Dict[str, Any]:
+    """Resumo de um carregamento/exportação para a propriedade `stats` do QML."""
+    mb = 1024 * 1024
+    rss = current_rss()
+    return {
+        "seconds": round(seconds, 3),
+        "rows": rows,
+        "rowsPerSecond": round(rows / seconds) if seconds > 0 else 0,
+        "rssMb": round(rss / mb, 1) if rss is not None else None,
+        # ru_maxrss é atualizado pelo kernel com atraso: nunca abaixo do atual
+        "peakRssMb": round(max(peak_rss(), rss or 0) / mb, 1),
+        "stages": [{"name": stage, "ms": round(elapsed * 1000, 1)} for stage, elapsed in timings],
+        **extra,
+    }
@@ -0,0 +1,248 @@
+"""Modelo de tabela "em janela" para arquivos maiores que a memória.
+
+Em vez de manter um DataFrame inteiro, o `LazyFileModel` guarda apenas:
+- um índice esparso de offsets em bytes (um offset a cada `block_rows` linhas);
+- um LRU com os últimos blocos de linhas lidos (já formatados para exibição).
+
+O índice cresce conforme o usuário rola a tabela (`canFetchMore`/`fetchMore`),
+de modo que o consumo de memória fica limitado a
+`max_blocks * block_rows * colunas` células, qualquer que seja o arquivo.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from collections import OrderedDict
+from typing import List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+
+
+def _arff_header(file_path: str) -> tuple[List[str], int]:
+    """Lê o cabeçalho ARFF e retorna (nomes dos atributos, offset do 1º byte de @data)."""
+    names: List[str] = []
+    with open(file_path, "rb") as f:
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError("Seção @data não encontrada")
+            text = line.decode("utf-8").strip()
+            lower = text.lower()
+            if lower.startswith("@attribute"):
+                rest = text[len("@attribute"):].strip()
+                if rest[:1] in ("'", '"'):
+                    quote = rest[0]
+                    end = rest.index(quote, 1)
+                    names.append(rest[1:end])
+                else:
+                    names.append(rest.split(None, 1)[0])
+            elif lower.startswith("@data"):
+                return names, f.tell()
+
+
+def _csv_header(file_path: str) -> tuple[List[str], int]:
+    """Lê a linha de cabeçalho do CSV e retorna (nomes das colunas, offset dos dados)."""
+    with open(file_path, "rb") as f:
+        line = f.readline()
+        names = next(csv.reader([line.decode("utf-8-sig")]))
+        return names, f.tell()
+
+
+class LazyFileModel(QAbstractTableModel):
+    """QAbstractTableModel que pagina as linhas de um CSV/ARFF sob demanda.
+
+    - `kind`: "csv" ou "arff".
+    - `block_rows`: linhas por bloco (granularidade do índice e do cache).
+    - `max_blocks`: blocos mantidos no LRU; define o teto de memória.
+    - `fetch_blocks`: blocos indexados a cada `fetchMore`.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        kind: str = "csv",
+        block_rows: int = 1000,
+        max_blocks: int = 32,
+        fetch_blocks: int = 4,
+    ) -> None:
+        super().__init__()
+        self._file_path = file_path
+        self._kind = kind
+        self._block_rows = max(int(block_rows), 1)
+        self._max_blocks = max(int(max_blocks), 1)
+        self._fetch_blocks = max(int(fetch_blocks), 1)
+        if kind == "arff":
+            self._columns, data_offset = _arff_header(file_path)
+        else:
+            self._columns, data_offset = _csv_header(file_path)
+
+        # Índice: offset do início do bloco k; `_scan_pos` é onde a varredura parou
+        self._block_offsets: List[int] = [data_offset]
+        self._scan_pos = data_offset
+        self._rows_indexed = 0
+        # Linhas já publicadas para a view (rowCount); alcança _rows_indexed em fetchMore
+        self._rows_visible = 0
+        self._eof = False
+        self._cache: "OrderedDict[int, List[List[str]]]" = OrderedDict()
+        self._fetch_scheduled = False
+        # ARFF: valor implícito de cada coluna nas linhas esparsas (no 1º bloco)
+        self._sparse_defaults: Optional[List[Optional[str]]] = None
+
+        self._handle = open(file_path, "rb")
+        # Já deixa o primeiro trecho visível indexado
+        self._scan(self._fetch_blocks)
+        self._rows_visible = self._rows_indexed
+
+    # API de configuração
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def exhausted(self) -> bool:
+        """True quando o arquivo inteiro já foi indexado."""
+        return self._eof
+
+    def setCacheBlocks(self, max_blocks: int) -> None:
+        """Ajusta o tamanho do LRU (teto de memória) em tempo de execução."""
+        self._max_blocks = max(int(max_blocks), 1)
+        while len(self._cache) > self._max_blocks:
+            self._cache.popitem(last=False)
+
+    def close(self) -> None:
+        self._cache.clear()
+        if not self._handle.closed:
+            self._handle.close()
+
+    # Varredura do arquivo (construção incremental do índice)
+    def _isDataLine(self, line: bytes) -> bool:
+        if self._kind != "arff":
+            return bool(line.strip())
+        stripped = line.strip()
+        return bool(stripped) and not stripped.startswith(b"%")
+
+    def _scan(self, blocks: int) -> int:
+        """Indexa mais `blocks` blocos a partir de `_scan_pos`; retorna linhas novas."""
+        if self._eof:
+            return 0
+        target = self._rows_indexed + blocks * self._block_rows
+        handle = self._handle
+        handle.seek(self._scan_pos)
+        rows = self._rows_indexed
+        in_quotes = False
+        while rows < target:
+            line = handle.readline()
+            if not line:
+                self._eof = True
+                break
+            # Aspas ímpares abrem/fecham um campo com quebra de linha (CSV)
+            if self._kind == "csv" and line.count(b'"') % 2 == 1:
+                in_quotes = not in_quotes
+            if in_quotes or not self._isDataLine(line):
+                continue
+            rows += 1
+            if rows % self._block_rows == 0:
+                self._block_offsets.append(handle.tell())
+        self._scan_pos = handle.tell()
+        # O último bloco parcial pode ter ganhado linhas: invalida o cache dele
+        self._cache.pop(self._rows_indexed // self._block_rows, None)
+        added = rows - self._rows_indexed
+        self._rows_indexed = rows
+        return added
+
+    # Leitura de blocos
+    def _parseLines(self, text: str) -> List[List[str]]:
+        if self._kind == "arff":
+            # Import adiado: arff_io traz o pandas (ver startup.py)
+            from arff_io import _sparse_defaults, parse_data_line, read_header
+
+            if self._sparse_defaults is None:
+                # Colunas omitidas valem o mesmo que na leitura completa:
+                # 0, o primeiro valor declarado (nominal) ou "" (texto)
+                with open(self._file_path, encoding="utf-8") as header:
+                    _, attributes, _ = read_header(header)
+                self._sparse_defaults = _sparse_defaults(attributes)
+            rows: List[List[str]] = []
+            for line in text.splitlines():
+                stripped = line.strip()
+                if not stripped or stripped.startswith("%"):
+                    continue
+                rows.append(["" if v is None else v for v in parse_data_line(stripped, self._sparse_defaults)])
+            return rows
+        return [row for row in csv.reader(io.StringIO(text)) if row]
+
+    def _block(self, block: int) -> List[List[str]]:
+        cached = self._cache.get(block)
+        if cached is not None:
+            self._cache.move_to_end(block)
+            return cached
+        start = self._block_offsets[block]
+        end = self._block_offsets[block + 1] if block + 1 < len(self._block_offsets) else self._scan_pos
+        self._handle.seek(start)
+        rows = self._parseLines(self._handle.read(end - start).decode("utf-8"))
+        self._cache[block] = rows
+        if len(self._cache) > self._max_blocks:
+            self._cache.popitem(last=False)
+        return rows
+
+    # Tamanho
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        if parent.isValid():
+            return 0
+        return self._rows_visible
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+
+    # Paginação
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:  # type: ignore[override]
+        return not parent.isValid() and not self._eof
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:  # type: ignore[override]
+        self._fetch_scheduled = False
+        if parent.isValid() or self._eof:
+            return
+        # Indexa primeiro e só então publica as linhas novas para a view
+        added = self._scan(self._fetch_blocks)
+        if added <= 0:
+            return
+        first = self._rows_visible
+        self.beginInsertRows(QModelIndex(), first, first + added - 1)
+        self._rows_visible = self._rows_indexed
+        self.endInsertRows()
+
+    # Dados por célula
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = index.row()
+        if row >= self._rows_visible:
+            return ""
+        # Nem toda view chama fetchMore sozinha (ex.: TableView do QML): ao chegar
+        # perto do fim do trecho indexado, agenda mais uma varredura
+        if not self._eof and not self._fetch_scheduled and row >= self._rows_visible - self._block_rows:
+            self._fetch_scheduled = True
+            QTimer.singleShot(0, self.fetchMore)
+        rows = self._block(row // self._block_rows)
+        offset = row % self._block_rows
+        if offset >= len(rows):
+            return ""
+        values = rows[offset]
+        column = index.column()
+        return values[column] if column < len(values) else ""
+
+    # Cabeçalhos
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if 0 <= section < len(self._columns):
+                return self._columns[section]
+            return ""
+        return str(section + 1)
+
+    # Nome do papel para o QML ("display")
+    def roleNames(self):  # type: ignore[override]
+        return {Qt.DisplayRole: b"display"}
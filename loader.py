@@ -0,0 +1,272 @@
+"""Carregamento de arquivos em segundo plano para os controladores.
+
+O parse (pandas / arff_io) roda em um QRunnable do QThreadPool global e
+o resultado volta para a thread da interface por sinais enfileirados
+(queued connections). Assim o QML continua respondendo enquanto um arquivo
+grande é lido, mostra uma barra de progresso real e permite cancelar.
+
+Arquivos comprimidos (gzip, bz2, xz, zstd) são descomprimidos em fluxo
+(compressed_io) por cima do leitor que conta os bytes: o progresso segue
+os bytes comprimidos lidos do disco.
+"""
+from __future__ import annotations
+
+import io
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from compressed_io import decompressed
+
+
+class LoadCancelled(Exception):
+    """Levantada dentro do worker quando o usuário cancela o carregamento."""
+
+
+class _ProgressReader(io.RawIOBase):
+    """Arquivo binário que conta os bytes lidos e verifica o cancelamento.
+
+    Os parsers (pandas C engine, arff_io) só enxergam um arquivo comum; a
+    cada bloco lido avisamos o progresso e, se o usuário cancelou, abortamos
+    a leitura levantando `LoadCancelled`.
+    """
+
+    def __init__(self, raw: io.RawIOBase, on_read: Callable[[int], None], cancel_event: threading.Event) -> None:
+        super().__init__()
+        self._raw = raw
+        self._on_read = on_read
+        self._cancel_event = cancel_event
+        self._bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        if self._cancel_event.is_set():
+            raise LoadCancelled()
+        count = self._raw.readinto(buffer)
+        if count:
+            self._bytes_read += count
+            self._on_read(self._bytes_read)
+        return count
+
+    def mark(self, position: int) -> None:
+        """Progresso informado pelo parser quando ele não lê por este arquivo."""
+        if self._cancel_event.is_set():
+            raise LoadCancelled()
+        self._on_read(position)
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
+
+class _ProgressText(io.TextIOWrapper):
+    """Texto do arquivo (descomprimido se preciso) com acesso ao leitor de progresso."""
+
+    progress_reader: _ProgressReader
+
+
+def open_with_progress(
+    file_path: str,
+    on_read: Callable[[int], None],
+    cancel_event: threading.Event,
+    encoding: str = "utf-8",
+) -> io.TextIOWrapper:
+    """Abre `file_path` em modo texto reportando bytes lidos em `on_read`."""
+    raw = open(file_path, "rb", buffering=0)
+    reader = _ProgressReader(raw, on_read, cancel_event)
+    # Comprimido: a descompressão roda numa thread, à frente do parser
+    handle = _ProgressText(decompressed(io.BufferedReader(reader, buffer_size=1 << 20), threaded=True), encoding=encoding)
+    handle.progress_reader = reader
+    return handle
+
+
+def report_progress(handle: io.TextIOWrapper, position: int) -> None:
+    """Informa `position` bytes processados e verifica o cancelamento.
+
+    Para parsers que leem o arquivo por outro caminho (ex.: processos
+    paralelos sobre um mmap) e não pelo `handle` recebido do LoadTask.
+    """
+    reader = getattr(handle, "progress_reader", None)
+    if isinstance(reader, _ProgressReader):
+        reader.mark(position)
+
+
+class _TaskSignals(QObject):
+    """Sinais do LoadTask (QRunnable não é QObject e não pode emitir sinais)."""
+
+    # Os inteiros vão como `object` para não estourar o int de 32 bits do Qt
+    progress = Signal(int, object, object)  # geração, bytes lidos, bytes totais
+    finished = Signal(int, object)  # geração, resultado do parse
+    failed = Signal(int, str)
+    cancelled = Signal(int)
+
+
+class LoadTask(QRunnable):
+    """Executa `parse(handle)` sobre o arquivo em uma thread do pool."""
+
+    # Evita inundar a fila de eventos: no máximo um aviso a cada 0,5% do arquivo
+    _PROGRESS_STEP = 0.005
+
+    def __init__(self, generation: int, file_path: str, parse: Callable[[io.TextIOWrapper], Any]) -> None:
+        super().__init__()
+        # O objeto Python é mantido pelo BackgroundLoader; o pool não deve apagá-lo
+        self.setAutoDelete(False)
+        self.signals = _TaskSignals()
+        self._generation = generation
+        self._file_path = file_path
+        self._parse = parse
+        self._cancel_event = threading.Event()
+        self._total = max(os.path.getsize(file_path), 1)
+        self._last_reported = 0
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def _report(self, bytes_read: int) -> None:
+        if bytes_read - self._last_reported >= self._total * self._PROGRESS_STEP or bytes_read >= self._total:
+            self._last_reported = bytes_read
+            self._emit(self.signals.progress, self._generation, bytes_read, self._total)
+
+    def run(self) -> None:
+        try:
+            with open_with_progress(self._file_path, self._report, self._cancel_event) as handle:
+                result = self._parse(handle)
+            if self._cancel_event.is_set():
+                raise LoadCancelled()
+        except LoadCancelled:
+            self._emit(self.signals.cancelled, self._generation)
+        except Exception as e:
+            self._emit(self.signals.failed, self._generation, str(e))
+        else:
+            self._emit(self.signals.finished, self._generation, result)
+
+    @staticmethod
+    def _emit(signal, *args) -> None:
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            # Aplicação encerrando: o QObject dos sinais já foi destruído
+            pass
+
+
+class BackgroundLoader(QObject):
+    """Gerencia um carregamento por vez: progresso, cancelamento e resultado.
+
+    Cada `start()` recebe uma nova geração; sinais de tarefas anteriores
+    (canceladas ou substituídas) são ignorados.
+    """
+
+    progressChanged = Signal()
+    loadingChanged = Signal()
+    finished = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._task: Optional[LoadTask] = None
+        # Tarefas ainda rodando no pool (inclusive canceladas) e a última
+        # encerrada: o pool ainda toca no QRunnable logo após run() retornar
+        self._running: Dict[int, LoadTask] = {}
+        self._retired: Optional[LoadTask] = None
+        self._generation = 0
+        self._bytes_read = 0
+        self._bytes_total = 0
+        # Desligado, o parse roda na thread chamadora (útil em scripts/headless)
+        self.background = True
+
+    @property
+    def loading(self) -> bool:
+        return self._task is not None
+
+    @property
+    def progress(self) -> float:
+        if self._bytes_total <= 0:
+            return 0.0
+        return min(self._bytes_read / self._bytes_total, 1.0)
+
+    @property
+    def bytesRead(self) -> int:
+        return self._bytes_read
+
+    @property
+    def bytesTotal(self) -> int:
+        return self._bytes_total
+
+    def start(self, file_path: str, parse: Callable[[io.TextIOWrapper], Any]) -> None:
+        """Inicia o parse de `file_path`, cancelando um carregamento anterior."""
+        self.cancel()
+        self._generation += 1
+        task = LoadTask(self._generation, file_path, parse)
+        task.signals.progress.connect(self._onProgress)
+        task.signals.finished.connect(self._onFinished)
+        task.signals.failed.connect(self._onFailed)
+        task.signals.cancelled.connect(self._onCancelled)
+        self._task = task
+        self._running[self._generation] = task
+        self._bytes_read = 0
+        self._bytes_total = 0
+        self.loadingChanged.emit()
+        self.progressChanged.emit()
+        if self.background:
+            QThreadPool.globalInstance().start(task)
+        else:
+            task.run()
+
+    def cancel(self) -> None:
+        """Pede o cancelamento da tarefa atual (se houver)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._finish()
+        self.cancelled.emit()
+
+    def _finish(self) -> None:
+        self._task = None
+        self.loadingChanged.emit()
+
+    def _isCurrent(self, generation: int) -> bool:
+        return self._task is not None and generation == self._generation
+
+    def _retire(self, generation: int) -> bool:
+        """Tira a tarefa da lista de execução; retorna se ela ainda é a atual."""
+        task = self._running.pop(generation, None)
+        if task is not None:
+            self._retired = task
+        return self._isCurrent(generation)
+
+    @Slot(int, object, object)
+    def _onProgress(self, generation: int, bytes_read: int, bytes_total: int) -> None:
+        if not self._isCurrent(generation):
+            return
+        self._bytes_read = int(bytes_read)
+        self._bytes_total = int(bytes_total)
+        self.progressChanged.emit()
+
+    @Slot(int, object)
+    def _onFinished(self, generation: int, result: Any) -> None:
+        if not self._retire(generation):
+            return
+        self._bytes_read = self._bytes_total
+        self.progressChanged.emit()
+        self._finish()
+        self.finished.emit(result)
+
+    @Slot(int, str)
+    def _onFailed(self, generation: int, message: str) -> None:
+        if not self._retire(generation):
+            return
+        self._finish()
+        self.failed.emit(message)
+
+    @Slot(int)
+    def _onCancelled(self, generation: int) -> None:
+        # cancel() já limpou o estado; só tratamos cancelamentos ainda correntes
+        if not self._retire(generation):
+            return
+        self._finish()
+        self.cancelled.emit()
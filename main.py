@@ -1,18 +1,49 @@
 import sys
 import os
+
+# Primeiro import: marca o início da partida (ver startup.py)
+from startup import BackendWarmUp, StartupReport
+from instrumentation import configure_logging
+
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from PySide6.QtQml import QQmlApplicationEngine, qmlRegisterType
 
+# Leves: pandas e os módulos de dados só entram no primeiro carregamento ou no aquecimento
 from csv_controller import CSVController
 from arff_controller import ARFFController
+from parquet_controller import ParquetController
+from parse_cache import default_cache
+
+
+def _take_option(name: str):
+    """Remove `--nome valor` de sys.argv (o resto vai para o Qt) e devolve o valor."""
+    if name not in sys.argv:
+        return None
+    index = sys.argv.index(name)
+    value = sys.argv[index + 1] if index + 1 < len(sys.argv) else None
+    del sys.argv[index:index + 2]
+    return value
 
 
 def main() -> int:
+    # --log-level DEBUG e --trace arquivo.json (ou $MIDAS_LOG_LEVEL / $MIDAS_TRACE)
+    configure_logging(_take_option("--log-level"), _take_option("--trace"))
+
+    # --startup-report: imprime os tempos da partida e encerra
+    report = StartupReport() if "--startup-report" in sys.argv else None
+    if report is not None:
+        sys.argv.remove("--startup-report")
+        report.mark("imports (PySide6 + controladores)")
+
     app = QApplication(sys.argv)
+    if report is not None:
+        report.mark("QApplication criada")
 
     # Disponibiliza controladores no QML via: import App 1.0
     qmlRegisterType(CSVController, "App", 1, 0, "CSVController")
     qmlRegisterType(ARFFController, "App", 1, 0, "ARFFController")
+    qmlRegisterType(ParquetController, "App", 1, 0, "ParquetController")
 
     engine = QQmlApplicationEngine()
     qml_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.qml")
@@ -21,9 +52,36 @@ def main() -> int:
     if not engine.rootObjects():
         print("Erro: não foi possível carregar a interface QML.")
         return 1
+    if report is not None:
+        report.mark("QML carregado")
+
+    # Com a janela na tela, o backend de dados é importado em segundo plano
+    warm_up = BackendWarmUp(report)
+    window = engine.rootObjects()[0]
+
+    def on_first_frame() -> None:
+        window.frameSwapped.disconnect(on_first_frame)
+        if report is not None:
+            report.mark("primeiro quadro")
+            report.record_loaded_modules()
+        warm_up.start()
+
+    window.frameSwapped.connect(on_first_frame)
+
+    if report is not None:
+        def finish_report() -> None:
+            print(report.render())
+            app.quit()
+
+        warm_up.finished.connect(finish_report)
+        # Sem quadro (ex.: janela oculta), aquece mesmo assim para fechar o relatório
+        QTimer.singleShot(5000, warm_up.start)
 
-    return app.exec()
+    code = app.exec()
+    # Tipos escolhidos no último instante ainda podem estar indo para o cache
+    default_cache().flush()
+    return code
 
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -41,6 +41,21 @@ ApplicationWindow {
         }
     }
 
+    // Parquet, Feather e Arrow IPC (pyarrow opcional)
+    ParquetController {
+        id: parquetController
+        onErrorOccurred: function(message) {
+            messageDialog.title = "Erro"
+            messageDialog.text = message
+            messageDialog.open()
+        }
+        onSuccessOccurred: function(message) {
+            messageDialog.title = "Sucesso"
+            messageDialog.text = message
+            messageDialog.open()
+        }
+    }
+
     MessageDialog {
         id: messageDialog
         text: ""
@@ -59,22 +74,19 @@ ApplicationWindow {
                 if (item && item.hasOwnProperty("arffController")) {
                     item.arffController = arffController
                 }
+                if (item && item.hasOwnProperty("parquetController")) {
+                    item.parquetController = parquetController
+                }
                 if (item && item.hasOwnProperty("onDataLoaded")) {
                     // Se a página 1 expor um callback, conectamos para navegar
                     item.onDataLoaded = function(fileType) {
-                        if (fileType === "csv") {
-                            nav.push("page2.qml", { 
-                                "csvController": csvController, 
-                                "arffController": arffController,
-                                "stack": nav,
-                                "fileType": "csv"
-                            })
-                        } else if (fileType === "arff") {
+                        if (fileType === "csv" || fileType === "arff" || fileType === "parquet") {
                             nav.push("page2.qml", { 
                                 "csvController": csvController, 
                                 "arffController": arffController,
+                                "parquetController": parquetController,
                                 "stack": nav,
-                                "fileType": "arff"
+                                "fileType": fileType
                             })
                         }
                     }
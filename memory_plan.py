@@ -0,0 +1,274 @@
+"""Escolha do modo de carregamento pela memória, antes de ler o arquivo.
+
+Abrir um arquivo maior que a memória com `loadCsv`/`loadArff` fazia o
+processo ser encerrado pelo sistema (OOM) no meio da leitura. Antes da
+leitura completa, `plan_load` (executado no worker do BackgroundLoader):
+
+1. lê só o início do arquivo (`SAMPLE_BYTES`, descomprimido se preciso)
+   e o interpreta como a leitura de verdade (pandas / arff_io);
+2. estima as linhas pela fração do arquivo que a amostra ocupou e os
+   bytes por linha de cada coluna (`memory_usage(deep=True)`, que conta
+   os objetos Python do texto), com e sem compactação (compaction);
+3. compara o pico previsto (`peak_bytes`: DataFrame, cópias da leitura e,
+   no ARFF, o bloco de texto em análise) com o
+   orçamento: o definido pelo usuário ou `BUDGET_FRACTION` da memória
+   disponível (MemAvailable, limitado pelo cgroup em contêineres).
+
+Modos: "eager" (leitura completa), "compact" (dtypes compactos; no CSV o
+texto repetitivo já é lido como Categorical, o que baixa o próprio pico)
+e "lazy" (modo janela: amostra + LazyFileModel). Quando nem o modo janela
+é possível (arquivo comprimido), a leitura é recusada com a estimativa na
+mensagem, em vez de esgotar a memória. O plano volta no resultado do
+parse e vai para `stats.load`, ao lado do pico real de RSS: é assim que
+o benchmark confere o estimador.
+"""
+from __future__ import annotations
+
+import io
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Início do arquivo (já descomprimido) usado na estimativa
+SAMPLE_BYTES = 2 * 1024 * 1024
+# Pico da leitura: o DataFrame final mais (fator - 1) cópias rasas dele
+# (buffers do parser, blocos concatenados), medido com benchmark.py
+PEAK_FACTOR = {"csv": 2.0, "arff": 3.0}
+# ARFF: o bloco de texto em leitura e as listas do parser, em múltiplos
+# dos bytes do bloco no arquivo
+CHUNK_TEXT_FACTOR = 6.0
+# Orçamento padrão: fração da memória disponível no início da leitura
+BUDGET_FRACTION = 0.75
+# No modo completo o DataFrame pronto ocupa no máximo esta fração do
+# orçamento: o resto fica para ordenar/filtrar, estatísticas e exportação
+STEADY_FRACTION = 0.5
+
+Plan = Dict[str, Any]
+
+_MB = 1024 * 1024
+
+
+def _cgroup_available() -> Optional[int]:
+    """Limite do cgroup v2 menos o uso atual (None fora de contêiner/sem limite)."""
+    try:
+        with open("/sys/fs/cgroup/memory.max", encoding="ascii") as handle:
+            limit = handle.read().strip()
+        if limit == "max":
+            return None
+        with open("/sys/fs/cgroup/memory.current", encoding="ascii") as handle:
+            return max(int(limit) - int(handle.read().strip()), 0)
+    except (OSError, ValueError):
+        return None
+
+
+def available_memory() -> Optional[int]:
+    """Memória que ainda pode ser usada sem swap, em bytes (None se desconhecida).
+
+    No Linux vem de MemAvailable (/proc/meminfo, conta o cache de páginas
+    liberável); fora dele, das páginas físicas livres (sysconf).
+    """
+    available: Optional[int] = None
+    try:
+        with open("/proc/meminfo", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+    if available is None:
+        try:
+            available = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (AttributeError, OSError, ValueError):
+            pass
+    limit = _cgroup_available()
+    if limit is not None:
+        available = limit if available is None else min(available, limit)
+    return available
+
+
+def read_sample(file_path: str) -> Tuple[bytes, float]:
+    """(início do arquivo até a última linha completa, fração do arquivo que ele ocupa).
+
+    Em arquivo comprimido a fração vem dos bytes comprimidos consumidos
+    pelo descompressor (que lê um pouco à frente: a estimativa de linhas
+    fica levemente abaixo).
+    """
+    from compressed_io import decompressed
+
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as raw:
+        stream = decompressed(raw)
+        try:
+            data = stream.read(SAMPLE_BYTES)
+            consumed = raw.tell()
+        finally:
+            stream.close()
+    if len(data) < SAMPLE_BYTES or not size:
+        return data, 1.0
+    cut = data.rfind(b"\n") + 1
+    if not cut:
+        raise ValueError("Primeira linha maior que a amostra de memória")
+    return data[:cut], min(consumed * cut / len(data) / size, 1.0)
+
+
+def _shallow_bytes(dataframe: pd.DataFrame) -> List[int]:
+    return [int(size) for size in dataframe.memory_usage(deep=False, index=False)]
+
+
+def _parse_sample(data: bytes, kind: str) -> Tuple[pd.DataFrame, int]:
+    """(amostra como a leitura completa a montaria, bytes do cabeçalho)."""
+    import pandas as pd
+
+    if kind == "csv":
+        return pd.read_csv(io.BytesIO(data)), data.find(b"\n") + 1
+    from arff_io import iter_chunks, read_header
+
+    handle = io.StringIO(data.decode("utf-8", errors="replace"))
+    _, attributes, date_formats = read_header(handle)
+    header = len(handle.getvalue()[:handle.tell()].encode("utf-8"))
+    frames = list(iter_chunks(handle, attributes, date_formats))
+    if not frames:
+        return pd.DataFrame(columns=[name for name, _ in attributes]), header
+    return (frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)), header
+
+
+def estimate_memory(file_path: str, kind: str) -> Dict[str, Any]:
+    """Linhas previstas e bytes por linha do DataFrame, sem e com compactação.
+
+    "Rasos" são os bytes sem o texto apontado pelas células (só os
+    ponteiros): é o que as cópias da leitura (concatenação dos blocos)
+    duplicam. `categories` são as colunas de texto que a compactação
+    transformaria em Categorical: no CSV elas já são lidas assim.
+    """
+    import pandas as pd
+    from compaction import compact_dataframe
+
+    data, fraction = read_sample(file_path)
+    sample, header = _parse_sample(data, kind)
+    sample_rows = max(len(sample), 1)
+    body = max(len(data) - header, 1)
+    rows = round(len(sample) * max(len(data) / fraction - header, 0) / body)
+    compacted, report = compact_dataframe(sample)
+    # Com deep=True: um objeto por célula de texto. O parser reaproveita o
+    # objeto de textos repetidos (o real fica abaixo), e a folga cobre as
+    # tabelas de hash dos perfis (column_profile) no fim da leitura
+    before = [column['bytesBefore'] for column in report['columns']]
+    after = [column['bytesAfter'] for column in report['columns']]
+    shallow, after_shallow = _shallow_bytes(sample), _shallow_bytes(compacted)
+    categories = [
+        str(name) for name in sample.columns
+        if kind == "csv"
+        and isinstance(compacted[name].dtype, pd.CategoricalDtype)
+        and not isinstance(sample[name].dtype, pd.CategoricalDtype)
+    ]
+    # Lendo o CSV com `categories`, só essas colunas já chegam compactas
+    hinted = [str(name) in categories for name in sample.columns]
+    return {
+        'sampleRows': len(sample),
+        'rows': rows,
+        'rowBytes': sum(before) / sample_rows,
+        'rowShallow': sum(shallow) / sample_rows,
+        'compactRowBytes': sum(after) / sample_rows,
+        'hintedRowBytes': sum(a if h else b for a, b, h in zip(after, before, hinted)) / sample_rows,
+        'hintedRowShallow': sum(a if h else b for a, b, h in zip(after_shallow, shallow, hinted)) / sample_rows,
+        'textRowBytes': body / sample_rows,
+        'categories': categories,
+    }
+
+
+def peak_bytes(kind: str, rows: int, row_bytes: float, row_shallow: float, text_row_bytes: float) -> float:
+    """Pico previsto da leitura de `rows` linhas.
+
+    O DataFrame inteiro, mais (`PEAK_FACTOR` - 1) cópias rasas dele e,
+    no ARFF, o texto de um bloco de `arff_io.DEFAULT_CHUNK_ROWS` linhas
+    com as listas do parser (`CHUNK_TEXT_FACTOR`).
+    """
+    chunk = 0.0
+    if kind == "arff":
+        from arff_io import DEFAULT_CHUNK_ROWS
+
+        chunk = min(rows, DEFAULT_CHUNK_ROWS) * text_row_bytes * CHUNK_TEXT_FACTOR
+    return rows * (row_bytes + (PEAK_FACTOR[kind] - 1) * row_shallow) + chunk
+
+
+def _mb(value: Optional[float]) -> Optional[float]:
+    return round(value / _MB, 1) if value is not None else None
+
+
+def plan_load(
+    file_path: str,
+    kind: str,
+    budget: Optional[int] = None,
+    lazy_threshold: Optional[int] = None,
+    compact: bool = False,
+    lazy_rows: int = 10_000,
+) -> Plan:
+    """Escolhe "eager", "compact" ou "lazy" para `file_path` ("csv" ou "arff").
+
+    `budget` em bytes: None = `BUDGET_FRACTION` da memória disponível,
+    0 = sem limite (só estima). `lazy_threshold` mantém a regra por
+    tamanho (arquivo sem compressão a partir dele abre em modo janela).
+    `compact` é a compactação pedida pelo usuário (setCompactMemory).
+    Levanta RuntimeError quando a base não cabe e o modo janela não é
+    possível (arquivo comprimido).
+    """
+    from compressed_io import detect_file
+
+    size = os.path.getsize(file_path)
+    # O LazyFileModel faz seek no arquivo: só sem compressão
+    seekable = detect_file(file_path) is None
+    available = available_memory()
+    if budget is None:
+        budget = int(available * BUDGET_FRACTION) if available is not None else 0
+    estimate = estimate_memory(file_path, kind)
+    rows, text = estimate['rows'], estimate['textRowBytes']
+    frame = rows * estimate['rowBytes']
+    peak = peak_bytes(kind, rows, estimate['rowBytes'], estimate['rowShallow'], text)
+    compact_frame = rows * estimate['compactRowBytes']
+    # A compactação no fim da leitura guarda as duas versões ao mesmo tempo
+    compact_peak = max(
+        peak_bytes(kind, rows, estimate['hintedRowBytes'], estimate['hintedRowShallow'], text),
+        rows * estimate['hintedRowBytes'] + compact_frame,
+    )
+
+    def fits(steady: float, at_peak: float) -> bool:
+        return at_peak <= budget and steady <= budget * STEADY_FRACTION
+
+    expected = f"~{_mb(peak):.0f} MB previstos, orçamento de {_mb(budget):.0f} MB"
+    if seekable and lazy_threshold is not None and size >= lazy_threshold:
+        mode, reason = "lazy", f"arquivo a partir de {lazy_threshold // _MB} MB abre em modo janela"
+    elif not budget:
+        mode, reason = ("compact" if compact else "eager"), "sem limite de memória"
+    elif fits(frame, peak):
+        mode, reason = ("compact" if compact else "eager"), f"cabe na memória ({expected})"
+    elif fits(compact_frame, compact_peak):
+        mode = "compact"
+        reason = (f"só cabe com dtypes compactos (~{_mb(compact_peak):.0f} MB previstos em vez de "
+                  f"~{_mb(peak):.0f} MB, orçamento de {_mb(budget):.0f} MB)")
+    elif seekable:
+        mode, reason = "lazy", f"não cabe na memória ({expected}): modo janela"
+    else:
+        raise RuntimeError(
+            f"arquivo grande demais para a memória ({expected}); descomprima-o para abrir em modo janela"
+        )
+    if mode == "lazy":
+        sample_rows = min(lazy_rows, rows)
+        frame = sample_rows * estimate['rowBytes']
+        peak = peak_bytes(kind, sample_rows, estimate['rowBytes'], estimate['rowShallow'], text)
+    elif mode == "compact":
+        frame, peak = compact_frame, compact_peak
+    return {
+        'mode': mode,
+        'reason': reason,
+        'fileMb': _mb(size),
+        'estimatedRows': rows,
+        'estimatedMb': _mb(frame),
+        'estimatedPeakMb': _mb(peak),
+        'budgetMb': _mb(budget) if budget else None,
+        'availableMb': _mb(available),
+        'sampleRows': estimate['sampleRows'],
+        'categories': estimate['categories'] if mode == "compact" else [],
+    }
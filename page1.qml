@@ -8,7 +8,15 @@ Rectangle {
     id: firstWindow
     property var csvController: null
     property var arffController: null
+    property var parquetController: null
     property var onDataLoaded: null
+    // Controlador com carregamento em andamento (null quando ocioso)
+    property var loadingController: {
+        if (csvController && csvController.loading) return csvController
+        if (arffController && arffController.loading) return arffController
+        if (parquetController && parquetController.loading) return parquetController
+        return null
+    }
     width: 1000
     height: 700
     anchors.fill: parent
@@ -17,7 +25,8 @@ Rectangle {
     FileDialog {
         id: csvFileDialog
         title: "Selecione um arquivo CSV"
-        nameFilters: ["Arquivos CSV (*.csv)", "Todos os arquivos (*)"]
+        // Comprimidos são descomprimidos em fluxo na leitura (compressed_io)
+        nameFilters: ["Arquivos CSV (*.csv *.csv.gz *.csv.bz2 *.csv.xz *.csv.zst)", "Todos os arquivos (*)"]
         onAccepted: {
             if (csvController) {
                 csvController.loadCsv(selectedFile)
@@ -28,7 +37,7 @@ Rectangle {
     FileDialog {
         id: arffFileDialog
         title: "Selecione um arquivo ARFF"
-        nameFilters: ["Arquivos ARFF (*.arff)", "Todos os arquivos (*)"]
+        nameFilters: ["Arquivos ARFF (*.arff *.arff.gz *.arff.bz2 *.arff.xz *.arff.zst)", "Todos os arquivos (*)"]
         onAccepted: {
             if (arffController) {
                 arffController.loadArff(selectedFile)
@@ -36,6 +45,17 @@ Rectangle {
         }
     }
 
+    FileDialog {
+        id: parquetFileDialog
+        title: "Selecione um arquivo Parquet, Feather ou Arrow"
+        nameFilters: ["Parquet / Feather / Arrow (*.parquet *.feather *.arrow *.ipc)", "Todos os arquivos (*)"]
+        onAccepted: {
+            if (parquetController) {
+                parquetController.loadParquet(selectedFile)
+            }
+        }
+    }
+
     Column {
         id: mainContent
         anchors.centerIn: parent
@@ -93,6 +113,51 @@ Rectangle {
                 Material.elevation: 6
                 onClicked: arffFileDialog.open()
             }
+
+            // Só com o pyarrow instalado (dependência opcional)
+            Button {
+                id: loadParquetButton
+                anchors.horizontalCenter: parent.horizontalCenter
+                visible: parquetController ? parquetController.available : false
+                width: 320
+                height: 64
+                text: qsTr("CARREGAR PARQUET / ARROW")
+                Material.elevation: 6
+                onClicked: parquetFileDialog.open()
+            }
+        }
+
+        // Progresso do carregamento em segundo plano
+        Column {
+            id: loadingSection
+            anchors.horizontalCenter: parent.horizontalCenter
+            spacing: 8
+            visible: firstWindow.loadingController !== null
+
+            ProgressBar {
+                anchors.horizontalCenter: parent.horizontalCenter
+                width: 320
+                from: 0
+                to: 1
+                value: firstWindow.loadingController ? firstWindow.loadingController.loadProgress : 0
+            }
+
+            Text {
+                anchors.horizontalCenter: parent.horizontalCenter
+                text: firstWindow.loadingController ? qsTr("Carregando... ") + firstWindow.loadingController.loadStatus : ""
+                font.pointSize: 10
+                color: Material.foreground
+                opacity: 0.7
+            }
+
+            Button {
+                anchors.horizontalCenter: parent.horizontalCenter
+                text: qsTr("Cancelar")
+                flat: true
+                onClicked: {
+                    if (firstWindow.loadingController) firstWindow.loadingController.cancelLoad()
+                }
+            }
         }
 
         Column {
@@ -117,6 +182,8 @@ Rectangle {
                 Text { text: qsTr("CSV"); font.pointSize: 13; color: Material.accent }
                 Rectangle { width: 1; height: 16; color: Material.foreground; opacity: 0.3; anchors.verticalCenter: parent.verticalCenter }
                 Text { text: qsTr("ARFF"); font.pointSize: 13; color: Material.accent }
+                Rectangle { visible: loadParquetButton.visible; width: 1; height: 16; color: Material.foreground; opacity: 0.3; anchors.verticalCenter: parent.verticalCenter }
+                Text { visible: loadParquetButton.visible; text: qsTr("PARQUET"); font.pointSize: 13; color: Material.accent }
             }
         }
     }
@@ -135,5 +202,12 @@ Rectangle {
             if (firstWindow.onDataLoaded) firstWindow.onDataLoaded("arff")
         }
     }
+
+    Connections {
+        target: firstWindow.parquetController
+        function onDataframeChanged() {
+            if (firstWindow.onDataLoaded) firstWindow.onDataLoaded("parquet")
+        }
+    }
 }
 
@@ -8,27 +8,30 @@ Page {
     id: dataPage
     property var csvController: null
     property var arffController: null
+    property var parquetController: null
     property var stack: null
     property string fileType: "csv"
     
-    property var activeController: fileType === "csv" ? csvController : arffController
+    // CSV e Parquet/Arrow têm a mesma API (fileName, rowCount(), columnCount())
+    property var activeController: fileType === "csv" ? csvController
+                                 : fileType === "parquet" ? parquetController : arffController
     property string baseName: {
-        if (fileType === "csv") {
-            return csvController ? csvController.fileName : "Sem nome"
+        if (fileType !== "arff") {
+            return activeController ? activeController.fileName : "Sem nome"
         } else {
             return arffController ? arffController.relationName : "Sem nome"
         }
     }
     property int totalInstances: {
-        if (fileType === "csv") {
-            return csvController ? csvController.rowCount() : 0
+        if (fileType !== "arff") {
+            return activeController ? activeController.rowCount() : 0
         } else {
             return arffController ? arffController.instanceCount : 0
         }
     }
     property int totalAttributes: {
-        if (fileType === "csv") {
-            return csvController ? csvController.columnCount() : 0
+        if (fileType !== "arff") {
+            return activeController ? activeController.columnCount() : 0
         } else {
             return arffController ? arffController.attributeCount : 0
         }
@@ -92,9 +95,90 @@ Page {
                     horizontalAlignment: Text.AlignHCenter
                 }
                 
+                // Ordenação e filtro (calculados no Python, ver row_order.py);
+                // no modo janela a tabela lê o arquivo sob demanda e não ordena
+                RowLayout {
+                    id: queryBar
+                    property var tableModel: activeController ? activeController.tableModel : null
+                    property bool available: !!tableModel && !(activeController && activeController.lazyMode)
+                    width: parent.width
+                    height: 40
+                    spacing: 8
+                    visible: available
+
+                    ComboBox {
+                        id: columnBox
+                        Layout.preferredWidth: 180
+                        // Recarrega junto com o modelo (nova base)
+                        model: queryBar.tableModel && activeController ? activeController.getAttributeNames() : []
+                    }
+
+                    TextField {
+                        id: filterField
+                        Layout.fillWidth: true
+                        placeholderText: qsTr("Filtrar (texto, ou faixa: 10..20)")
+                        selectByMouse: true
+                        onTextChanged: filterTimer.restart()
+                        onAccepted: filterTimer.triggered()
+
+                        Timer {
+                            id: filterTimer
+                            interval: 400
+                            onTriggered: {
+                                var model = queryBar.tableModel
+                                if (!queryBar.available || columnBox.currentIndex < 0) return
+                                var range = filterField.text.match(/^\s*([-+]?[\d.,]*)\s*\.\.\s*([-+]?[\d.,]*)\s*$/)
+                                if (range) {
+                                    model.setTextFilter(columnBox.currentIndex, "")
+                                    model.setRangeFilter(columnBox.currentIndex, range[1], range[2])
+                                } else {
+                                    model.setRangeFilter(columnBox.currentIndex, "", "")
+                                    model.setTextFilter(columnBox.currentIndex, filterField.text)
+                                }
+                            }
+                        }
+                    }
+
+                    Button {
+                        text: queryBar.available && queryBar.tableModel.sortColumn === columnBox.currentIndex
+                              ? (queryBar.tableModel.sortAscending ? qsTr("Ordem ▲") : qsTr("Ordem ▼"))
+                              : qsTr("Ordenar")
+                        onClicked: {
+                            var model = queryBar.tableModel
+                            var ascending = !(model.sortColumn === columnBox.currentIndex && model.sortAscending)
+                            model.sortByColumn(columnBox.currentIndex, ascending)
+                        }
+                    }
+
+                    Button {
+                        text: qsTr("Limpar")
+                        flat: true
+                        onClicked: {
+                            filterField.text = ""
+                            filterTimer.stop()
+                            queryBar.tableModel.clearSortFilter()
+                        }
+                    }
+
+                    BusyIndicator {
+                        Layout.preferredWidth: 32
+                        Layout.preferredHeight: 32
+                        running: queryBar.available && queryBar.tableModel.busy
+                    }
+
+                    Text {
+                        visible: queryBar.available && queryBar.tableModel.filteredColumns.length > 0
+                        text: queryBar.available
+                              ? qsTr("%1 de %2").arg(queryBar.tableModel.rowCount()).arg(queryBar.tableModel.sourceRowCount)
+                              : ""
+                        color: Material.foreground
+                        font.pointSize: 9
+                    }
+                }
+
                 ScrollView {
                     width: parent.width
-                    height: parent.height - 40
+                    height: parent.height - 40 - (queryBar.visible ? queryBar.height + parent.spacing : 0)
                     clip: true
                     
                     TableView {
@@ -185,6 +269,50 @@ Page {
                             font.weight: Font.Medium
                         }
                     }
+
+                    Text {
+                        // Tempos do último carregamento (propriedade stats do controlador)
+                        property var load: activeController && activeController.stats ? activeController.stats.load : null
+                        width: parent.width
+                        visible: !!load
+                        text: load ? qsTr("Carregado em %1 s (%2 linhas/s, %3 MB)%4%5")
+                                     .arg(load.seconds.toFixed(2))
+                                     .arg(Number(load.rowsPerSecond).toLocaleString(Qt.locale(), "f", 0))
+                                     .arg(load.rssMb !== null && load.rssMb !== undefined ? load.rssMb.toFixed(0) : "?")
+                                     .arg(load.fromCache ? qsTr(", do cache") : "")
+                                     // Compactação ligada: tamanho da base antes -> depois (memoryReport)
+                                     .arg(load.memoryMb !== undefined
+                                          ? qsTr("; base compactada: %1 MB → %2 MB").arg(load.memoryBeforeMb).arg(load.memoryMb)
+                                          : "")
+                                   : ""
+                        color: Material.foreground
+                        opacity: 0.7
+                        font.pointSize: 9
+                        wrapMode: Text.WordWrap
+                    }
+
+                    Text {
+                        // Modo escolhido pelo orçamento de memória (loadPlan, memory_plan.py)
+                        property var plan: activeController && activeController.loadPlan ? activeController.loadPlan : null
+                        property var modeNames: ({ eager: qsTr("completo"), compact: qsTr("compacto"), lazy: qsTr("janela") })
+                        width: parent.width
+                        visible: !!plan && !!plan.mode
+                        text: visible ? qsTr("Modo de carregamento: %1 (%2)").arg(modeNames[plan.mode] || plan.mode).arg(plan.reason) : ""
+                        color: Material.foreground
+                        opacity: 0.7
+                        font.pointSize: 9
+                        wrapMode: Text.WordWrap
+                    }
+
+                    Text {
+                        width: parent.width
+                        visible: activeController ? activeController.lazyMode : false
+                        text: qsTr("Arquivo grande: aberto em modo janela. As linhas são lidas conforme a rolagem.")
+                        color: Material.foreground
+                        opacity: 0.7
+                        font.pointSize: 9
+                        wrapMode: Text.WordWrap
+                    }
                 }
                 
                 Item {
@@ -219,6 +347,7 @@ Page {
                                 dataPage.stack.push("page3.qml", {
                                     "csvController": csvController,
                                     "arffController": arffController,
+                                    "parquetController": parquetController,
                                     "stack": dataPage.stack,
                                     "fileType": fileType
                                 })
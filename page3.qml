@@ -9,10 +9,50 @@ Page {
     id: typePage
     property var csvController: null
     property var arffController: null
+    property var parquetController: null
     property var stack: null
     property string fileType: "csv"
     
-    property var activeController: fileType === "csv" ? csvController : arffController
+    property var activeController: fileType === "csv" ? csvController
+                                 : fileType === "parquet" ? parquetController : arffController
+
+    // Estatísticas por coluna (column_stats): calculadas em segundo plano ao
+    // abrir a página; os resultados parciais chegam pelo attributeModel
+    Component.onCompleted: {
+        if (activeController && activeController.computeColumnStats) activeController.computeColumnStats()
+    }
+
+    function formatStat(value) {
+        if (value === undefined || value === null) return "-"
+        if (typeof value === "number") return Number(value.toPrecision(4)).toString()
+        return value
+    }
+
+    // Resumo em uma linha: ausentes + faixa/média (números e datas) ou valores distintos
+    function statsSummary(stats) {
+        if (!stats) return ""
+        var parts = [qsTr("Ausentes: %1%").arg(Math.round(stats.nullRatio * 1000) / 10)]
+        if (stats.kind === "numeric" || stats.kind === "date") {
+            parts.push(qsTr("mín. %1").arg(formatStat(stats.min)))
+            parts.push(qsTr("máx. %1").arg(formatStat(stats.max)))
+            if (stats.std !== undefined && stats.std !== null)
+                parts.push(qsTr("média %1 ± %2").arg(formatStat(stats.mean)).arg(formatStat(stats.std)))
+            else
+                parts.push(qsTr("média %1").arg(formatStat(stats.mean)))
+        } else if (stats.distinct !== undefined && stats.distinct !== null) {
+            parts.push(qsTr("%1 valores distintos").arg(stats.distinct))
+        }
+        return parts.join("   ")
+    }
+
+    function topValues(stats) {
+        // Coluna de valores únicos: a lista não diz nada
+        if (!stats || !stats.top || stats.top.length === 0 || stats.top[0].count < 2) return ""
+        var items = []
+        for (var i = 0; i < stats.top.length; i++)
+            items.push(stats.top[i].value + " (" + stats.top[i].count + ")")
+        return (stats.topExact ? qsTr("Mais frequentes: ") : qsTr("Mais frequentes (aprox.): ")) + items.join(", ")
+    }
     
     background: Rectangle {
         color: Material.backgroundColor
@@ -217,13 +257,8 @@ Page {
                         
                         Repeater {
                             id: attributeRepeater
-                            model: {
-                                if (activeController) {
-                                    var names = activeController.getAttributeNames()
-                                    return names ? names.length : 0
-                                }
-                                return 0
-                            }
+                            // AttributeListModel: mudanças chegam linha a linha (dataChanged)
+                            model: activeController ? activeController.attributeModel : null
                             
                             delegate: Rectangle {
                                 width: parent.width - 40
@@ -234,12 +269,18 @@ Page {
                                 radius: 6
                                 anchors.horizontalCenter: parent.horizontalCenter
                                 
-                                property string attrName: {
-                                    if (activeController) {
-                                        var names = activeController.getAttributeNames()
-                                        return names && index < names.length ? names[index] : ""
+                                property string attrName: model.name
+                                property var attrExamples: model.examples
+                                property string attrType: model.suggestedType
+                                property var attrConfidence: model.confidence
+                                property var attrStats: model.stats
+
+                                // Tipo alterado no controlador (refineTypes, escolha do usuário)
+                                onAttrTypeChanged: {
+                                    if (typeCombo.initialized) {
+                                        var i = typeCombo.find(attrType)
+                                        if (i >= 0 && i !== typeCombo.currentIndex) typeCombo.currentIndex = i
                                     }
-                                    return ""
                                 }
                                 
                                 Column {
@@ -281,7 +322,7 @@ Page {
 
                                             Component.onCompleted: {
                                                 if (activeController && attrName) {
-                                                    var suggested = activeController.getSuggestedType(attrName)
+                                                    var suggested = attrType
                                                     console.log("QML: Atributo '" + attrName + "' tipo sugerido: '" + suggested + "'")
                                                     for (var i = 0; i < model.length; i++) {
                                                         if (model[i] === suggested) {
@@ -300,6 +341,16 @@ Page {
                                                 }
                                             }
                                         }
+
+                                        // Confiança da sugestão (fração da amostra que confirma o tipo)
+                                        Text {
+                                            visible: attrConfidence !== undefined && attrConfidence !== null
+                                            text: qsTr("Confiança: ") + Math.round(attrConfidence * 100) + "%"
+                                            font.pointSize: 9
+                                            color: Material.foreground
+                                            opacity: 0.7
+                                            Layout.alignment: Qt.AlignVCenter
+                                        }
                                     }
                                     
                                     // Exemplos (lado a lado)
@@ -308,13 +359,7 @@ Page {
                                         spacing: 8
                                         
                                         Repeater {
-                                            model: {
-                                                if (activeController && attrName) {
-                                                    var examples = activeController.getAttributeExamples(attrName)
-                                                    return examples ? Math.min(examples.length, 5) : 0
-                                                }
-                                                return 0
-                                            }
+                                            model: attrExamples ? Math.min(attrExamples.length, 5) : 0
                                             
                                             delegate: Rectangle {
                                                 width: Math.min(exText.implicitWidth + 14, 120)
@@ -327,13 +372,7 @@ Page {
                                                 Text {
                                                     id: exText
                                                     anchors.centerIn: parent
-                                                    text: {
-                                                        if (activeController && attrName) {
-                                                            var examples = activeController.getAttributeExamples(attrName)
-                                                            return examples && index < examples.length ? examples[index] : ""
-                                                        }
-                                                        return ""
-                                                    }
+                                                    text: attrExamples && index < attrExamples.length ? attrExamples[index] : ""
                                                     font.pointSize: 9
                                                     color: Material.foreground
                                                     elide: Text.ElideRight
@@ -342,6 +381,51 @@ Page {
                                             }
                                         }
                                     }
+
+                                    // Estatísticas da coluna (chegam em partes enquanto o cálculo roda)
+                                    Text {
+                                        visible: !!attrStats
+                                        text: statsSummary(attrStats)
+                                        font.pointSize: 9
+                                        color: Material.foreground
+                                        opacity: 0.8
+                                        width: parent.width
+                                        wrapMode: Text.WordWrap
+                                    }
+
+                                    // Histograma (números e datas): barras na escala do maior bin
+                                    Row {
+                                        id: histogramRow
+                                        visible: !!(attrStats && attrStats.histogram && attrStats.histogram.length > 0)
+                                        height: 32
+                                        spacing: 1
+
+                                        property var bins: attrStats && attrStats.histogram ? attrStats.histogram : []
+                                        property real peak: bins.length > 0 ? Math.max.apply(null, bins) : 1
+
+                                        Repeater {
+                                            model: histogramRow.bins
+
+                                            delegate: Rectangle {
+                                                width: 8
+                                                height: Math.max(1, histogramRow.height * modelData / Math.max(1, histogramRow.peak))
+                                                anchors.bottom: parent.bottom
+                                                color: Material.accent
+                                                opacity: 0.8
+                                            }
+                                        }
+                                    }
+
+                                    // Valores mais frequentes (texto e nominais)
+                                    Text {
+                                        visible: text !== ""
+                                        text: topValues(attrStats)
+                                        font.pointSize: 9
+                                        color: Material.foreground
+                                        opacity: 0.8
+                                        width: parent.width
+                                        elide: Text.ElideRight
+                                    }
                                 }
                             }
                         }
@@ -357,9 +441,15 @@ Page {
                     border.color: Material.frameColor
                     border.width: 1
 
+                    // Exportação em fluxo (modo janela): roda em segundo plano com progresso
+                    property bool exporting: activeController && activeController.exporting ? true : false
+
                     Button {
                         id: saveBtn
-                        text: qsTr("Salvar")
+                        text: footerBar.exporting
+                              ? qsTr("Salvando... %1%").arg(Math.round(activeController.exportProgress * 100))
+                              : qsTr("Salvar")
+                        enabled: !footerBar.exporting
                         Material.background: Material.accent
                         Material.foreground: "#000000"
                         font.weight: Font.Medium
@@ -372,6 +462,37 @@ Page {
                             }
                         }
                     }
+
+                    Button {
+                        visible: footerBar.exporting
+                        text: qsTr("Cancelar")
+                        flat: true
+                        anchors.left: saveBtn.right
+                        anchors.leftMargin: 12
+                        anchors.verticalCenter: parent.verticalCenter
+                        onClicked: activeController.cancelExport()
+                    }
+
+                    // Progresso das estatísticas por coluna
+                    Text {
+                        visible: activeController && activeController.computingColumnStats ? true : false
+                        text: qsTr("Calculando estatísticas... %1%").arg(
+                                  visible ? Math.round(activeController.columnStatsProgress * 100) : 0)
+                        font.pointSize: 9
+                        color: Material.foreground
+                        opacity: 0.7
+                        anchors.left: parent.left
+                        anchors.leftMargin: 12
+                        anchors.verticalCenter: parent.verticalCenter
+                    }
+
+                    ProgressBar {
+                        visible: footerBar.exporting
+                        value: footerBar.exporting ? activeController.exportProgress : 0
+                        width: saveBtn.width
+                        anchors.top: saveBtn.bottom
+                        anchors.horizontalCenter: parent.horizontalCenter
+                    }
                 }
             }
         }
@@ -382,8 +503,16 @@ Page {
         id: saveFileDialog
         title: qsTr("Salvar ARFF")
         fileMode: FileDialog.SaveFile
-        nameFilters: ["Arquivos ARFF (*.arff)", "Todos os arquivos (*)"]
-        defaultSuffix: "arff"
+        // Terminando em .gz/.bz2/.xz/.zst, o ARFF é gravado comprimido
+        // Terminando em .parquet, grava Parquet com os tipos escolhidos (exportParquet)
+        // Base ARFF: terminando em .csv (ou .csv.gz, ...), grava o @data em CSV (exportCsv)
+        property bool csvExport: activeController && activeController.exportCsv ? true : false
+        nameFilters: ["Arquivos ARFF (*.arff)", "ARFF comprimido (*.arff.gz *.arff.xz *.arff.bz2 *.arff.zst)",
+                      "Parquet (*.parquet)"]
+                     .concat(csvExport ? ["CSV (*.csv *.csv.gz *.csv.xz *.csv.bz2 *.csv.zst)"] : [])
+                     .concat(["Todos os arquivos (*)"])
+        defaultSuffix: selectedNameFilter.index === 2 ? "parquet"
+                     : (csvExport && selectedNameFilter.index === 3 ? "csv" : "arff")
         
         onAccepted: {
             if (activeController) {
@@ -391,7 +520,11 @@ Page {
                 if (path.startsWith("file://")) {
                     path = path.substring(7)
                 }
-                if (activeController.saveMetadata) {
+                if (csvExport && /\.csv(\.(gz|bz2|xz|zst))?$/i.test(path)) {
+                    activeController.exportCsv(path)
+                } else if (path.toLowerCase().endsWith(".parquet") && activeController.exportParquet) {
+                    activeController.exportParquet(path)
+                } else if (activeController.saveMetadata) {
                     activeController.saveMetadata(path)
                 }
             }
@@ -420,18 +553,6 @@ Page {
             messageDialog.text = message
             messageDialog.open()
         }
-        
-        function onMetadataChanged() {
-            console.log("QML: Metadata changed, forçando atualização do Repeater")
-            // Força o Repeater a se atualizar
-            attributeRepeater.model = 0
-            attributeRepeater.model = Qt.binding(function() {
-                if (activeController) {
-                    var names = activeController.getAttributeNames()
-                    return names ? names.length : 0
-                }
-                return 0
-            })
-        }
+
     }
 }
\ No newline at end of file
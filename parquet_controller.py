@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Property, QUrl, Signal, Slot
+from attribute_model import AttributeListModel
+from column_stats import ColumnStatsEngine, frame_chunks
+from compaction import memory_stats
+from instrumentation import Timings, load_stats, span
+from loader import BackgroundLoader, report_progress
+from table_model import DataFrameModel
+
+# pandas, pyarrow e columnar_io são importados sob demanda, como nos outros
+# controladores (ver startup.py); pyarrow é opcional
+if TYPE_CHECKING:
+    import pandas as pd
+
+log = logging.getLogger(__name__)
+
+
+def _read_columnar(
+    handle,
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    sample_rows: Optional[int] = None,
+    compact: bool = False,
+) -> Dict[str, Any]:
+    """Parse executado no worker do BackgroundLoader.
+
+    Lê só as colunas pedidas (columnar_io, com mapeamento em memória),
+    converte para DataFrame e monta perfis e inferência como nos outros
+    controladores. Os dados já chegam tipados: não há cache em disco nem
+    modo janela, a própria leitura já é o caminho rápido.
+    """
+    from column_profile import build_profiles
+    from columnar_io import read_table, table_to_dataframe
+    from type_inference import DEFAULT_SAMPLE_ROWS, apply_inference, infer_types
+
+    total = os.path.getsize(file_path)
+    timings: Timings = []
+    with span("read", timings, file=file_path, columns=len(columns or ())):
+        table = read_table(file_path, columns, on_progress=lambda fraction: report_progress(handle, int(fraction * total)))
+    with span("convert", timings, rows=table.num_rows):
+        dataframe = table_to_dataframe(table)
+    with span("profile", timings, columns=dataframe.shape[1]):
+        profiles = build_profiles(dataframe)
+    with span("infer", timings):
+        apply_inference(profiles, infer_types(dataframe, sample_rows or DEFAULT_SAMPLE_ROWS))
+    parsed: Dict[str, Any] = {'dataframe': dataframe, 'profiles': profiles, 'timings': timings}
+    if compact:
+        from compaction import compact_dataframe
+
+        with span("compact", timings):
+            parsed['dataframe'], parsed['memoryReport'] = compact_dataframe(dataframe)
+    return parsed
+
+
+class ParquetController(QObject):
+    """Backend para Parquet, Feather e Arrow IPC com a mesma API do CSVController.
+
+    Alimenta o mesmo `DataFrameModel` (página 2) e o mesmo fluxo de tipos da
+    página 3; exporta em ARFF (`saveMetadata`/`generateArff`) ou Parquet
+    (`exportParquet`) com os tipos escolhidos.
+    """
+
+    dataframeChanged = Signal()
+    fileNameChanged = Signal()
+    errorOccurred = Signal(str)
+    successOccurred = Signal(str)
+    infoChanged = Signal()
+    metadataChanged = Signal()
+    # Carregamento em segundo plano (barra de progresso da página 1)
+    loadingChanged = Signal()
+    loadProgressChanged = Signal()
+    statsChanged = Signal()
+    # Estatísticas por coluna da página 3 (column_stats): resultados parciais e andamento
+    columnStatsChanged = Signal()
+    computingColumnStatsChanged = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._df: Optional[pd.DataFrame] = None
+        self._file_name: str = ""
+        self._file_path: Optional[str] = None
+        self._pending_path: Optional[str] = None
+        self._model = DataFrameModel()
+        self._model.queryFailed.connect(lambda message: self.errorOccurred.emit(f"Erro ao ordenar/filtrar: {message}"))
+        # Tipos selecionados manualmente pelo usuário (override)
+        self._selected_types: Dict[str, str] = {}
+        self._attribute_model = AttributeListModel(self)
+        self._profiles: Dict[str, Dict] = {}
+        # Projeção: colunas lidas no próximo carregamento (vazio = todas)
+        self._columns: List[str] = []
+        self._loader = BackgroundLoader(self)
+        self._loader.loadingChanged.connect(self.loadingChanged)
+        self._loader.progressChanged.connect(self.loadProgressChanged)
+        self._loader.finished.connect(self._onLoaded)
+        self._loader.failed.connect(self._onLoadFailed)
+        # Teto e ordem do domínio nominal na exportação ARFF (-1 = padrão)
+        self._max_nominal_values: int = -1
+        self._sort_nominal_values: bool = False
+        # Formato do @data: None = automático (arff_io.resolve_sparse)
+        self._sparse_output: Optional[bool] = None
+        self._inference_sample_rows: Optional[int] = None
+        self._load_started: float = 0.0
+        self._stats: Dict[str, Any] = {}
+        self._compact_memory: bool = False
+        self._memory_report: Dict[str, Any] = {}
+        self._stats_engine = ColumnStatsEngine(self)
+        self._stats_engine.updated.connect(self._onColumnStatsUpdated)
+        self._stats_engine.runningChanged.connect(self.computingColumnStatsChanged)
+        self._stats_engine.failed.connect(
+            lambda message: self.errorOccurred.emit(f"Erro ao calcular as estatísticas: {message}")
+        )
+
+    @Property(str, notify=fileNameChanged)
+    def fileName(self) -> str:
+        return self._file_name
+
+    @Property(str, notify=infoChanged)
+    def info(self) -> str:
+        if self._df is None:
+            return "Nenhum dado carregado"
+        rows, cols = self._df.shape
+        return f"Linhas: {rows} | Colunas: {cols}"
+
+    @Property(QObject, notify=dataframeChanged)
+    def tableModel(self) -> QObject:
+        """Exposto ao QML para `model: controller.tableModel`."""
+        return self._model
+
+    @Property(QObject, constant=True)
+    def attributeModel(self) -> QObject:
+        """Atributos (nome, tipo efetivo, exemplos, confiança) para a página 3."""
+        return self._attribute_model
+
+    @Property(bool, constant=True)
+    def lazyMode(self) -> bool:
+        """Sempre False: o arquivo mapeado em memória já é lido sob demanda."""
+        return False
+
+    @Property(bool, constant=True)
+    def available(self) -> bool:
+        """True se o pyarrow estiver instalado (a página 1 esconde o botão sem ele)."""
+        from columnar_io import arrow_available
+
+        return arrow_available()
+
+    @Property('QVariantMap', notify=statsChanged)
+    def stats(self) -> Dict[str, Any]:
+        """Último carregamento ("load") e exportação ("export"): tempo, linhas/s, memória, etapas."""
+        return self._stats
+
+    def _setStats(self, operation: str, stats: Dict[str, Any]) -> None:
+        self._stats = {**self._stats, operation: stats}
+        self.statsChanged.emit()
+
+    @Property('QVariantMap', notify=dataframeChanged)
+    def memoryReport(self) -> Dict[str, Any]:
+        """Bytes por coluna antes/depois da compactação ({} se ela estava desligada)."""
+        return self._memory_report
+
+    @Slot(bool)
+    def setCompactMemory(self, enabled: bool) -> None:
+        """Ligado, os próximos carregamentos compactam os dtypes (ver compaction)."""
+        self._compact_memory = bool(enabled)
+
+    @Slot(QUrl, result=list)
+    def getFileColumns(self, file_url: QUrl) -> List[str]:
+        """Colunas do arquivo, lidas só do esquema (para escolher a projeção)."""
+        from columnar_io import read_column_names
+
+        try:
+            return read_column_names(file_url.toLocalFile() if file_url.scheme() == "file" else file_url.toString())
+        except Exception as e:
+            self.errorOccurred.emit(f"Erro ao ler o esquema: {e}")
+            return []
+
+    @Slot(list)
+    def setColumnProjection(self, columns: List[str]) -> None:
+        """Colunas lidas nos próximos carregamentos (lista vazia = todas)."""
+        self._columns = [str(name) for name in columns]
+
+    @Property(bool, notify=computingColumnStatsChanged)
+    def computingColumnStats(self) -> bool:
+        """Indica se as estatísticas por coluna estão sendo calculadas."""
+        return self._stats_engine.running
+
+    @Property(float, notify=columnStatsChanged)
+    def columnStatsProgress(self) -> float:
+        """Fração da base já resumida (0.0 a 1.0)."""
+        return self._stats_engine.progress
+
+    @Slot()
+    def computeColumnStats(self) -> None:
+        """Calcula em segundo plano o resumo de cada coluna (column_stats)."""
+        if self._df is None or self._stats_engine.complete or self._stats_engine.running:
+            return
+        self._stats_engine.background = self._loader.background
+        self._stats_engine.start(partial(frame_chunks, self._df))
+
+    @Slot()
+    def cancelColumnStats(self) -> None:
+        """Interrompe o cálculo; o que já foi resumido continua visível."""
+        self._stats_engine.cancel()
+
+    @Slot(str, result='QVariantMap')
+    def getColumnStats(self, attribute_name: str) -> Dict[str, Any]:
+        """Resumo de um atributo ({} se ainda não calculado)."""
+        return self._stats_engine.results.get(attribute_name) or {}
+
+    def _onColumnStatsUpdated(self) -> None:
+        for name, summary in self._stats_engine.results.items():
+            self._attribute_model.updateAttribute(name, stats=summary)
+        self.columnStatsChanged.emit()
+
+    def _resetColumnStats(self) -> None:
+        self._stats_engine.restore({})
+        self.columnStatsChanged.emit()
+
+    @Property(bool, notify=loadingChanged)
+    def loading(self) -> bool:
+        """Indica se há um carregamento em andamento."""
+        return self._loader.loading
+
+    @Property(float, notify=loadProgressChanged)
+    def loadProgress(self) -> float:
+        """Fração do arquivo já lida (0.0 a 1.0)."""
+        return self._loader.progress
+
+    @Property(str, notify=loadProgressChanged)
+    def loadStatus(self) -> str:
+        """Texto de progresso, ex.: "120.0 MB de 2048.0 MB"."""
+        mb = 1024 * 1024
+        return f"{self._loader.bytesRead / mb:.1f} MB de {self._loader.bytesTotal / mb:.1f} MB"
+
+    @Slot(bool)
+    def setBackgroundLoading(self, enabled: bool) -> None:
+        """Desligado, loadParquet bloqueia até o fim (scripts sem event loop)."""
+        self._loader.background = bool(enabled)
+
+    @Slot(int)
+    def setInferenceSampleRows(self, rows: int) -> None:
+        """Tamanho da amostra usada para sugerir os tipos no carregamento."""
+        self._inference_sample_rows = max(int(rows), 1)
+
+    @Slot(int)
+    def setMaxNominalValues(self, limit: int) -> None:
+        """Teto de valores de um atributo nominal na exportação ARFF (0 = sem limite)."""
+        self._max_nominal_values = max(int(limit), 0)
+
+    def _nominalLimit(self) -> Optional[int]:
+        from arff_schema import MAX_NOMINAL_VALUES
+
+        if self._max_nominal_values < 0:
+            return MAX_NOMINAL_VALUES
+        return self._max_nominal_values or None
+
+    @Slot(bool)
+    def setSortNominalValues(self, enabled: bool) -> None:
+        """Ligado, o domínio nominal sai ordenado; desligado, na ordem de aparição."""
+        self._sort_nominal_values = bool(enabled)
+
+    @Slot(str)
+    def setSparseOutput(self, mode: str) -> None:
+        """Formato do @data no ARFF: "auto" (esparso se quase tudo for zero), "always" ou "never"."""
+        from arff_io import SPARSE_MODES
+
+        if mode not in SPARSE_MODES:
+            self.errorOccurred.emit(f"Modo esparso inválido: {mode} (use {', '.join(SPARSE_MODES)})")
+            return
+        self._sparse_output = SPARSE_MODES[mode]
+
+    @Slot(QUrl)
+    def loadParquet(self, file_url: QUrl) -> None:
+        """Inicia a leitura de um Parquet/Feather/Arrow IPC em segundo plano."""
+        try:
+            if file_url.scheme() == "file":
+                file_path = file_url.toLocalFile()
+            else:
+                file_path = file_url.toString()
+
+            self._file_name = os.path.basename(file_path)
+            self.fileNameChanged.emit()
+            self._stats_engine.cancel()
+            self._pending_path = file_path
+            self._load_started = time.perf_counter()
+            # O resultado chega em _onLoaded / _onLoadFailed
+            self._loader.start(
+                file_path,
+                partial(
+                    _read_columnar,
+                    file_path=file_path,
+                    columns=list(self._columns),
+                    sample_rows=self._inference_sample_rows,
+                    compact=self._compact_memory,
+                ),
+            )
+        except Exception as e:
+            self._onLoadFailed(str(e))
+
+    @Slot()
+    def cancelLoad(self) -> None:
+        """Cancela o carregamento em andamento; a base anterior é mantida."""
+        self._loader.cancel()
+
+    def _onLoaded(self, parsed: Dict[str, Any]) -> None:
+        """Recebe o DataFrame e os perfis do worker já na thread da interface."""
+        self._df = parsed['dataframe']
+        self._profiles = parsed['profiles']
+        self._file_path = self._pending_path
+        self._memory_report = dict(parsed.get('memoryReport', {}))
+        timings = list(parsed.get('timings', []))
+        with span("model", timings):
+            self._model.setDataFrame(self._df)
+            self.dataframeChanged.emit()
+            self.infoChanged.emit()
+            self._selected_types = {}
+            self._resetColumnStats()
+            self._attribute_model.setProfiles(self.getAttributeProfiles())
+            self.metadataChanged.emit()
+        elapsed = time.perf_counter() - self._load_started
+        rows = self.rowCount()
+        log.info("Parquet %s: %d linhas em %.2f s", self._file_name, rows, elapsed)
+        self._setStats("load", load_stats(timings, elapsed, rows, file=self._file_name,
+                                          **memory_stats(self._memory_report)))
+
+    def _onLoadFailed(self, message: str) -> None:
+        self._df = None
+        self._file_path = None
+        self._memory_report = {}
+        self._resetColumnStats()
+        self._profiles = {}
+        self._attribute_model.clear()
+        # Mesmo modelo, esvaziado; dataframeChanged fica só para cargas concluídas (a página 1 navega com ele)
+        self._model.setDataFrame(None)
+        self.infoChanged.emit()
+        self.errorOccurred.emit(f"Erro ao carregar arquivo colunar: {message}")
+
+    @Slot(result=int)
+    def rowCount(self) -> int:
+        return 0 if self._df is None else int(self._df.shape[0])
+
+    @Slot(result=int)
+    def columnCount(self) -> int:
+        return 0 if self._df is None else int(self._df.shape[1])
+
+    @Slot(int, result=str)
+    def headerForColumn(self, column: int) -> str:
+        if self._df is None or column < 0 or column >= self._df.shape[1]:
+            return ""
+        return str(self._df.columns[column])
+
+    @Slot(result=list)
+    def getAttributeNames(self) -> List[str]:
+        """Nomes das colunas carregadas (na ordem do arquivo)."""
+        return [] if self._df is None else [str(name) for name in self._df.columns]
+
+    @Slot(str, result=str)
+    def getSuggestedType(self, attribute_name: str) -> str:
+        """Escolha do usuário, se houver; senão a sugestão do perfil."""
+        if attribute_name in self._selected_types:
+            return self._selected_types[attribute_name]
+        profile = self._profiles.get(attribute_name)
+        return profile['suggestedType'] if profile else "Textual"
+
+    @Slot(str, result=float)
+    def getTypeConfidence(self, attribute_name: str) -> float:
+        """Confiança (0 a 1) do tipo sugerido; 1.0 quando o usuário escolheu."""
+        if attribute_name in self._selected_types:
+            return 1.0
+        profile = self._profiles.get(attribute_name)
+        return float(profile.get('confidence', 0.0)) if profile else 0.0
+
+    @Slot(str, result=list)
+    def getAttributeExamples(self, attribute_name: str) -> List[str]:
+        """Retorna os primeiros 5 exemplos de uma coluna."""
+        profile = self._profiles.get(attribute_name)
+        return list(profile['examples']) if profile else []
+
+    @Slot(result=list)
+    def getAttributeProfiles(self) -> List[Dict]:
+        """Todos os perfis de uma vez: nome, tipo (com override), exemplos, contagens."""
+        from column_profile import profiles_for_qml
+
+        return profiles_for_qml(self._profiles, self._selected_types, self._selected_types, self._stats_engine.results)
+
+    @Property(list, constant=True)
+    def availableTypes(self) -> List[str]:
+        """Tipos disponíveis para seleção no dropdown."""
+        return ['Numérico', 'Textual', 'Nominal', 'Data', 'Relacional']
+
+    @Slot(str, str)
+    def setAttributeType(self, attribute_name: str, new_type: str) -> None:
+        """Define um novo tipo para um atributo (armazenado internamente)."""
+        if not attribute_name:
+            return
+        self._selected_types[attribute_name] = new_type
+        self._attribute_model.updateAttribute(attribute_name, suggestedType=new_type, confidence=1.0)
+
+    def _chosenTypes(self) -> List[Tuple[str, str]]:
+        return [(str(col), self.getSuggestedType(str(col))) for col in self._df.columns]
+
+    def _relationName(self) -> str:
+        return os.path.splitext(self._file_name)[0] or 'dataset'
+
+    @Slot(str)
+    def generateArff(self, output_path: str) -> None:
+        """Gera um ARFF com os tipos escolhidos (mesmo caminho de saveMetadata)."""
+        self.saveMetadata(output_path)
+
+    @Slot(str)
+    def saveMetadata(self, output_path: str) -> None:
+        """Salva os dados em ARFF (compatível Weka) com os tipos da página 3."""
+        from dataframe_export import export_arff
+
+        try:
+            if self._df is None:
+                self.errorOccurred.emit("Nenhum dado carregado para salvar metadados")
+                return
+            stats, notice = export_arff(output_path, self._relationName(), self._df, self._chosenTypes(),
+                                        self._nominalLimit(), self._sort_nominal_values, self._sparse_output)
+            self._setStats("export", stats)
+            self.successOccurred.emit(f"Arquivo ARFF salvo em: {output_path}" + notice)
+        except Exception as e:
+            self.errorOccurred.emit(f"Erro ao salvar metadados: {e}")
+
+    @Slot(str)
+    def exportParquet(self, output_path: str) -> None:
+        """Grava a base em Parquet com os tipos da página 3 (columnar_io)."""
+        from dataframe_export import export_parquet
+
+        try:
+            if self._df is None:
+                self.errorOccurred.emit("Nenhum dado carregado para exportar")
+                return
+            self._setStats("export", export_parquet(output_path, self._df, self._chosenTypes(), self._sort_nominal_values))
+            self.successOccurred.emit(f"Arquivo Parquet salvo em: {output_path}")
+        except Exception as e:
+            self.errorOccurred.emit(f"Erro ao exportar Parquet: {e}")
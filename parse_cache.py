@@ -0,0 +1,347 @@
+"""Cache em disco das bases já lidas, para reabrir o mesmo arquivo sem parse.
+
+Na primeira leitura completa de um CSV/ARFF, o DataFrame tipado vai para um
+diretório de cache junto com os perfis das colunas, a inferência de tipos e
+as escolhas de tipo (`_selected_types` / `_suggested_types`). Nas próximas,
+com o arquivo igual, as colunas voltam do disco: numéricas, booleanas e de
+data como arquivos `.npy` mapeados em memória (np.load com mmap_mode="r",
+sem cópia), texto e nominais como códigos `.npy` + valores distintos.
+
+A chave é a impressão digital do arquivo: caminho absoluto, tamanho, mtime
+e um hash de trechos do conteúdo (início, fim e blocos espaçados), além do
+tipo de leitura ("csv"/"arff"). O diretório tem um teto em bytes; ao passar
+dele, as entradas usadas há mais tempo são removidas (LRU pelo mtime da
+entrada, renovado a cada acerto).
+
+Diretório padrão: $MIDAS_CACHE_DIR, ou $XDG_CACHE_HOME/midas (~/.cache/midas).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# Teto padrão do diretório de cache
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024 * 1024
+# Muda quando o formato ou o conteúdo das entradas muda (entradas antigas
+# viram falta). 2: categorias na ordem de aparição (compaction)
+CACHE_FORMAT = 2
+# `update_in_background` espera isso antes de gravar: cliques seguidos
+# (tipos escolhidos) viram uma gravação só
+UPDATE_DELAY = 0.25
+# Diretórios temporários mais velhos que isso são restos de gravações interrompidas
+_STALE_SECONDS = 24 * 60 * 60
+# Hash do conteúdo: início e fim do arquivo + blocos espaçados no meio
+_EDGE_BYTES = 1024 * 1024
+_SAMPLE_BLOCKS = 16
+_SAMPLE_BYTES = 64 * 1024
+
+_META = "meta.pkl"
+
+
+def default_directory() -> str:
+    base = os.environ.get("MIDAS_CACHE_DIR")
+    if base:
+        return base
+    xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg, "midas")
+
+
+def fingerprint(file_path: str, variant: str) -> str:
+    """Chave do arquivo: caminho + tamanho + mtime + hash de trechos do conteúdo."""
+    path = os.path.abspath(file_path)
+    info = os.stat(path)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{CACHE_FORMAT}\0{variant}\0{path}\0{info.st_size}\0{info.st_mtime_ns}".encode())
+    with open(path, "rb") as handle:
+        digest.update(handle.read(_EDGE_BYTES))
+        if info.st_size > 2 * _EDGE_BYTES:
+            step = (info.st_size - 2 * _EDGE_BYTES) // (_SAMPLE_BLOCKS + 1)
+            for index in range(1, _SAMPLE_BLOCKS + 1):
+                handle.seek(_EDGE_BYTES + index * step)
+                digest.update(handle.read(_SAMPLE_BYTES))
+        if info.st_size > _EDGE_BYTES:
+            handle.seek(max(info.st_size - _EDGE_BYTES, _EDGE_BYTES))
+            digest.update(handle.read())
+    return digest.hexdigest()
+
+
+def _entry_size(directory: str) -> int:
+    total = 0
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            total += entry.stat().st_size
+    return total
+
+
+def _save_column(directory: str, index: int, series: pd.Series) -> Dict[str, Any]:
+    """Grava uma coluna; devolve como remontá-la (guardado no meta.pkl)."""
+    import numpy as np
+    import pandas as pd
+
+    dtype = series.dtype
+    stem = os.path.join(directory, f"c{index:05d}")
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        np.save(stem + ".npy", series.to_numpy())
+        return {"layout": "array", "dtype": dtype}
+    if isinstance(dtype, np.dtype) and dtype.kind == "M":
+        np.save(stem + ".npy", series.to_numpy().view("i8"))
+        return {"layout": "datetime", "dtype": dtype}
+    if isinstance(dtype, pd.CategoricalDtype):
+        np.save(stem + ".npy", series.cat.codes.to_numpy())
+        return {"layout": "categorical", "dtype": dtype}
+    if isinstance(dtype, pd.StringDtype):
+        codes, uniques = pd.factorize(series)
+        np.save(stem + ".npy", codes)
+        # Fora do meta.pkl: `update` reescreve o meta sem tocar nestes valores
+        with open(stem + ".uniques.pkl", "wb") as handle:
+            pickle.dump(uniques.to_numpy(dtype=object), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        return {"layout": "codes", "dtype": dtype}
+    # object misto, extensões (Int64, tz, ...): a Series inteira, serializada
+    with open(stem + ".pkl", "wb") as handle:
+        pickle.dump(series, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    return {"layout": "pickle"}
+
+
+def _load_column(directory: str, index: int, spec: Dict[str, Any]):
+    import numpy as np
+    import pandas as pd
+
+    stem = os.path.join(directory, f"c{index:05d}")
+    layout = spec["layout"]
+    if layout == "pickle":
+        with open(stem + ".pkl", "rb") as handle:
+            return pickle.load(handle)
+    values = np.load(stem + ".npy", mmap_mode="r")
+    if layout == "array":
+        return values
+    if layout == "datetime":
+        return values.view(spec["dtype"])
+    if layout == "categorical":
+        return pd.Categorical.from_codes(values, dtype=spec["dtype"])
+    # Texto: códigos + valores distintos (-1 = ausente)
+    with open(stem + ".uniques.pkl", "rb") as handle:
+        uniques = pickle.load(handle)
+    categorical = pd.Categorical.from_codes(values, categories=pd.Index(uniques, dtype=object))
+    return pd.Series(categorical).astype(spec["dtype"])
+
+
+class ParseCache:
+    """Diretório de entradas (uma por impressão digital) com teto de tamanho."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._lock = threading.Lock()
+        # Campos de `update` que chegaram com a entrada ainda sendo gravada
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._writers: List[threading.Thread] = []
+        # Campos à espera de `update_in_background`, por chave; um lock à parte
+        # para a interface nunca esperar a gravação que segura `_lock`
+        self._queued: Dict[str, Dict[str, Any]] = {}
+        self._queue_lock = threading.Lock()
+        self._updaters: List[threading.Thread] = []
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Resultado do parse guardado (None se não houver ou estiver corrompido)."""
+        import pandas as pd
+
+        if not self.enabled:
+            return None
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, _META), "rb") as handle:
+                meta = pickle.load(handle)
+            columns = {
+                index: _load_column(entry, index, spec) for index, spec in enumerate(meta["columns"])
+            }
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError, ValueError):
+            self.invalidate(key)
+            return None
+        dataframe = pd.DataFrame(columns, copy=False)
+        dataframe.columns = meta["names"]
+        # Acerto: entrada passa a ser a mais recente no LRU
+        os.utime(entry)
+        parsed = dict(meta["parsed"])
+        parsed["dataframe"] = dataframe
+        return parsed
+
+    def store(self, key: str, parsed: Dict[str, Any]) -> None:
+        """Grava o resultado do parse (o DataFrame em parsed['dataframe']).
+
+        Escreve num diretório temporário e renomeia no fim: uma entrada nunca
+        é vista pela metade. Depois aplica o teto de tamanho.
+        """
+        if not self.enabled:
+            with self._lock:
+                self._pending.pop(key, None)
+            return
+        dataframe = parsed["dataframe"]
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self._entry(f"{key}.tmp-{os.getpid()}-{threading.get_ident()}")
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+        try:
+            specs = [_save_column(temporary, index, dataframe.iloc[:, index]) for index in range(dataframe.shape[1])]
+            meta = {
+                "names": list(dataframe.columns),
+                "columns": specs,
+                "parsed": {name: value for name, value in parsed.items() if name != "dataframe"},
+                "stored_at": time.time(),
+            }
+            with self._lock:
+                meta["parsed"].update(self._pending.pop(key, {}))
+                with open(os.path.join(temporary, _META), "wb") as handle:
+                    pickle.dump(meta, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                shutil.rmtree(self._entry(key), ignore_errors=True)
+                os.replace(temporary, self._entry(key))
+        except BaseException:
+            with self._lock:
+                self._pending.pop(key, None)
+            shutil.rmtree(temporary, ignore_errors=True)
+            raise
+        self.evict()
+
+    def store_in_background(self, key: str, parsed: Dict[str, Any]) -> threading.Thread:
+        """`store` em uma thread: o carregamento não espera a gravação."""
+        with self._lock:
+            self._pending.setdefault(key, {})
+
+        def run() -> None:
+            try:
+                self.store(key, parsed)
+            except Exception as e:
+                log.warning("Não foi possível gravar no cache: %s", e)
+
+        thread = threading.Thread(target=run, name="parse-cache-store", daemon=True)
+        thread.start()
+        self._writers = [writer for writer in self._writers if writer.is_alive()] + [thread]
+        return thread
+
+    def wait(self) -> None:
+        """Espera as gravações em segundo plano (scripts, antes de sair)."""
+        for writer in list(self._writers):
+            writer.join()
+        self.flush()
+
+    def update(self, key: str, **fields: Any) -> None:
+        """Atualiza campos guardados (perfis, tipos escolhidos) de uma entrada."""
+        if not self.enabled or not key:
+            return
+        path = os.path.join(self._entry(key), _META)
+        with self._lock:
+            if key in self._pending:
+                # Gravação em andamento: os campos entram no meta dela
+                self._pending[key].update(fields)
+                return
+            try:
+                with open(path, "rb") as handle:
+                    meta = pickle.load(handle)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                return
+            meta["parsed"].update(fields)
+            temporary = f"{path}.tmp"
+            with open(temporary, "wb") as handle:
+                pickle.dump(meta, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+
+    def update_in_background(self, key: str, **fields: Any) -> None:
+        """`update` em uma thread, juntando as chamadas que chegam em sequência.
+
+        `update` relê e regrava o meta.pkl inteiro (dezenas de ms com
+        milhares de colunas): na thread da interface, cada troca de tipo
+        travaria a tela. Uma thread por chave grava o acumulado, na ordem
+        das chamadas.
+        """
+        if not self.enabled or not key:
+            return
+        with self._queue_lock:
+            queued = self._queued.get(key)
+            if queued is not None:
+                # Já há uma thread para a chave: ela grava estes campos também
+                queued.update(fields)
+                return
+            self._queued[key] = dict(fields)
+
+        def run() -> None:
+            while True:
+                time.sleep(UPDATE_DELAY)
+                with self._queue_lock:
+                    pending = self._queued[key]
+                    if not pending:
+                        del self._queued[key]
+                        return
+                    self._queued[key] = {}
+                try:
+                    self.update(key, **pending)
+                except Exception as e:
+                    log.warning("Não foi possível atualizar o cache: %s", e)
+
+        thread = threading.Thread(target=run, name="parse-cache-update", daemon=True)
+        thread.start()
+        self._updaters = [updater for updater in self._updaters if updater.is_alive()] + [thread]
+
+    def flush(self) -> None:
+        """Espera só as atualizações de `update_in_background` (saída da aplicação)."""
+        for updater in list(self._updaters):
+            updater.join()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Entradas completas, da mais recente para a mais antiga."""
+        if not os.path.isdir(self.directory):
+            return []
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and ".tmp-" not in entry.name:
+                found.append({"key": entry.name, "path": entry.path, "used_at": entry.stat().st_mtime})
+        return sorted(found, key=lambda item: item["used_at"], reverse=True)
+
+    def evict(self) -> None:
+        """Remove as entradas menos usadas até o diretório caber em max_bytes."""
+        with self._lock:
+            if os.path.isdir(self.directory):
+                now = time.time()
+                for entry in os.scandir(self.directory):
+                    if ".tmp-" in entry.name and now - entry.stat().st_mtime > _STALE_SECONDS:
+                        shutil.rmtree(entry.path, ignore_errors=True)
+            entries = self.entries()
+            sizes = [_entry_size(item["path"]) for item in entries]
+            total = sum(sizes)
+            while entries and total > self.max_bytes:
+                oldest = entries.pop()
+                total -= sizes.pop()
+                shutil.rmtree(oldest["path"], ignore_errors=True)
+
+
+_default_cache: Optional[ParseCache] = None
+
+
+def default_cache() -> ParseCache:
+    """Cache compartilhado pelos controladores (criado no primeiro uso)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
@@ -0,0 +1,163 @@
+"""Ordenação e filtros da tabela da página 2, calculados em NumPy/pandas.
+
+O resultado é um índice de linhas (permutação, ou subconjunto quando há
+filtro) que o `DataFrameModel` usa para indireção em `data()`: a base não é
+copiada nem reordenada, e nada passa pelo Python linha a linha (um
+QSortFilterProxyModel chamaria `data()`/`lessThan()` célula por célula).
+
+- Ordenar: `np.argsort` sobre a coluna (números, datas e booleanos direto;
+  texto pelos códigos de `pd.factorize(sort=True)`; nominais pela ordem dos
+  rótulos). Ausentes vão para o fim nos dois sentidos. O argsort usa
+  "quicksort" (introsort): empates não mantêm a ordem original, mas é cerca
+  de 3x mais rápido que o estável em 10 milhões de linhas.
+- Filtrar: máscaras booleanas por coluna, combinadas com E — texto contido
+  (sem diferenciar maiúsculas) ou faixa numérica [mínimo, máximo].
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Especificação de filtro por coluna: {"text": "abc"} ou {"min": 1.0, "max": None}
+Filter = Dict[str, Any]
+
+
+def sort_keys(series: pd.Series) -> np.ndarray:
+    """Chaves numéricas com a mesma ordem dos valores (ausentes: tratados à parte)."""
+    import numpy as np
+    import pandas as pd
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+        return series.to_numpy()
+    if isinstance(dtype, np.dtype) and dtype.kind == "b":
+        return series.to_numpy().view(np.uint8)
+    if isinstance(dtype, np.dtype) and dtype.kind in "mM":
+        return series.to_numpy().view("i8")
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Posição de cada rótulo na ordem alfabética, indexada pelos códigos
+        labels = dtype.categories.astype(str).to_numpy(dtype=object)
+        rank = np.empty(len(labels), dtype=np.int64)
+        rank[np.argsort(labels, kind="stable")] = np.arange(len(labels))
+        return rank[series.cat.codes.to_numpy().clip(0)]
+    if pd.api.types.is_numeric_dtype(dtype):
+        # Extensões (Int64, Float64, boolean): ausentes já são tratados fora
+        return series.to_numpy(dtype="float64", na_value=np.nan)
+    try:
+        codes, _ = pd.factorize(series, sort=True)
+    except TypeError:
+        # Tipos misturados (ex.: números e texto em object): compara como texto
+        codes, _ = pd.factorize(series.astype(str), sort=True)
+    return codes
+
+
+def _sort_plain(values: np.ndarray, ascending: bool) -> np.ndarray:
+    """argsort direto de um array NumPy; ausentes (NaN/NaT) vão para o fim.
+
+    Com ausentes, só os presentes entram no argsort: um único NaN tira o
+    NumPy do caminho vetorizado e deixa a ordenação ~3x mais lenta.
+    """
+    import numpy as np
+
+    if values.dtype.kind in "mM":
+        absent = np.isnat(values)
+        values = values.view("i8")
+    elif values.dtype.kind == "f":
+        absent = np.isnan(values)
+    else:
+        absent = None
+    if absent is None or not absent.any():
+        order = np.argsort(values, kind="quicksort")
+        return order if ascending else order[::-1].copy()
+    present = np.flatnonzero(~absent)
+    order = present[np.argsort(values[present], kind="quicksort")]
+    if not ascending:
+        order = order[::-1]
+    return np.concatenate([order, np.flatnonzero(absent)])
+
+
+def sort_rows(series: pd.Series, ascending: bool = True, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Índices das linhas (todas, ou só `rows`) na ordem da coluna; ausentes no fim."""
+    import numpy as np
+
+    if rows is not None:
+        series = series.iloc[rows]
+    positions = np.arange(len(series)) if rows is None else rows
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iufmM":
+        # Caminho rápido (a maioria das colunas): sem máscara nem cópia da coluna
+        order = _sort_plain(series.to_numpy(), ascending)
+        return order if rows is None else positions[order]
+    missing = series.isna().to_numpy()
+    if missing.any():
+        present = ~missing
+        keys = sort_keys(series[present])
+        present_rows, missing_rows = positions[present], positions[missing]
+    else:
+        keys = sort_keys(series)
+        present_rows, missing_rows = positions, positions[:0]
+    order = np.argsort(keys, kind="quicksort")
+    if not ascending:
+        order = order[::-1]
+    return np.concatenate([present_rows[order], missing_rows])
+
+
+def filter_mask(series: pd.Series, spec: Filter) -> np.ndarray:
+    """Máscara das linhas que passam no filtro (ausentes nunca passam)."""
+    import numpy as np
+    import pandas as pd
+
+    text = spec.get("text")
+    if text:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Testa cada rótulo uma vez e espalha pelos códigos
+            labels = series.cat.categories.astype(str)
+            hits = np.append(np.asarray(labels.str.contains(text, case=False, regex=False), dtype=bool), False)
+            return hits[series.cat.codes.to_numpy()]
+        if not (pd.api.types.is_string_dtype(series.dtype) or series.dtype == object):
+            series = series.astype(str).where(series.notna())
+        return series.str.contains(text, case=False, regex=False, na=False).to_numpy(dtype=bool)
+    minimum, maximum = spec.get("min"), spec.get("max")
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    mask = ~np.isnan(values)
+    if minimum is not None:
+        mask &= values >= minimum
+    if maximum is not None:
+        mask &= values <= maximum
+    return mask
+
+
+def compute_order(
+    column: "Any",
+    row_count: int,
+    sort_column: Optional[int],
+    ascending: bool,
+    filters: Dict[int, Filter],
+    mask_cache: Optional[Dict[Any, np.ndarray]] = None,
+) -> Optional[np.ndarray]:
+    """Índice de linhas da view (None = todas, na ordem original).
+
+    `column(i)` devolve a Series da coluna i; só as colunas usadas são lidas.
+    Com `mask_cache`, a máscara de cada filtro é guardada: mudar só a
+    ordenação (ou outro filtro) não refaz a busca de texto nas demais colunas.
+    """
+    import numpy as np
+
+    rows = None
+    if filters:
+        mask = np.ones(row_count, dtype=bool)
+        for index, spec in filters.items():
+            key = (index, tuple(sorted(spec.items())))
+            hit = mask_cache.get(key) if mask_cache is not None else None
+            if hit is None:
+                hit = filter_mask(column(index), spec)
+                if mask_cache is not None:
+                    mask_cache[key] = hit
+            mask &= hit
+        rows = np.flatnonzero(mask)
+    if sort_column is not None:
+        return sort_rows(column(sort_column), ascending, rows)
+    return rows
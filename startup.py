@@ -0,0 +1,146 @@
+"""Partida rápida: a janela aparece antes de o backend de dados ser importado.
+
+Só PySide6 é importado na partida. Os controladores trazem pandas e os
+módulos que dependem dele (arff_io, type_inference, ...) dentro das funções
+que os usam, ou seja, no primeiro `loadCsv`/`loadArff`. Para que esse
+primeiro carregamento não pague o custo, `BackendWarmUp` importa os mesmos
+módulos em uma thread assim que o primeiro quadro é desenhado (se o
+usuário abrir um arquivo antes, o worker do carregamento espera o import
+em andamento, que o Python serializa por módulo).
+
+`python main.py --startup-report` mostra o tempo de cada etapa até o
+primeiro quadro e o custo de cada módulo do backend, no estilo de
+`python -X importtime`, e encerra assim que o aquecimento termina.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# Relógio da partida: este módulo é o primeiro import de main.py
+STARTED_AT = time.perf_counter()
+
+from PySide6.QtCore import QObject, Signal  # noqa: E402
+
+log = logging.getLogger(__name__)
+
+# Na ordem de importação (pandas primeiro: os demais dependem dele)
+BACKEND_MODULES = (
+    "pandas",
+    "column_profile",
+    "type_inference",
+    "arff_schema",
+    "arff_io",
+    "csv_parallel",
+)
+
+# Meta de tempo até o primeiro quadro
+FIRST_FRAME_TARGET_MS = 300.0
+
+
+def _process_age() -> Optional[float]:
+    """Segundos desde a criação do processo (Linux; None se indisponível).
+
+    Inclui a subida do interpretador e o `site`, que acontecem antes de
+    qualquer linha de main.py.
+    """
+    try:
+        with open("/proc/self/stat", encoding="ascii") as handle:
+            fields = handle.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", encoding="ascii") as handle:
+            uptime = float(handle.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupReport:
+    """Marcos da partida (ms desde STARTED_AT) e custo dos imports do backend."""
+
+    def __init__(self) -> None:
+        self._interpreter_ms: Optional[float] = None
+        age = _process_age()
+        if age is not None:
+            # Tempo do processo antes de startup.py ser importado
+            self._interpreter_ms = max(age - (time.perf_counter() - STARTED_AT), 0.0) * 1000
+        self._marks: List[Tuple[str, float]] = []
+        self._imports: List[Tuple[str, float]] = []
+        self._loaded_before_frame: List[str] = []
+        self._lock = threading.Lock()
+
+    def mark(self, label: str) -> None:
+        with self._lock:
+            self._marks.append((label, (time.perf_counter() - STARTED_AT) * 1000))
+
+    def add_import(self, module: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self._imports.append((module, elapsed_ms))
+
+    def first_frame_ms(self) -> Optional[float]:
+        for label, at in self._marks:
+            if label == "primeiro quadro":
+                return at
+        return None
+
+    def render(self) -> str:
+        lines = ["Partida (ms desde o início de main.py):"]
+        if self._interpreter_ms is not None:
+            lines.append(f"  {-self._interpreter_ms:9.1f}  processo criado (interpretador + site)")
+        for label, at in self._marks:
+            lines.append(f"  {at:9.1f}  {label}")
+        first_frame = self.first_frame_ms()
+        if first_frame is not None:
+            total = first_frame + (self._interpreter_ms or 0.0)
+            verdict = "ok" if total <= FIRST_FRAME_TARGET_MS else "acima da meta"
+            lines.append(f"Primeiro quadro em {total:.1f} ms desde a criação do processo "
+                         f"(meta {FIRST_FRAME_TARGET_MS:.0f} ms: {verdict})")
+        if self._imports:
+            lines.append("Backend importado em segundo plano (custo incremental, como -X importtime):")
+            for module, elapsed in self._imports:
+                lines.append(f"  {elapsed:9.1f}  {module}")
+            lines.append(f"  {sum(e for _, e in self._imports):9.1f}  total")
+        if self._loaded_before_frame:
+            lines.append(f"Atenção: importados antes do primeiro quadro: {', '.join(self._loaded_before_frame)}")
+        return "\n".join(lines)
+
+    def record_loaded_modules(self) -> None:
+        """Guarda quais módulos do backend já estavam carregados (deveria ser nenhum)."""
+        self._loaded_before_frame = [name for name in BACKEND_MODULES if name in sys.modules]
+
+
+class BackendWarmUp(QObject):
+    """Importa o backend de dados em uma thread Python, uma única vez."""
+
+    finished = Signal()
+
+    def __init__(self, report: Optional[StartupReport] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._report = report
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="backend-warmup", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        for module in BACKEND_MODULES:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                # Sem o módulo, o erro aparece de novo (e na UI) no carregamento
+                log.warning("Não foi possível pré-carregar %s: %s", module, e)
+                continue
+            if self._report is not None:
+                self._report.add_import(module, (time.perf_counter() - start) * 1000)
+        if self._report is not None:
+            self._report.mark("backend pronto")
+        # Emitido de outra thread: chega na thread da interface enfileirado
+        self.finished.emit()
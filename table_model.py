@@ -1,7 +1,39 @@
 from __future__ import annotations
 
-import pandas as pd
-from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QAbstractTableModel, Property, Qt, QModelIndex, Signal, Slot
+
+from instrumentation import span
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# Células formatadas em blocos de linhas por coluna (uma chave do cache por bloco)
+_CHUNK_ROWS = 1024
+# Teto do cache de textos: _MAX_CHUNKS * _CHUNK_ROWS células (~4M)
+_MAX_CHUNKS = 4096
+
+
+def _format_chunk(values: pd.Series) -> np.ndarray:
+    """Converte um trecho de coluna em textos de exibição (NaN -> "")."""
+    import numpy as np
+
+    missing = values.isna().to_numpy()
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iufb":
+        # Numéricos/booleanos: conversão vetorizada do NumPy (mesmo texto que str())
+        text = values.to_numpy().astype(str).astype(object)
+    else:
+        text = np.array([str(v) for v in values.to_numpy(dtype=object)], dtype=object)
+    text[missing] = ""
+    return text
 
 
 class DataFrameModel(QAbstractTableModel):
@@ -9,46 +41,222 @@ class DataFrameModel(QAbstractTableModel):
 
     - Exposto ao QML como um model de tabela.
     - Usa o papel "display" para exibir células (Qt.DisplayRole).
-    - Atualizações usam beginResetModel()/endResetModel() para manter KISS.
+    - `setDataFrame` troca a base (beginResetModel/endResetModel).
+    - Não copia o DataFrame: compartilha o frame do controlador (somente
+      leitura) e guarda um cache de textos por coluna, preenchido em blocos
+      de linhas conforme a view pede as células.
+    - Vazio, não depende do pandas: o modelo é criado na partida da
+      interface, antes de o backend de dados ser importado.
+    - Ordenação e filtros (`sortByColumn`, `setTextFilter`, `setRangeFilter`)
+      são calculados em uma thread por `row_order.compute_order`; o índice
+      resultante (`_order`) mapeia linha da view -> linha da base e `data()`
+      só faz a indireção.
     """
 
-    def __init__(self, dataframe: pd.DataFrame | None = None) -> None:
+    # Ordenação/filtro em andamento (a view continua com o índice anterior)
+    busyChanged = Signal()
+    # Colunas ordenadas/filtradas e contagem de linhas visíveis
+    queryChanged = Signal()
+    queryFailed = Signal(str)
+    # Resultado da thread de ordenação: (geração, índice)
+    _orderComputed = Signal(int, object)
+
+    def __init__(self, dataframe: Optional[pd.DataFrame] = None) -> None:
         super().__init__()
-        self._df: pd.DataFrame = dataframe.copy() if dataframe is not None else pd.DataFrame()
+        self._df: Optional[pd.DataFrame] = None
+        # Series por posição: evita o custo de df.iat/df.iloc a cada célula
+        self._columns: List[pd.Series] = []
+        self._row_count = 0
+        self._text_cache: "OrderedDict[Tuple[int, int], np.ndarray]" = OrderedDict()
+        # Linha da view -> linha da base (None = ordem original, sem filtro)
+        self._order: Optional[np.ndarray] = None
+        self._sort_column: Optional[int] = None
+        self._sort_ascending: bool = True
+        self._filters: Dict[int, Dict[str, Any]] = {}
+        # Máscaras já calculadas por (coluna, filtro), válidas enquanto a base não muda
+        self._mask_cache: Dict[Any, np.ndarray] = {}
+        # Cada consulta ganha uma geração; resultados de consultas antigas são descartados
+        self._query_generation = 0
+        self._busy = False
+        self._orderComputed.connect(self._applyOrder)
+        self._bind(dataframe)
+
+    def _bind(self, dataframe: Optional[pd.DataFrame]) -> None:
+        self._df = dataframe
+        self._columns = [] if dataframe is None else [dataframe.iloc[:, i] for i in range(dataframe.shape[1])]
+        self._row_count = 0 if dataframe is None else int(dataframe.shape[0])
+        self._text_cache.clear()
+        self._order = None
+        self._sort_column = None
+        self._sort_ascending = True
+        self._filters = {}
+        self._mask_cache = {}
+        self._query_generation += 1
+        self._setBusy(False)
 
     # API de configuração
-    def setDataFrame(self, dataframe: pd.DataFrame) -> None:
+    def setDataFrame(self, dataframe: Optional[pd.DataFrame]) -> None:
         self.beginResetModel()
-        self._df = dataframe.copy()
+        self._bind(dataframe)
         self.endResetModel()
+        self.queryChanged.emit()
+
+    def _textChunk(self, column: int, chunk: int) -> np.ndarray:
+        key = (column, chunk)
+        text = self._text_cache.get(key)
+        if text is not None:
+            self._text_cache.move_to_end(key)
+            return text
+        start = chunk * _CHUNK_ROWS
+        series = self._columns[column]
+        if self._order is not None:
+            # Blocos em linhas da view: as linhas da base vêm do índice
+            text = _format_chunk(series.iloc[self._order[start:start + _CHUNK_ROWS]])
+        else:
+            text = _format_chunk(series.iloc[start:start + _CHUNK_ROWS])
+        self._text_cache[key] = text
+        if len(self._text_cache) > _MAX_CHUNKS:
+            self._text_cache.popitem(last=False)
+        return text
 
     # Tamanho
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
-        return int(self._df.shape[0])
+        return self._row_count if self._order is None else len(self._order)
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
-        return int(self._df.shape[1])
+        return len(self._columns)
 
     # Dados por célula
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
         if not index.isValid() or role != Qt.DisplayRole:
             return None
-        value = self._df.iat[index.row(), index.column()]
-        if pd.isna(value):
-            return ""
-        return str(value)
+        row = index.row()
+        return self._textChunk(index.column(), row // _CHUNK_ROWS)[row % _CHUNK_ROWS]
 
     # Cabeçalhos
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
         if role != Qt.DisplayRole:
             return None
         if orientation == Qt.Horizontal:
-            if 0 <= section < self._df.shape[1]:
+            if self._df is not None and 0 <= section < self._df.shape[1]:
                 return str(self._df.columns[section])
             return ""
-        # Linhas: 1..N
+        # Linhas: número da linha na base (1..N), mesmo com ordenação/filtro
+        if self._order is not None and 0 <= section < len(self._order):
+            return str(int(self._order[section]) + 1)
         return str(section + 1)
 
     # Nome do papel para o QML ("display")
     def roleNames(self):  # type: ignore[override]
         return {Qt.DisplayRole: b"display"}
+
+    # Ordenação e filtros
+    @Property(bool, notify=busyChanged)
+    def busy(self) -> bool:
+        return self._busy
+
+    @Property(int, notify=queryChanged)
+    def sortColumn(self) -> int:
+        """Coluna ordenada (-1 = ordem original)."""
+        return -1 if self._sort_column is None else self._sort_column
+
+    @Property(bool, notify=queryChanged)
+    def sortAscending(self) -> bool:
+        return self._sort_ascending
+
+    @Property(int, notify=queryChanged)
+    def sourceRowCount(self) -> int:
+        """Linhas da base (rowCount() conta só as que passam nos filtros)."""
+        return self._row_count
+
+    @Property(list, notify=queryChanged)
+    def filteredColumns(self) -> List[int]:
+        return sorted(self._filters)
+
+    @Slot(int, bool)
+    def sortByColumn(self, column: int, ascending: bool = True) -> None:
+        """Ordena pela coluna (-1 volta à ordem original)."""
+        self._sort_column = column if 0 <= column < self.columnCount() else None
+        self._sort_ascending = bool(ascending)
+        self._runQuery()
+
+    @Slot(int, str)
+    def setTextFilter(self, column: int, text: str) -> None:
+        """Mantém as linhas cuja célula contém `text` (vazio remove o filtro da coluna)."""
+        self._setFilter(column, {"text": text} if text else None)
+
+    @Slot(int, str, str)
+    def setRangeFilter(self, column: int, minimum: str, maximum: str) -> None:
+        """Mantém as linhas com valor numérico entre os limites (vazio = sem limite)."""
+        try:
+            low = float(minimum.replace(",", ".")) if minimum.strip() else None
+            high = float(maximum.replace(",", ".")) if maximum.strip() else None
+        except ValueError:
+            self.queryFailed.emit(f"Faixa inválida: {minimum!r} a {maximum!r}")
+            return
+        self._setFilter(column, None if low is None and high is None else {"min": low, "max": high})
+
+    @Slot()
+    def clearSortFilter(self) -> None:
+        self._sort_column = None
+        self._filters = {}
+        self._runQuery()
+
+    def _setFilter(self, column: int, spec: Optional[Dict[str, Any]]) -> None:
+        if not 0 <= column < self.columnCount():
+            return
+        if spec is None:
+            self._filters.pop(column, None)
+        else:
+            self._filters[column] = spec
+        self._runQuery()
+
+    def _setBusy(self, busy: bool) -> None:
+        if self._busy != busy:
+            self._busy = busy
+            self.busyChanged.emit()
+
+    def _runQuery(self) -> None:
+        """Calcula o índice em uma thread; a view troca de índice só no fim.
+
+        argsort e as máscaras liberam o GIL na maior parte do tempo, então
+        a interface continua respondendo durante a ordenação.
+        """
+        self._query_generation += 1
+        generation = self._query_generation
+        if self._sort_column is None and not self._filters:
+            self._orderComputed.emit(generation, None)
+            return
+        from row_order import compute_order
+
+        sort_column, ascending = self._sort_column, self._sort_ascending
+        filters, row_count = dict(self._filters), self._row_count
+        # Retrato das colunas: um setDataFrame no meio não afeta esta consulta
+        column = list(self._columns).__getitem__
+        mask_cache = self._mask_cache
+        self._setBusy(True)
+
+        def run() -> None:
+            try:
+                with span("sort_filter", rows=row_count, column=sort_column, filters=len(filters)):
+                    order = compute_order(column, row_count, sort_column, ascending, filters, mask_cache)
+            except Exception as e:
+                log.exception("Erro ao ordenar/filtrar")
+                order = e
+            # Emitido desta thread: chega na thread da interface enfileirado
+            self._orderComputed.emit(generation, order)
+
+        threading.Thread(target=run, name="table-sort-filter", daemon=True).start()
+
+    def _applyOrder(self, generation: int, order: Any) -> None:
+        if generation != self._query_generation:
+            return
+        self._setBusy(False)
+        if isinstance(order, Exception):
+            self.queryFailed.emit(str(order))
+            return
+        self.beginResetModel()
+        self._order = order
+        self._text_cache.clear()
+        self.endResetModel()
+        self.queryChanged.emit()
@@ -0,0 +1,378 @@
+"""Inferência de tipos por amostragem, com confiança por coluna.
+
+A sugestão rápida olha só uma amostra uniforme das linhas (reservatório de
+tamanho fixo), então responde em tempo limitado qualquer que seja o tamanho
+do arquivo. Sobre os valores (como texto) detecta:
+
+- números dentro de texto (inclusive vírgula decimal, "1.234,5");
+- datas em vários formatos (ISO, dd/mm/aaaa, ...), inclusive misturados;
+- booleanos e colunas nominais de baixa cardinalidade;
+- colunas com cara de identificador (todos distintos, sem espaços ou
+  inteiros crescentes), que viram "Textual" em vez de "Numérico".
+
+A confiança é a fração dos valores presentes que confirma o tipo escolhido.
+Os contadores (`ColumnStats`) são somáveis bloco a bloco; o mesmo código
+serve para a passada completa opcional, feita em segundo plano pelos
+controladores (`refineTypes()`), que troca a estimativa pelo valor exato.
+"""
+from __future__ import annotations
+
+import math
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from column_profile import NOMINAL_MAX_RATIO, NOMINAL_MAX_UNIQUE
+
+# Linhas na amostra usada pela sugestão rápida
+DEFAULT_SAMPLE_ROWS = 10_000
+# Fração mínima de valores que precisam confirmar um tipo numérico/data/booleano
+MIN_MATCH_RATIO = 0.95
+# Abaixo disso não dá para afirmar que uma coluna é identificador
+ID_MIN_VALUES = 20
+# Teto de valores distintos guardados por coluna na passada completa
+DISTINCT_CAP = 100_000
+# Tentados em ordem; dia/mês antes de mês/dia (bases em português)
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+)
+
+# Textos tratados como ausentes (comparação em minúsculas)
+_MISSING = ("", "?", "na", "n/a", "nan", "null", "none")
+_BOOLEANS = ("true", "false", "yes", "no", "sim", "não", "nao", "verdadeiro", "falso")
+_DECIMAL_COMMA = re.compile(r"^[+-]?(?:\d{1,3}(?:\.\d{3})+|\d+),\d+$|^[+-]?\d{1,3}(?:\.\d{3})+$")
+_DATE_LIKE = re.compile(r"^\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}")
+_ID_NAME = re.compile(r"(?:^|[_\s])(?:id|cod|codigo|código|uuid|chave|key)(?:[_\s]|$)", re.IGNORECASE)
+
+Inference = Dict[str, Any]
+
+
+class ReservoirSampler:
+    """Amostra uniforme de `size` linhas de uma sequência de blocos.
+
+    Usa o Algoritmo L (saltos geométricos): só as linhas sorteadas são
+    tocadas, então um DataFrame inteiro pode ser passado de uma vez sem custo
+    linear em Python. Os blocos podem chegar aos poucos, conforme o arquivo
+    é lido.
+    """
+
+    def __init__(self, size: int = DEFAULT_SAMPLE_ROWS, seed: Optional[int] = 0) -> None:
+        self.size = max(int(size), 1)
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._rows: Optional[np.ndarray] = None
+        self._positions = np.full(self.size, -1, dtype=np.int64)
+        self._columns: Optional[pd.Index] = None
+        self._dtypes: Optional[pd.Series] = None
+        self._uniforms: List[float] = []
+        self._w = math.exp(math.log(self._uniform()) / self.size)
+        self._next = self.size + self._skip()
+
+    def _uniform(self) -> float:
+        """Sorteio em (0, 1), seguro para log(); sorteados em lote pelo NumPy."""
+        if not self._uniforms:
+            self._uniforms = np.clip(self._rng.random(4096), 1e-300, 1.0 - 1e-16).tolist()
+        return self._uniforms.pop()
+
+    def _skip(self) -> int:
+        return int(math.floor(math.log(self._uniform()) / math.log(1.0 - self._w)))
+
+    def _select(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorteia (posições no reservatório, linhas do bloco) para `count` linhas novas."""
+        start, end = self.seen, self.seen + count
+        fill = min(max(self.size - start, 0), count)
+        slots = list(range(start, start + fill))
+        offsets = list(range(fill))
+        while self._next < end:
+            slots.append(min(int(self._uniform() * self.size), self.size - 1))
+            offsets.append(self._next - start)
+            self._w *= math.exp(math.log(self._uniform()) / self.size)
+            self._next += self._skip() + 1
+        self.seen = end
+        slots_array = np.asarray(slots, dtype=np.int64)
+        offsets_array = np.asarray(offsets, dtype=np.int64)
+        # Sorteios repetidos no mesmo bloco: vale o último (ordem do algoritmo)
+        _, last = np.unique(slots_array[::-1], return_index=True)
+        keep = len(slots_array) - 1 - last
+        return slots_array[keep], offsets_array[keep]
+
+    def add(self, frame: pd.DataFrame) -> None:
+        """Oferece mais um bloco de linhas ao reservatório."""
+        if self._rows is None:
+            self._columns = frame.columns
+            self._dtypes = frame.dtypes
+            self._rows = np.empty((self.size, frame.shape[1]), dtype=object)
+        start = self.seen
+        slots, offsets = self._select(len(frame))
+        if len(slots):
+            self._rows[slots] = frame.iloc[offsets].to_numpy(dtype=object)
+            self._positions[slots] = start + offsets
+
+    def frame(self) -> pd.DataFrame:
+        """Amostra na ordem original das linhas, com os dtypes do primeiro bloco."""
+        if self._rows is None:
+            return pd.DataFrame()
+        filled = min(self.seen, self.size)
+        order = np.argsort(self._positions[:filled], kind="stable")
+        sample = pd.DataFrame(self._rows[:filled][order], columns=self._columns)
+        for name, dtype in self._dtypes.items():
+            try:
+                sample[name] = sample[name].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+        return sample
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """Valores como texto sem espaços nas pontas; ausentes viram NaN."""
+    if not pd.api.types.is_string_dtype(values.dtype):
+        values = values.map(str, na_action="ignore")
+    text = values.astype(object).str.strip()
+    return text.mask(text.str.lower().isin(_MISSING))
+
+
+def _distinct_text(values: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+    """Códigos por linha (-1 = ausente) e os valores distintos já normalizados.
+
+    Todo o trabalho com texto (strip, regex, conversões) é feito só uma vez
+    por valor distinto; colunas repetitivas saem quase de graça.
+    """
+    codes, uniques = pd.factorize(values)
+    return codes, _as_text(pd.Series(uniques, dtype=object))
+
+
+def _text_to_numbers(text: pd.Series) -> np.ndarray:
+    """float64 para cada texto normalizado (NaN onde não é número)."""
+    numbers = pd.to_numeric(text.to_numpy(dtype=object), errors="coerce").astype("float64")
+    pending = np.isnan(numbers) & text.notna().to_numpy()
+    if pending.any():
+        candidates = text[pending]
+        comma = candidates.str.match(_DECIMAL_COMMA).to_numpy(dtype=bool)
+        if comma.any():
+            fixed = candidates[comma].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+            positions = np.flatnonzero(pending)[comma]
+            numbers[positions] = pd.to_numeric(fixed.to_numpy(dtype=object), errors="coerce")
+    return numbers
+
+
+def _text_to_dates(text: pd.Series, formats: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """datetime64 para cada texto normalizado (NaT onde nenhum formato serviu)."""
+    result = np.full(len(text), np.datetime64("NaT"), dtype="datetime64[ns]")
+    pending = text.notna().to_numpy() & text.str.match(_DATE_LIKE).fillna(False).to_numpy(dtype=bool)
+    used: List[str] = []
+    for date_format in formats:
+        if not pending.any():
+            break
+        positions = np.flatnonzero(pending)
+        parsed = pd.to_datetime(text.iloc[positions].to_numpy(dtype=object), format=date_format, errors="coerce")
+        hit = ~pd.isna(parsed)
+        if hit.any():
+            result[positions[hit]] = parsed[hit].to_numpy(dtype="datetime64[ns]")
+            pending[positions[hit]] = False
+            used.append(date_format)
+    return result, used
+
+
+def parse_numeric(values: pd.Series) -> pd.Series:
+    """Converte texto em float64 aceitando vírgula decimal ("3,5", "1.234,5")."""
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.astype("float64")
+    codes, text = _distinct_text(values)
+    # Código -1 (ausente) cai na última posição: NaN
+    numbers = np.append(_text_to_numbers(text), np.nan)
+    return pd.Series(numbers[codes], index=values.index, name=values.name)
+
+
+def parse_dates(values: pd.Series, formats: Sequence[str] = DATE_FORMATS) -> Tuple[pd.Series, List[str]]:
+    """Converte texto em datetime64 tentando cada formato nos valores restantes.
+
+    Retorna a série convertida (NaT onde nenhum formato serviu) e os
+    formatos que reconheceram ao menos um valor, na ordem de uso.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values, []
+    codes, text = _distinct_text(values)
+    dates, used = _text_to_dates(text, formats)
+    dates = np.append(dates, np.datetime64("NaT"))
+    return pd.Series(dates[codes], index=values.index, name=values.name), used
+
+
+class ColumnStats:
+    """Contadores de uma coluna, acumuláveis bloco a bloco."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.rows = 0
+        self.present = 0
+        self.numeric = 0
+        self.integral = 0
+        self.dates = 0
+        self.date_formats: List[str] = []
+        self.booleans = 0
+        self.spaced = 0
+        self.distinct: Optional[set] = set()
+        self.increasing = True
+        self._last: Optional[float] = None
+
+    def _addDistinct(self, uniques: Sequence[Any]) -> None:
+        if self.distinct is None:
+            return
+        self.distinct.update(uniques)
+        if len(self.distinct) > DISTINCT_CAP:
+            # Cardinalidade alta demais para contar: só sabemos que é "muita"
+            self.distinct = None
+
+    def _addOrder(self, numbers: np.ndarray) -> None:
+        """Acompanha se os números aparecem em ordem estritamente crescente."""
+        if self.increasing and len(numbers):
+            steps_ok = bool(np.all(np.diff(numbers) > 0))
+            self.increasing = steps_ok and (self._last is None or numbers[0] > self._last)
+            self._last = float(numbers[-1])
+
+    def add(self, values: pd.Series) -> None:
+        self.rows += len(values)
+        dtype = values.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            present = values.dropna()
+            self.present += len(present)
+            self.booleans += len(present)
+            self._addDistinct(present.unique())
+            return
+        if pd.api.types.is_numeric_dtype(dtype):
+            numbers = values.dropna().to_numpy(dtype="float64")
+            self.present += len(numbers)
+            self.numeric += len(numbers)
+            self.integral += int(np.count_nonzero(numbers == np.floor(numbers)))
+            self._addOrder(numbers)
+            self._addDistinct(np.unique(numbers))
+            return
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            present = values.dropna()
+            self.present += len(present)
+            self.dates += len(present)
+            self._addDistinct(present.unique())
+            return
+
+        # Texto: cada valor distinto é analisado uma vez e pesado pela contagem
+        codes, text = _distinct_text(values)
+        counts = np.bincount(codes[codes >= 0], minlength=len(text))
+        valid = text.notna().to_numpy()
+        self.present += int(counts[valid].sum())
+        if not valid.any():
+            return
+        numbers = _text_to_numbers(text)
+        is_number = ~np.isnan(numbers)
+        self.numeric += int(counts[is_number].sum())
+        self.integral += int(counts[is_number & (numbers == np.floor(numbers))].sum())
+        if self.increasing:
+            row_numbers = np.append(numbers, np.nan)[codes]
+            self._addOrder(row_numbers[~np.isnan(row_numbers)])
+        rest = valid & ~is_number
+        if rest.any():
+            lowered = text[rest].str.lower()
+            self.booleans += int(counts[rest][lowered.isin(_BOOLEANS).to_numpy()].sum())
+            dates, formats = _text_to_dates(text[rest], DATE_FORMATS)
+            self.dates += int(counts[rest][~np.isnat(dates)].sum())
+            self.date_formats.extend(f for f in formats if f not in self.date_formats)
+        spaced = text[valid].str.contains(r"\s", regex=True).to_numpy(dtype=bool)
+        self.spaced += int(counts[valid][spaced].sum())
+        self._addDistinct(text[valid].unique())
+
+
+def _decide(stats: ColumnStats) -> Inference:
+    """Escolhe o tipo (rótulo da UI) e a confiança a partir dos contadores."""
+    present = stats.present
+    base: Inference = {"rows": present, "formats": []}
+    if present == 0:
+        return {**base, "type": "Textual", "kind": "empty", "confidence": 0.0}
+
+    unique = None if stats.distinct is None else len(stats.distinct)
+    all_distinct = unique == present
+    numeric_ratio = stats.numeric / present
+    date_ratio = stats.dates / present
+    bool_ratio = stats.booleans / present
+
+    if numeric_ratio >= MIN_MATCH_RATIO:
+        integers = stats.integral == stats.numeric
+        named_id = bool(_ID_NAME.search(stats.name))
+        if integers and present >= ID_MIN_VALUES and (stats.increasing or (all_distinct and named_id)):
+            return {**base, "type": "Textual", "kind": "id", "confidence": numeric_ratio}
+        return {**base, "type": "Numérico", "kind": "numeric", "confidence": numeric_ratio}
+    if date_ratio >= MIN_MATCH_RATIO:
+        return {**base, "type": "Data", "kind": "date", "confidence": date_ratio, "formats": list(stats.date_formats)}
+    if bool_ratio >= MIN_MATCH_RATIO:
+        return {**base, "type": "Nominal", "kind": "boolean", "confidence": bool_ratio}
+    if unique is not None and unique <= NOMINAL_MAX_UNIQUE and unique / present < NOMINAL_MAX_RATIO:
+        return {**base, "type": "Nominal", "kind": "nominal", "confidence": 1.0 - unique / present}
+    if all_distinct and present >= ID_MIN_VALUES and stats.spaced == 0:
+        return {**base, "type": "Textual", "kind": "id", "confidence": 1.0}
+    return {
+        **base,
+        "type": "Textual",
+        "kind": "text",
+        "confidence": 1.0 - max(numeric_ratio, date_ratio, bool_ratio),
+    }
+
+
+class TypeAccumulator:
+    """Acumula `ColumnStats` de todas as colunas sobre blocos de um DataFrame."""
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, ColumnStats] = {}
+
+    def add(self, frame: pd.DataFrame) -> None:
+        for name in frame.columns:
+            key = str(name)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = ColumnStats(key)
+            stats.add(frame[name])
+
+    def results(self, exact: bool = False) -> Dict[str, Inference]:
+        """Tipo, confiança e detalhes por coluna; `exact` marca a passada completa."""
+        results: Dict[str, Inference] = {}
+        for name, stats in self._stats.items():
+            inference = _decide(stats)
+            inference["confidence"] = round(float(inference["confidence"]), 4)
+            inference["exact"] = exact
+            results[name] = inference
+        return results
+
+
+def infer_types(
+    dataframe: Optional[pd.DataFrame],
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    seed: Optional[int] = 0,
+) -> Dict[str, Inference]:
+    """Sugestão rápida: infere os tipos sobre uma amostra de `sample_rows` linhas."""
+    if dataframe is None or dataframe.shape[1] == 0:
+        return {}
+    sampler = ReservoirSampler(sample_rows, seed)
+    sampler.add(dataframe)
+    accumulator = TypeAccumulator()
+    accumulator.add(sampler.frame() if sampler.seen else dataframe)
+    return accumulator.results(exact=sampler.seen <= sampler.size)
+
+
+def apply_inference(profiles: Dict[str, Dict[str, Any]], inferences: Dict[str, Inference]) -> None:
+    """Grava tipo sugerido, confiança e tipo detectado nos perfis (column_profile)."""
+    for name, inference in inferences.items():
+        profile = profiles.get(name)
+        if profile is None:
+            continue
+        profile["suggestedType"] = inference["type"]
+        profile["confidence"] = inference["confidence"]
+        profile["inferredKind"] = inference["kind"]
+        profile["inferenceExact"] = inference["exact"]